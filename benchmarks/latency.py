@@ -0,0 +1,238 @@
+"""Resolve the functional test inputs against a simulated slow index.
+
+`LatencyProvider` wraps any provider and sleeps before each call for a delay
+drawn from a per-method distribution, as if the provider had to reach a remote
+index. It keeps thread-safe totals of the time spent waiting on injected
+latency and the time spent computing in the wrapped provider, so a resolution
+can be broken down into waiting, provider computation and resolver
+computation. Cases can be resolved concurrently with ``--jobs`` to see how
+waiting overlaps between threads::
+
+    python benchmarks/latency.py cocoapods/ \\
+        --latency find_matches=uniform:5:200 --latency get_dependencies=constant:20
+
+Distributions are given in milliseconds as ``constant:DELAY``,
+``uniform:LOW:HIGH`` or ``lognormal:MEDIAN:SIGMA``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import concurrent.futures
+import json
+import math
+import random
+import sys
+import threading
+import time
+
+from run import iter_cases
+
+from resolvelib import BaseReporter, ResolutionError, Resolver
+from resolvelib.providers import ProviderWrapper
+
+DEFAULT_LATENCIES = {
+    "find_matches": "uniform:5:200",
+    "get_dependencies": "uniform:5:200",
+}
+
+
+def constant(delay):
+    return lambda rng: delay / 1000
+
+
+def uniform(low, high):
+    return lambda rng: rng.uniform(low, high) / 1000
+
+
+def lognormal(median, sigma):
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma) / 1000
+
+
+DISTRIBUTIONS = {"constant": constant, "uniform": uniform, "lognormal": lognormal}
+
+
+def parse_distribution(spec):
+    """Parse a distribution like ``uniform:5:200`` into a callable.
+
+    The callable takes a `random.Random` and returns a delay in seconds.
+    """
+    name, *params = spec.split(":")
+    try:
+        factory = DISTRIBUTIONS[name]
+    except KeyError:
+        raise ValueError(f"unknown distribution {name!r}") from None
+    return factory(*map(float, params))
+
+
+class LatencyStats:
+    """Thread-safe totals of provider calls, by method name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = collections.Counter()
+        self.wait_time = collections.defaultdict(float)
+        self.compute_time = collections.defaultdict(float)
+
+    def add(self, name, wait_time, compute_time):
+        with self._lock:
+            self.calls[name] += 1
+            self.wait_time[name] += wait_time
+            self.compute_time[name] += compute_time
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "wait_time": dict(self.wait_time),
+                "compute_time": dict(self.compute_time),
+            }
+
+
+class LatencyProvider(ProviderWrapper):
+    """A provider wrapper that injects latency before each call.
+
+    :param provider: The provider to wrap.
+    :param latencies: A mapping of provider method names to distributions,
+        callables taking a `random.Random` and returning a delay in seconds.
+        Methods not in the mapping are called without delay.
+    :param seed: Seed for the delays, so runs are reproducible.
+    :param stats: A `LatencyStats` to add totals to. It may be shared between
+        providers used from multiple threads.
+    """
+
+    def __init__(self, provider, latencies, *, seed=0, stats=None):
+        super().__init__(provider)
+        self.latencies = latencies
+        self.stats = LatencyStats() if stats is None else stats
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _call(self, name, **kwargs):
+        distribution = self.latencies.get(name)
+        if distribution is None:
+            delay = 0
+        else:
+            with self._rng_lock:
+                delay = distribution(self._rng)
+        start = time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        waited = time.perf_counter()
+        try:
+            return super()._call(name, **kwargs)
+        finally:
+            end = time.perf_counter()
+            self.stats.add(name, waited - start, end - waited)
+
+
+def resolve_case(factory, latencies, seed, max_rounds):
+    provider = factory()
+    stats = LatencyStats()
+    wrapped = LatencyProvider(provider, latencies, seed=seed, stats=stats)
+    resolver = Resolver(wrapped, BaseReporter())
+    start = time.perf_counter()
+    try:
+        resolver.resolve(provider.root_requirements, max_rounds=max_rounds)
+    except ResolutionError as e:
+        outcome = type(e).__name__
+    else:
+        outcome = "resolved"
+    wall_time = time.perf_counter() - start
+
+    totals = stats.as_dict()
+    wait_time = sum(totals["wait_time"].values())
+    provider_time = sum(totals["compute_time"].values())
+    return {
+        "outcome": outcome,
+        "wall_time": wall_time,
+        "wait_time": wait_time,
+        "provider_time": provider_time,
+        "resolver_time": wall_time - wait_time - provider_time,
+        "by_method": totals,
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("cases", nargs="*", help="only run cases containing these")
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="METHOD=DISTRIBUTION",
+        help=f"latency of a provider method, in addition to {DEFAULT_LATENCIES}",
+    )
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rounds", type=int, default=100)
+    parser.add_argument("--output")
+    options = parser.parse_args(args)
+
+    specs = dict(DEFAULT_LATENCIES)
+    specs.update(spec.split("=", 1) for spec in options.latency)
+    latencies = {name: parse_distribution(spec) for name, spec in specs.items()}
+
+    cases = [
+        (case_id, factory)
+        for case_id, factory in iter_cases()
+        if not options.cases or any(s in case_id for s in options.cases)
+    ]
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(options.jobs) as executor:
+        futures = {
+            case_id: executor.submit(
+                resolve_case,
+                factory,
+                latencies,
+                options.seed,
+                options.max_rounds,
+            )
+            for case_id, factory in cases
+        }
+        results = {}
+        for case_id, future in futures.items():
+            results[case_id] = result = future.result()
+            print(
+                f"{case_id}: {result['outcome']}, "
+                f"{result['wall_time']:.2f} s wall, "
+                f"{result['wait_time']:.2f} s waiting, "
+                f"{result['provider_time']:.2f} s in provider, "
+                f"{result['resolver_time']:.2f} s in resolver",
+                file=sys.stderr,
+            )
+    elapsed = time.perf_counter() - start
+
+    wait_time = sum(r["wait_time"] for r in results.values())
+    compute_time = sum(
+        r["provider_time"] + r["resolver_time"] for r in results.values()
+    )
+    print(
+        f"total: {elapsed:.2f} s elapsed, {wait_time:.2f} s waiting, "
+        f"{compute_time:.2f} s computing",
+        file=sys.stderr,
+    )
+
+    output = {
+        "latencies": specs,
+        "jobs": options.jobs,
+        "elapsed": elapsed,
+        "wait_time": wait_time,
+        "compute_time": compute_time,
+        "cases": results,
+    }
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+            f.write("\n")
+    else:
+        json.dump(output, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
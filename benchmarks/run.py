@@ -0,0 +1,358 @@
+"""Benchmark the resolver over the functional test inputs.
+
+Every case under ``tests/functional/*/inputs`` is resolved with each provider
+variant defined by the functional tests. For each case, this records the best
+wall time over ``--repeat`` runs, the number of rounds, pins and backjumps,
+provider call counts, and the peak memory traced by `tracemalloc`.
+
+Results are written as JSON with ``--output``, and compared against a previous
+result file with ``--compare``; the script exits with status 1 if any case
+regressed beyond the given tolerances. Only the outcome and the counts of
+rounds, backjumps and provider calls are compared there: they are
+deterministic, so they are compared strictly by default, and the committed
+baseline holds on any machine::
+
+    python benchmarks/run.py --compare benchmarks/baseline.json
+
+Wall time and memory are only comparable between runs on the same machine
+and Python. They are compared, with a relative tolerance, against a baseline
+recorded on this machine and passed explicitly with ``--compare-timing``::
+
+    python benchmarks/run.py --output /tmp/before.json
+    python benchmarks/run.py --compare-timing /tmp/before.json
+
+With ``--record DIR``, the provider calls of each case are recorded to
+``DIR``. Running with ``--replay DIR`` then resolves the recorded cases from
+the logs alone, measuring the resolver without any provider cost, and reports
+a regression for every case whose sequence of provider calls changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import gc
+import importlib.util
+import json
+import os
+import pathlib
+import platform
+import sys
+import time
+import tracemalloc
+
+import resolvelib
+from resolvelib import BaseReporter, ResolutionError, Resolver
+from resolvelib.recording import RecordingProvider, ReplayMismatch, ReplayProvider
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+FUNCTIONAL_DIR = ROOT.joinpath("tests", "functional")
+
+COUNTERS = ("rounds", "backjumps", "provider_calls")
+
+
+def _load_module(path):
+    name = f"_benchmark_{path.stem}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Register the module so recorded candidates can be pickled.
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def iter_cases():
+    """Yield ``(case_id, provider_factory)`` for every functional input."""
+    python = _load_module(FUNCTIONAL_DIR / "python" / "test_resolvers_python.py")
+    for name in sorted(python.CASE_NAMES):
+        path = os.path.join(python.CASE_DIR, name)
+        for cls in python.PROVIDER_CLASSES:
+            yield f"python/{name[:-5]}/{cls.__name__}", functools.partial(cls, path)
+
+    cocoapods = _load_module(
+        FUNCTIONAL_DIR / "cocoapods" / "test_resolvers_cocoapods.py"
+    )
+    for name in sorted(cocoapods.CASE_NAMES):
+        path = os.path.join(cocoapods.CASE_DIR, name)
+        factory = functools.partial(cocoapods.CocoaPodsInputProvider, path)
+        yield f"cocoapods/{name[:-5]}", factory
+
+    swift = _load_module(
+        FUNCTIONAL_DIR / "swift-package-manager" / "test_resolvers_swift.py"
+    )
+    for name in sorted(swift.INPUT_NAMES):
+        path = os.path.join(swift.INPUTS_DIR, name)
+        for cls in swift.PROVIDER_CLASSES:
+            case_id = f"swift-package-manager/{name[:-5]}"
+            if cls is not swift.SwiftInputProvider:
+                case_id = f"{case_id}/{cls.__name__}"
+            yield case_id, functools.partial(cls, path)
+
+
+def _requirements(provider):
+    if isinstance(provider, ReplayProvider):
+        return provider.requirements
+    return provider.root_requirements
+
+
+def _resolve(provider, max_rounds, collect_stats=False, record=None):
+    requirements = _requirements(provider)
+    if record is not None:
+        provider = RecordingProvider(provider, record, requirements)
+    resolver = Resolver(provider, BaseReporter())
+    try:
+        result = resolver.resolve(
+            requirements,
+            max_rounds=max_rounds,
+            collect_stats=collect_stats,
+        )
+    except ResolutionError as e:
+        outcome, stats = type(e).__name__, e.stats
+    else:
+        outcome, stats = "resolved", result.stats
+    finally:
+        if record is not None:
+            provider.close()
+    if isinstance(provider, ReplayProvider):
+        provider.check_finished()
+    return outcome, stats
+
+
+def measure(factory, repeat, max_rounds, record=None):
+    """Resolve a case and return its measurements as a dict.
+
+    Providers are created outside of the measured section, so loading the
+    case's index is not included. Timing, counting and memory tracing are
+    done in separate runs so they do not skew each other. If ``record`` is
+    given, provider calls of the counting run are recorded to it.
+    """
+    times = []
+    for _ in range(repeat):
+        provider = factory()
+        start = time.perf_counter()
+        _resolve(provider, max_rounds)
+        times.append(time.perf_counter() - start)
+
+    outcome, stats = _resolve(factory(), max_rounds, collect_stats=True, record=record)
+
+    provider = factory()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _resolve(provider, max_rounds)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "outcome": outcome,
+        "time": min(times),
+        "rounds": stats.rounds,
+        "pins": stats.pins,
+        "backjumps": stats.backjumps,
+        "provider_calls": sum(stats.provider_calls.values()),
+        "provider_calls_by_method": stats.provider_calls,
+        "peak_memory": peak_memory,
+    }
+
+
+def _log_path(directory, case_id):
+    return directory / (case_id.replace("/", "-") + ".pickle.gz")
+
+
+def run(repeat, max_rounds, selected, record_dir=None, replay_dir=None):
+    cases = {}
+    for case_id, factory in iter_cases():
+        if selected and not any(s in case_id for s in selected):
+            continue
+        record = None
+        if record_dir is not None:
+            record = _log_path(record_dir, case_id)
+        if replay_dir is not None:
+            log = _log_path(replay_dir, case_id)
+            if not log.exists():
+                continue
+            factory = functools.partial(ReplayProvider, log)
+        try:
+            measurement = measure(factory, repeat, max_rounds, record)
+        except ReplayMismatch as e:
+            cases[case_id] = {"outcome": "ReplayMismatch", "error": str(e)}
+            print(f"{case_id}: {e}", file=sys.stderr)
+            continue
+        cases[case_id] = measurement
+        print(
+            f"{case_id}: {measurement['outcome']}, "
+            f"{measurement['time'] * 1000:.1f} ms, "
+            f"{measurement['rounds']} rounds, "
+            f"{measurement['provider_calls']} calls, "
+            f"{measurement['peak_memory'] / 1024:.0f} KiB",
+            file=sys.stderr,
+        )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "resolvelib": resolvelib.__version__,
+            "repeat": repeat,
+            "max_rounds": max_rounds,
+            "replay": replay_dir is not None,
+            "machine": platform.node(),
+        },
+        "cases": cases,
+    }
+
+
+def _exceeds(current, baseline, tolerance, floor=0):
+    return current - baseline > max(baseline * tolerance, floor)
+
+
+def compare(
+    results,
+    baseline,
+    *,
+    count_tolerance=0.0,
+    timing=False,
+    time_tolerance=0.5,
+    time_floor=0.005,
+    memory_tolerance=0.1,
+):
+    """Return a list of messages describing regressions from ``baseline``.
+
+    Cases missing from ``baseline`` are reported too, so new cases are not
+    left unchecked until the baseline is regenerated.
+
+    :param count_tolerance: Relative increase allowed for deterministic
+        counters such as rounds and provider calls.
+    :param timing: Whether to compare wall time and peak memory too, which
+        only makes sense if ``baseline`` was recorded on the same machine.
+    :param time_tolerance: Relative increase allowed for wall time.
+    :param time_floor: Absolute increase in seconds always allowed for time,
+        so the noise on very fast cases is not reported.
+    :param memory_tolerance: Relative increase allowed for peak memory.
+    """
+    measures = []
+    if timing:
+        measures = [
+            ("time", time_tolerance, time_floor),
+            ("peak_memory", memory_tolerance, 0),
+        ]
+    regressions = []
+    for case_id, current in results["cases"].items():
+        try:
+            previous = baseline["cases"][case_id]
+        except KeyError:
+            regressions.append(f"{case_id}: not in baseline")
+            continue
+        if current["outcome"] != previous["outcome"]:
+            regressions.append(
+                f"{case_id}: outcome {previous['outcome']} -> {current['outcome']}"
+            )
+            continue
+        for key in COUNTERS:
+            if _exceeds(current[key], previous[key], count_tolerance):
+                regressions.append(
+                    f"{case_id}: {key} {previous[key]} -> {current[key]}"
+                )
+        for key, tolerance, floor in measures:
+            if _exceeds(current[key], previous[key], tolerance, floor):
+                ratio = current[key] / previous[key] if previous[key] else 0
+                regressions.append(
+                    f"{case_id}: {key} {previous[key]:.4g} -> {current[key]:.4g} "
+                    f"(x{ratio:.2f})"
+                )
+    return regressions
+
+
+def _check_same_machine(baseline):
+    """Return why timings of ``baseline`` are not comparable here, or None."""
+    current = {
+        "machine": platform.node(),
+        "implementation": platform.python_implementation(),
+        "python": platform.python_version(),
+    }
+    for key, value in current.items():
+        previous = baseline["meta"].get(key)
+        if previous != value:
+            return f"it was recorded with {key} {previous!r}, not {value!r}"
+    return None
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("cases", nargs="*", help="only run cases containing these")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-rounds", type=int, default=100)
+    parser.add_argument("--output", type=pathlib.Path)
+    parser.add_argument("--compare", type=pathlib.Path)
+    parser.add_argument(
+        "--compare-timing",
+        type=pathlib.Path,
+        metavar="BASELINE",
+        help="also compare time and memory with a baseline from this machine",
+    )
+    parser.add_argument("--count-tolerance", type=float, default=0.0)
+    parser.add_argument("--time-tolerance", type=float, default=0.5)
+    parser.add_argument("--time-floor", type=float, default=0.005)
+    parser.add_argument("--memory-tolerance", type=float, default=0.1)
+    parser.add_argument("--record", type=pathlib.Path, metavar="DIR")
+    parser.add_argument("--replay", type=pathlib.Path, metavar="DIR")
+    options = parser.parse_args(args)
+
+    baseline = timing_baseline = None
+    if options.compare:
+        with options.compare.open() as f:
+            baseline = json.load(f)
+    if options.compare_timing:
+        with options.compare_timing.open() as f:
+            timing_baseline = json.load(f)
+        reason = _check_same_machine(timing_baseline)
+        if reason is not None:
+            parser.error(
+                f"cannot compare timings with {options.compare_timing}: {reason}"
+            )
+
+    if options.record:
+        options.record.mkdir(parents=True, exist_ok=True)
+    results = run(
+        options.repeat,
+        options.max_rounds,
+        options.cases,
+        record_dir=options.record,
+        replay_dir=options.replay,
+    )
+
+    if options.output:
+        with options.output.open("w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    regressions = [
+        f"{case_id}: {measurement['error']}"
+        for case_id, measurement in results["cases"].items()
+        if measurement["outcome"] == "ReplayMismatch"
+    ]
+    if baseline is not None:
+        regressions += compare(
+            results, baseline, count_tolerance=options.count_tolerance
+        )
+    if timing_baseline is not None:
+        regressions += compare(
+            results,
+            timing_baseline,
+            count_tolerance=options.count_tolerance,
+            timing=True,
+            time_tolerance=options.time_tolerance,
+            time_floor=options.time_floor,
+            memory_tolerance=options.memory_tolerance,
+        )
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""Benchmark how the resolver scales on synthetic dependency graphs.
+
+`generate_index()` builds a seeded, synthetic package index with a given
+number of packages, versions per package, dependency fan-out, depth and
+conflict density, optionally with adversarial backtracking patterns. The
+script resolves indexes of increasing size, and fits a power law to each
+measurement (wall time, rounds and provider calls) against the package count.
+A slope near 1 means linear scaling; with ``--max-slope``, the script exits
+with status 1 if any fitted slope exceeds it::
+
+    python benchmarks/synthetic.py --sizes 100,200,400,800 --max-slope 1.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import math
+import random
+import sys
+import time
+
+from resolvelib import AbstractProvider, BaseReporter, ResolutionError, Resolver
+
+Requirement = collections.namedtuple("Requirement", "name low high")
+Candidate = collections.namedtuple("Candidate", "name version")
+
+SINK = "sink"
+
+
+def generate_index(
+    packages,
+    *,
+    versions=5,
+    fanout=3,
+    depth=4,
+    conflict_density=0.1,
+    traps=0,
+    seed=0,
+):
+    """Generate a synthetic index and its root requirements.
+
+    Packages are spread over ``depth`` layers; each version of a package
+    depends on up to ``fanout`` packages from deeper layers. Dependencies of
+    newer versions are pinned to a single version with probability
+    ``conflict_density``, so packages sharing a dependency conflict and the
+    resolver has to backtrack. Version 1 of every package accepts all versions
+    of its dependencies, so the index is always resolvable.
+
+    Each of the ``traps`` adversarial patterns is a root package whose newer
+    versions lead through a chain of ``depth`` packages to a requirement that
+    contradicts a root requirement. The conflict is only found at the end of
+    the chain, after pinning all of it.
+
+    :returns: A ``(index, requirements)`` tuple. The index maps package names
+        to versions to lists of `Requirement`; versions are integers from 1
+        to ``versions``, and requirements accept ``low <= version <= high``.
+    """
+    rng = random.Random(seed)
+    names = [f"p{i:05d}" for i in range(packages)]
+    layers = [names[i::depth] for i in range(depth)]
+    index = {}
+    for level, layer in enumerate(layers):
+        deeper = [name for lower in layers[level + 1 :] for name in lower]
+        for name in layer:
+            index[name] = {}
+            for version in range(1, versions + 1):
+                count = min(fanout, len(deeper))
+                dependencies = []
+                for dependency in rng.sample(deeper, count):
+                    if version > 1 and rng.random() < conflict_density:
+                        pinned = rng.randint(1, versions)
+                        dependencies.append(Requirement(dependency, pinned, pinned))
+                    else:
+                        dependencies.append(Requirement(dependency, 1, versions))
+                index[name][version] = dependencies
+
+    requirements = [Requirement(name, 1, versions) for name in layers[0]]
+
+    if traps:
+        index[SINK] = {v: [] for v in range(1, versions + 1)}
+        requirements.append(Requirement(SINK, 1, 1))
+    for trap in range(traps):
+        chain = [f"trap{trap}-{i}" for i in range(depth + 1)]
+        index[chain[0]] = {1: []}
+        for version in range(2, versions + 1):
+            index[chain[0]][version] = [Requirement(chain[1], 1, 1)]
+        for name, dependency in zip(chain[1:-1], chain[2:]):
+            index[name] = {1: [Requirement(dependency, 1, 1)]}
+        index[chain[-1]] = {1: [Requirement(SINK, 2, versions)]}
+        requirements.append(Requirement(chain[0], 1, versions))
+
+    return index, requirements
+
+
+class SyntheticProvider(AbstractProvider):
+    def __init__(self, index):
+        self.index = index
+
+    def identify(self, requirement_or_candidate):
+        return requirement_or_candidate.name
+
+    def get_preference(
+        self,
+        identifier,
+        resolutions,
+        candidates,
+        information,
+        backtrack_causes,
+    ):
+        transitive = all(p is not None for _, p in information[identifier])
+        return (transitive, identifier)
+
+    def find_matches(self, identifier, requirements, incompatibilities):
+        bad_versions = {c.version for c in incompatibilities[identifier]}
+        requirements = list(requirements[identifier])
+        return [
+            Candidate(identifier, version)
+            for version in sorted(self.index[identifier], reverse=True)
+            if version not in bad_versions
+            and all(r.low <= version <= r.high for r in requirements)
+        ]
+
+    def is_satisfied_by(self, requirement, candidate):
+        return requirement.low <= candidate.version <= requirement.high
+
+    def get_dependencies(self, candidate):
+        return self.index[candidate.name][candidate.version]
+
+
+class SyntheticDomainProvider(SyntheticProvider):
+    """Give the resolver all candidates of each package up front."""
+
+    def get_candidate_domain(self, identifier):
+        return [
+            Candidate(identifier, version)
+            for version in sorted(self.index[identifier], reverse=True)
+        ]
+
+
+def measure(index, requirements, repeat, max_rounds, provider_class=SyntheticProvider):
+    """Resolve an index and return its measurements as a dict."""
+    times = []
+    for _ in range(repeat):
+        resolver = Resolver(provider_class(index), BaseReporter())
+        start = time.perf_counter()
+        try:
+            resolver.resolve(requirements, max_rounds=max_rounds)
+        except ResolutionError:
+            pass
+        times.append(time.perf_counter() - start)
+
+    resolver = Resolver(provider_class(index), BaseReporter())
+    try:
+        result = resolver.resolve(
+            requirements, max_rounds=max_rounds, collect_stats=True
+        )
+    except ResolutionError as e:
+        outcome, stats = type(e).__name__, e.stats
+    else:
+        outcome, stats = "resolved", result.stats
+
+    return {
+        "outcome": outcome,
+        "time": min(times),
+        "rounds": stats.rounds,
+        "backjumps": stats.backjumps,
+        "provider_calls": sum(stats.provider_calls.values()),
+    }
+
+
+def fit_slope(sizes, values):
+    """Fit ``value = a * size ** slope`` by least squares in log-log space.
+
+    Returns the slope, or None if there are fewer than two positive values.
+    """
+    points = [
+        (math.log(size), math.log(value))
+        for size, value in zip(sizes, values)
+        if value > 0
+    ]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return covariance / variance
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="100,200,400,800,1600")
+    parser.add_argument("--versions", type=int, default=5)
+    parser.add_argument("--fanout", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--conflict-density", type=float, default=0.1)
+    parser.add_argument("--traps", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-rounds", type=int, default=100000)
+    parser.add_argument("--max-slope", type=float)
+    parser.add_argument(
+        "--candidate-domains",
+        action="store_true",
+        help="resolve with candidate domains instead of find_matches()",
+    )
+    parser.add_argument("--output")
+    options = parser.parse_args(args)
+
+    sizes = [int(size) for size in options.sizes.split(",")]
+    measurements = []
+    for size in sizes:
+        index, requirements = generate_index(
+            size,
+            versions=options.versions,
+            fanout=options.fanout,
+            depth=options.depth,
+            conflict_density=options.conflict_density,
+            traps=options.traps,
+            seed=options.seed,
+        )
+        measurement = measure(
+            index,
+            requirements,
+            options.repeat,
+            options.max_rounds,
+            SyntheticDomainProvider if options.candidate_domains else SyntheticProvider,
+        )
+        measurements.append(measurement)
+        print(
+            f"{size} packages: {measurement['outcome']}, "
+            f"{measurement['time'] * 1000:.1f} ms, "
+            f"{measurement['rounds']} rounds, "
+            f"{measurement['provider_calls']} calls",
+            file=sys.stderr,
+        )
+
+    slopes = {
+        key: fit_slope(sizes, [m[key] for m in measurements])
+        for key in ("time", "rounds", "provider_calls")
+    }
+    results = {
+        "parameters": vars(options),
+        "sizes": sizes,
+        "measurements": measurements,
+        "slopes": slopes,
+    }
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    status = 0
+    for key, slope in slopes.items():
+        if slope is None:
+            continue
+        print(f"{key}: O(n^{slope:.2f})", file=sys.stderr)
+        if options.max_slope is not None and slope > options.max_slope:
+            print(f"SUPER-LINEAR {key}: slope {slope:.2f}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
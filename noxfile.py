@@ -28,6 +28,16 @@ def tests(session):
     session.run("pytest", *files)
 
 
+@nox.session
+def benchmark(session):
+    session.install(".[test]")
+
+    # The committed baseline is only compared on deterministic counters. Pass
+    # --compare-timing with a baseline recorded on this machine to check time.
+    args = session.posargs or ["--compare", "benchmarks/baseline.json"]
+    session.run("python", "benchmarks/run.py", *args)
+
+
 def _write_package_version(v):
     lines = []
 
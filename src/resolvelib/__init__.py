@@ -2,7 +2,10 @@ __all__ = [
     "AbstractProvider",
     "AbstractResolver",
     "BaseReporter",
+    "CachingProvider",
     "InconsistentCandidate",
+    "InvalidPins",
+    "ProviderWrapper",
     "RequirementsConflicted",
     "ResolutionError",
     "ResolutionImpossible",
@@ -14,11 +17,12 @@ __all__ = [
 __version__ = "1.2.2.dev0"
 
 
-from .providers import AbstractProvider
+from .providers import AbstractProvider, CachingProvider, ProviderWrapper
 from .reporters import BaseReporter
 from .resolvers import (
     AbstractResolver,
     InconsistentCandidate,
+    InvalidPins,
     RequirementsConflicted,
     ResolutionError,
     ResolutionImpossible,
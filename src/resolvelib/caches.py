@@ -0,0 +1,168 @@
+"""Bounded caches for provider results, used by `CachingProvider`.
+
+Each cache holds entries up to a total ``max_size``, where every entry
+counts as the size given by ``size(value)``, or 1 by default. Passing a size
+function such as `len` bounds the number of candidates or requirements held,
+rather than the number of calls remembered. When an entry does not fit,
+other entries are evicted, in an order depending on the cache class; an
+entry larger than ``max_size`` by itself is not stored at all. A
+``max_size`` of None never evicts anything.
+
+Write a subclass of `Cache` to use another eviction policy.
+"""
+
+from __future__ import annotations
+
+import collections
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+_MISSING: Any = object()
+
+
+class Cache(Generic[V]):
+    """Base class of the caches, mapping hashable keys to values.
+
+    Subclasses implement `get()`, and `_store()`, `_discard()` and `_evict()`
+    to add, remove and choose entries to evict. Sizes are accounted for here,
+    as ``total_size``; `put()` calls `_evict()` until the new entry fits.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None,
+        size: Callable[[V], int] | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.size = size
+        self.total_size = 0
+        self._sizes: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sizes
+
+    def get(self, key: Hashable, default: Any = None) -> V | Any:
+        """Return the value of ``key``, or ``default`` if it is not cached.
+
+        This counts as a use of the entry for the eviction policy.
+        """
+        raise NotImplementedError
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Cache ``value`` as the value of ``key``, evicting entries to fit."""
+        size = 1 if self.size is None else self.size(value)
+        if key in self._sizes:
+            self._remove(key)
+        if self.max_size is not None:
+            if size > self.max_size:
+                return
+            while self.total_size + size > self.max_size:
+                self._remove(self._evict())
+        self._sizes[key] = size
+        self.total_size += size
+        self._store(key, value)
+
+    def _remove(self, key: Hashable) -> None:
+        self.total_size -= self._sizes.pop(key)
+        self._discard(key)
+
+    def _store(self, key: Hashable, value: V) -> None:
+        """Add a new entry to the cache."""
+        raise NotImplementedError
+
+    def _discard(self, key: Hashable) -> None:
+        """Remove an entry from the cache."""
+        raise NotImplementedError
+
+    def _evict(self) -> Hashable:
+        """Return the key of the entry to evict next."""
+        raise NotImplementedError
+
+
+class LRUCache(Cache[V]):
+    """A cache evicting the least recently used entries first."""
+
+    def __init__(
+        self,
+        max_size: int | None,
+        size: Callable[[V], int] | None = None,
+    ) -> None:
+        super().__init__(max_size, size)
+        # Values are stored with their key, to move entries without comparing
+        # keys again.
+        self._values: collections.OrderedDict[Hashable, tuple[Hashable, V]] = (
+            collections.OrderedDict()
+        )
+
+    def get(self, key: Hashable, default: Any = None) -> V | Any:
+        item = self._values.get(key)
+        if item is None:
+            return default
+        self._values.move_to_end(item[0])
+        return item[1]
+
+    def _store(self, key: Hashable, value: V) -> None:
+        self._values[key] = (key, value)
+
+    def _discard(self, key: Hashable) -> None:
+        del self._values[key]
+
+    def _evict(self) -> Hashable:
+        return next(iter(self._values))
+
+
+class LFUCache(Cache[V]):
+    """A cache evicting the least frequently used entries first.
+
+    Among entries used equally often, the least recently used one is evicted.
+    Entries are kept in buckets by use count, so finding the entry to evict
+    does not scan all of them.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None,
+        size: Callable[[V], int] | None = None,
+    ) -> None:
+        super().__init__(max_size, size)
+        # Entries are [key, value, count] lists, the key being used to move
+        # entries between buckets without comparing keys again.
+        self._entries: dict[Hashable, list[Any]] = {}
+        self._buckets: dict[int, dict[Hashable, None]] = {}
+        self._min_count = 0
+
+    def get(self, key: Hashable, default: Any = None) -> V | Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        key, value, count = entry
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        entry[2] = count + 1
+        self._buckets.setdefault(count + 1, {})[key] = None
+        return value
+
+    def _store(self, key: Hashable, value: V) -> None:
+        self._entries[key] = [key, value, 1]
+        self._buckets.setdefault(1, {})[key] = None
+        self._min_count = 1
+
+    def _discard(self, key: Hashable) -> None:
+        key, _, count = self._entries.pop(key)
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count and self._buckets:
+                self._min_count = min(self._buckets)
+
+    def _evict(self) -> Hashable:
+        return next(iter(self._buckets[self._min_count]))
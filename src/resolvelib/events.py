@@ -0,0 +1,132 @@
+"""Log resolution progress as newline-delimited JSON.
+
+An `EventWriter` is a reporter writing one JSON object per line: one when the
+resolution starts, one per round with the changes made in it, and one when it
+ends::
+
+    with EventWriter("resolution.ndjson.gz") as writer:
+        Resolver(provider, writer).resolve(requirements)
+
+Rounds are described by the `RoundDelta` passed to the reporter's
+`ending_round_delta()` hook, so the cost of logging is proportional to what
+changes in each round rather than to the size of the state. Lines are
+buffered in memory and written in large chunks. Each event is an object with
+an ``"event"`` key; empty fields of rounds are left out. The first round
+lists the root criteria as changed, and later rounds only the criteria
+changed in them::
+
+    {"event":"start"}
+    {"event":"round","round":0,"pinned":[["a","a 2"]],"changed":["a","b","q"]}
+    {"event":"round","round":1,"pinned":[["b","b 1"]]}
+    {"event":"round","round":2,"unpinned":["a","b"],"backjump_distance":1,...}
+    {"event":"end","pinned":3}
+
+Identifiers and candidates that JSON cannot represent are converted with
+``encode``, `str` by default.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from typing import IO, TYPE_CHECKING, Any, Callable
+
+from .reporters import BaseReporter
+from .structs import CT, KT, RT
+
+if TYPE_CHECKING:
+    from .structs import RoundDelta, State
+
+_DEFAULT_BUFFER_SIZE = 256 * 1024
+
+# RoundDelta fields written for each round, when not empty.
+_ROUND_FIELDS = (
+    "pinned",
+    "unpinned",
+    "changed",
+    "removed",
+    "incompatibilities",
+    "backjump_distance",
+)
+
+
+class EventWriter(BaseReporter[RT, CT, KT]):
+    """A reporter that writes resolution events as NDJSON.
+
+    :param file: A path or binary file object to write to. Paths ending with
+        ``.gz`` are compressed with gzip.
+    :param encode: A function converting identifiers and candidates that JSON
+        cannot represent.
+    :param buffer_size: The number of bytes to buffer before writing.
+
+    Buffered lines are written when a resolution ends, when the buffer is
+    full, and when the writer is flushed or closed. Close the writer, or use
+    it as a context manager, to make sure all events are written. A path is
+    closed along with the writer, a file object is only flushed.
+    """
+
+    def __init__(
+        self,
+        file: str | os.PathLike[str] | IO[bytes],
+        *,
+        encode: Callable[[Any], Any] = str,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self._file: IO[bytes]
+        if isinstance(file, (str, os.PathLike)):
+            self._owned = True
+            if os.fspath(file).endswith(".gz"):
+                self._file = gzip.open(file, "wb")  # type: ignore[assignment]
+            else:
+                self._file = open(file, "wb")
+        else:
+            self._owned = False
+            self._file = file
+        self._encoder = json.JSONEncoder(separators=(",", ":"), default=encode)
+        self._buffer: list[bytes] = []
+        self._buffered = 0
+        self._buffer_size = buffer_size
+
+    def __enter__(self) -> EventWriter[RT, CT, KT]:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write_event(self, event: dict[str, Any]) -> None:
+        """Buffer one event, writing the buffer out if it is full."""
+        line = (self._encoder.encode(event) + "\n").encode("utf-8")
+        self._buffer.append(line)
+        self._buffered += len(line)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered events to the file."""
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write buffered events, and close the file if the writer opened it."""
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+    def starting(self) -> None:
+        self.write_event({"event": "start"})
+
+    def ending_round_delta(self, delta: RoundDelta[RT, CT, KT]) -> None:
+        event: dict[str, Any] = {"event": "round", "round": delta.round_index}
+        for field in _ROUND_FIELDS:
+            value = getattr(delta, field)
+            if value:
+                event[field] = value
+        self.write_event(event)
+
+    def ending(self, state: State[RT, CT, KT]) -> None:
+        self.write_event({"event": "end", "pinned": len(state.mapping)})
+        self.flush()
@@ -0,0 +1,251 @@
+"""Building blocks for providers filtering candidates by version.
+
+A `VersionIndex` sorts the versions of a project once, and identifies each by
+its rank in that order. Sets of versions are represented as integer bitmasks
+over the ranks, so combining requirements and excluding incompatible
+candidates are bitwise operations, regardless of how versions are compared.
+
+`IndexedProvider` implements `find_matches()` and `is_satisfied_by()` on top
+of it. It builds one index per identifier, and compiles each distinct
+requirement into a mask once, the first time it is seen.
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+
+from .providers import AbstractProvider
+from .structs import CT, KT, RT, VT, Matches
+
+if TYPE_CHECKING:
+    from .ranges import VersionRange
+
+
+class VersionIndex(Generic[VT]):
+    """The versions of a project, sorted and ranked.
+
+    Versions are ranked from zero in ascending order. A *mask* is an integer
+    whose bit ``n`` is set if the version ranked ``n`` is included.
+    """
+
+    def __init__(self, versions: Iterable[VT]) -> None:
+        self._versions: list[VT] = sorted(set(versions))
+        self._ranks = {v: i for i, v in enumerate(self._versions)}
+        self.full_mask = (1 << len(self._versions)) - 1
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._versions!r})"
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def __iter__(self) -> Iterator[VT]:
+        return iter(self._versions)
+
+    def __getitem__(self, rank: int) -> VT:
+        return self._versions[rank]
+
+    def __contains__(self, version: object) -> bool:
+        return version in self._ranks
+
+    def rank(self, version: VT) -> int:
+        """Return the rank of ``version``, or raise `KeyError`."""
+        return self._ranks[version]
+
+    def mask_of(self, versions: Iterable[VT]) -> int:
+        """Return the mask of ``versions``, ignoring those not in the index."""
+        mask = 0
+        for version in versions:
+            rank = self._ranks.get(version)
+            if rank is not None:
+                mask |= 1 << rank
+        return mask
+
+    def mask_where(self, predicate: Callable[[VT], bool]) -> int:
+        """Return the mask of versions for which ``predicate`` is true."""
+        mask = 0
+        for rank, version in enumerate(self._versions):
+            if predicate(version):
+                mask |= 1 << rank
+        return mask
+
+    def mask_between(
+        self,
+        low: VT | None = None,
+        high: VT | None = None,
+        *,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> int:
+        """Return the mask of versions between ``low`` and ``high``.
+
+        None means the range is unbounded on that side. This takes a binary
+        search per bound, instead of comparing every version.
+        """
+        if low is None:
+            start = 0
+        elif include_low:
+            start = bisect.bisect_left(self._versions, low)
+        else:
+            start = bisect.bisect_right(self._versions, low)
+        if high is None:
+            stop = len(self._versions)
+        elif include_high:
+            stop = bisect.bisect_right(self._versions, high)
+        else:
+            stop = bisect.bisect_left(self._versions, high)
+        if start >= stop:
+            return 0
+        return ((1 << (stop - start)) - 1) << start
+
+    def mask_range(self, version_range: VersionRange[VT]) -> int:
+        """Return the mask of versions in ``version_range``.
+
+        This takes two binary searches per interval of the range.
+        """
+        mask = 0
+        for interval in version_range.intervals:
+            mask |= self.mask_between(
+                interval.low,
+                interval.high,
+                include_low=interval.include_low,
+                include_high=interval.include_high,
+            )
+        return mask
+
+    def iter_versions(self, mask: int, *, reverse: bool = True) -> Iterator[VT]:
+        """Iterate through versions in ``mask``, newest first by default."""
+        if reverse:
+            while mask:
+                rank = mask.bit_length() - 1
+                yield self._versions[rank]
+                mask ^= 1 << rank
+        else:
+            while mask:
+                lowest = mask & -mask
+                yield self._versions[lowest.bit_length() - 1]
+                mask ^= lowest
+
+
+class IndexedProvider(AbstractProvider[RT, CT, KT], Generic[RT, CT, KT, VT]):
+    """A provider matching candidates through per-identifier version indexes.
+
+    Subclasses implement `identify()`, `get_preference()` and
+    `get_dependencies()` as usual, plus the hooks below describing versions.
+    `find_matches()` returns candidates from newest to oldest.
+
+    Masks of requirements are cached by `get_requirement_key()`, so it must
+    return equal keys only for requirements matching the same versions.
+    """
+
+    def __init__(self) -> None:
+        self._indexes: dict[KT, VersionIndex[VT]] = {}
+        self._requirement_masks: dict[tuple[KT, Hashable], int] = {}
+
+    def get_versions(self, identifier: KT) -> Iterable[VT]:
+        """Return all available versions for ``identifier``."""
+        raise NotImplementedError
+
+    def get_candidate_version(self, candidate: CT) -> VT:
+        """Return the version of ``candidate``."""
+        raise NotImplementedError
+
+    def build_candidate(
+        self, identifier: KT, version: VT, requirements: Sequence[RT]
+    ) -> CT:
+        """Create a candidate of ``version`` for ``identifier``.
+
+        :param requirements: The requirements the candidate matches.
+        """
+        raise NotImplementedError
+
+    def version_matches(self, requirement: RT, version: VT) -> bool:
+        """Whether ``version`` is allowed by ``requirement``.
+
+        This is called at most once per version for each distinct requirement,
+        when its mask is compiled. Override `compile_requirement()` to build
+        the mask more efficiently, e.g. with `VersionIndex.mask_range()`.
+        """
+        raise NotImplementedError
+
+    def get_requirement_key(self, requirement: RT) -> Hashable:
+        """Return a hashable key to cache the mask of ``requirement`` by.
+
+        The default uses the requirement itself.
+        """
+        return requirement  # type: ignore[return-value]
+
+    def compile_requirement(self, requirement: RT, index: VersionIndex[VT]) -> int:
+        """Return the mask of versions in ``index`` allowed by ``requirement``."""
+        return index.mask_where(lambda v: self.version_matches(requirement, v))
+
+    def get_index(self, identifier: KT) -> VersionIndex[VT]:
+        """Return the version index of ``identifier``, building it if needed."""
+        try:
+            return self._indexes[identifier]
+        except KeyError:
+            index = self._indexes[identifier] = VersionIndex(
+                self.get_versions(identifier)
+            )
+            return index
+
+    def get_requirement_mask(self, identifier: KT, requirement: RT) -> int:
+        """Return the mask of ``identifier``'s versions allowed by ``requirement``."""
+        key = (identifier, self.get_requirement_key(requirement))
+        try:
+            return self._requirement_masks[key]
+        except KeyError:
+            index = self.get_index(identifier)
+            mask = self._requirement_masks[key] = self.compile_requirement(
+                requirement, index
+            )
+            return mask
+
+    def get_matching_mask(
+        self, identifier: KT, requirements: Sequence[RT], incompatible_mask: int
+    ) -> int:
+        """Return the mask of versions to return from `find_matches()`.
+
+        The default returns versions allowed by all of ``requirements``,
+        except those in ``incompatible_mask``.
+        """
+        mask = self.get_index(identifier).full_mask & ~incompatible_mask
+        for requirement in requirements:
+            mask &= self.get_requirement_mask(identifier, requirement)
+        return mask
+
+    def find_matches(
+        self,
+        identifier: KT,
+        requirements: Mapping[KT, Iterator[RT]],
+        incompatibilities: Mapping[KT, Iterator[CT]],
+    ) -> Matches[CT]:
+        index = self.get_index(identifier)
+        matched = list(requirements[identifier])
+        bad_versions = (
+            self.get_candidate_version(c) for c in incompatibilities[identifier]
+        )
+        mask = self.get_matching_mask(identifier, matched, index.mask_of(bad_versions))
+        return [
+            self.build_candidate(identifier, version, matched)
+            for version in index.iter_versions(mask)
+        ]
+
+    def is_satisfied_by(self, requirement: RT, candidate: CT) -> bool:
+        identifier = self.identify(requirement)
+        version = self.get_candidate_version(candidate)
+        try:
+            rank = self.get_index(identifier).rank(version)
+        except KeyError:
+            return self.version_matches(requirement, version)
+        return bool(self.get_requirement_mask(identifier, requirement) >> rank & 1)
@@ -0,0 +1,232 @@
+"""Save resolution results compactly, and load them back quickly.
+
+A result is written as newline-delimited JSON: a header line, then one line per
+pinned identifier, with its candidate, the identifiers depending on it, and
+optionally the requirements it was pinned for::
+
+    {"version":1}
+    {"key":"a","candidate":["a","1.0"],"parents":[null]}
+    {"key":"b","candidate":["b","2.0"],"parents":[null,"a"]}
+
+Candidates and requirements are converted to and from JSON values by
+functions given by the caller, typically methods of the provider, so only what
+identifies them is stored. Identifiers must be strings or numbers. Parents are
+the edges of the result's graph, with null for the root::
+
+    with LockWriter("lock.ndjson", provider.encode_candidate) as writer:
+        writer.write_result(result)
+
+    lock = load_lock("lock.ndjson", provider.decode_candidate)
+    lock.mapping  # {"a": ..., "b": ...}
+
+The loaded `Lock` has the same ``mapping`` and ``graph`` as the result. Its
+``requirements``, if they were written, are the requirements each pin
+satisfied. To check that the pins still hold for root requirements without
+resolving again, pass ``lock.mapping`` to `Resolver.verify()`.
+"""
+
+from __future__ import annotations
+
+import collections
+import gzip
+import json
+import os
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    NamedTuple,
+)
+
+from .structs import CT, KT, RT, DirectedGraph
+
+if TYPE_CHECKING:
+    from .resolvers import Result
+
+    class Lock(NamedTuple, Generic[RT, CT, KT]):
+        """Pins loaded by `load_lock()`."""
+
+        mapping: dict[KT, CT]
+        graph: DirectedGraph[KT | None]
+        requirements: dict[KT, list[RT]] | None
+
+else:
+    Lock = collections.namedtuple("Lock", ["mapping", "graph", "requirements"])
+
+_FORMAT_VERSION = 1
+
+_DEFAULT_BUFFER_SIZE = 256 * 1024
+
+
+def _open(file: str | os.PathLike[str] | IO[bytes], mode: str) -> IO[bytes]:
+    """Open a path, compressed with gzip if it ends with ``.gz``."""
+    if not isinstance(file, (str, os.PathLike)):
+        return file
+    if os.fspath(file).endswith(".gz"):
+        return gzip.open(file, mode)  # type: ignore[return-value]
+    return open(file, mode)
+
+
+class LockWriter(Generic[RT, CT, KT]):
+    """Write pins to a lock file, one line at a time.
+
+    :param file: A path or binary file object to write to. Paths ending with
+        ``.gz`` are compressed with gzip.
+    :param encode_candidate: A function converting a candidate to a JSON
+        value.
+    :param encode_requirement: A function converting a requirement to a JSON
+        value. If given, requirements on each pin are written too.
+    :param buffer_size: The number of bytes to buffer before writing.
+
+    Close the writer, or use it as a context manager, to write everything out.
+    A path is closed along with the writer, a file object is only flushed.
+    """
+
+    def __init__(
+        self,
+        file: str | os.PathLike[str] | IO[bytes],
+        encode_candidate: Callable[[CT], Any],
+        encode_requirement: Callable[[RT], Any] | None = None,
+        *,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self._owned = isinstance(file, (str, os.PathLike))
+        self._file = _open(file, "wb")
+        self._encode_candidate = encode_candidate
+        self._encode_requirement = encode_requirement
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._buffer_size = buffer_size
+        self._write_line({"version": _FORMAT_VERSION})
+
+    def __enter__(self) -> LockWriter[RT, CT, KT]:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _write_line(self, value: dict[str, Any]) -> None:
+        line = self._encoder.encode(value)
+        self._buffer.append(line)
+        self._buffered += len(line) + 1
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def write_pin(
+        self,
+        key: KT,
+        candidate: CT,
+        parents: Iterable[KT | None],
+        requirements: Iterable[RT] = (),
+    ) -> None:
+        """Write one pinned identifier.
+
+        :param parents: Identifiers whose pins depend on ``key``, and None if
+            it is a root requirement.
+        :param requirements: The requirements ``candidate`` was pinned for.
+            They are only written if the writer has a requirement encoder.
+        """
+        line = {
+            "key": key,
+            "candidate": self._encode_candidate(candidate),
+            "parents": list(parents),
+        }
+        if self._encode_requirement is not None:
+            line["requirements"] = [self._encode_requirement(r) for r in requirements]
+        self._write_line(line)
+
+    def write_result(self, result: Result[RT, CT, KT]) -> None:
+        """Write all pins of a resolution result."""
+        graph = result.graph
+        criteria = result.criteria
+        write_requirements = self._encode_requirement is not None
+        for key, candidate in result.mapping.items():
+            self.write_pin(
+                key,
+                candidate,
+                graph.iter_parents(key),
+                criteria[key].iter_requirement() if write_requirements else (),
+            )
+
+    def flush(self) -> None:
+        """Write buffered lines to the file."""
+        if self._buffer:
+            self._buffer.append("")
+            self._file.write("\n".join(self._buffer).encode("utf-8"))
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write buffered lines, and close the file if the writer opened it."""
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+
+def dump_lock(
+    result: Result[RT, CT, KT],
+    file: str | os.PathLike[str] | IO[bytes],
+    encode_candidate: Callable[[CT], Any],
+    encode_requirement: Callable[[RT], Any] | None = None,
+) -> None:
+    """Write a resolution result to a lock file with a `LockWriter`."""
+    writer: LockWriter[RT, CT, KT] = LockWriter(
+        file, encode_candidate, encode_requirement
+    )
+    with writer:
+        writer.write_result(result)
+
+
+def load_lock(
+    file: str | os.PathLike[str] | IO[bytes],
+    decode_candidate: Callable[[Any], CT],
+    decode_requirement: Callable[[Any], RT] | None = None,
+) -> Lock[RT, CT, KT]:
+    """Load pins written by `LockWriter`.
+
+    :param file: A path or binary file object to read from. Paths ending with
+        ``.gz`` are decompressed with gzip.
+    :param decode_candidate: A function converting a JSON value back to a
+        candidate.
+    :param decode_requirement: A function converting a JSON value back to a
+        requirement. If given, and requirements were written, they are loaded
+        as ``requirements``; otherwise that is None.
+    """
+    owned = isinstance(file, (str, os.PathLike))
+    f = _open(file, "rb")
+    try:
+        data = f.read()
+    finally:
+        if owned:
+            f.close()
+    # Parse all lines with a single call, as elements of one JSON array.
+    lines = data.decode("utf-8").splitlines()
+    header, *pins = json.loads("[{}]".format(",".join(filter(None, lines))))
+    if header.get("version") != _FORMAT_VERSION:
+        raise ValueError(f"unsupported lock version {header.get('version')}")
+
+    mapping: dict[KT, CT] = {}
+    graph: DirectedGraph[KT | None] = DirectedGraph()
+    graph.add(None)
+    requirements: dict[KT, list[RT]] | None = None
+    if decode_requirement is not None and all("requirements" in p for p in pins):
+        requirements = {}
+    for pin in pins:
+        key = pin["key"]
+        mapping[key] = decode_candidate(pin["candidate"])
+        if key not in graph:
+            graph.add(key)
+        if requirements is not None:
+            assert decode_requirement is not None
+            requirements[key] = [decode_requirement(r) for r in pin["requirements"]]
+    for pin in pins:
+        for parent in pin["parents"]:
+            if parent not in graph:
+                graph.add(parent)
+            graph.connect(parent, pin["key"])
+    return Lock(mapping, graph, requirements)
@@ -2,17 +2,21 @@ from __future__ import annotations
 
 from typing import (
     TYPE_CHECKING,
+    Any,
+    Callable,
     Generic,
+    Hashable,
     Iterable,
     Iterator,
     Mapping,
     Sequence,
 )
 
+from .caches import Cache, LFUCache, LRUCache
 from .structs import CT, KT, RT, Matches, RequirementInformation
 
 if TYPE_CHECKING:
-    from typing import Any, Protocol
+    from typing import Protocol
 
     class Preference(Protocol):
         def __lt__(self, __other: Any) -> bool: ...
@@ -106,7 +110,10 @@ class AbstractProvider(Generic[RT, CT, KT]):
         :param incompatibilities: A mapping of known incompatible candidates of
             each dependency. Each key is an identifier, and the value an
             iterator of incompatibilities known to the resolver. All
-            incompatibilities *must* be excluded from the return value.
+            incompatibilities *must* be excluded from the return value. The
+            iterators also support ``in`` checks against all known
+            incompatibilities of the identifier, which take constant time for
+            hashable candidates.
 
         This should try to get candidates based on the requirements' types.
         For VCS, local, and archive requirements, the one-and-only match is
@@ -121,6 +128,15 @@ class AbstractProvider(Generic[RT, CT, KT]):
         * An collection of candidates.
         * An iterable of candidates. This will be consumed immediately into a
           list of candidates.
+
+        The result should only depend on ``identifier``, and on the
+        requirements and incompatibilities of ``identifier``, not on those
+        of other identifiers: `CachingProvider` caches it by these by
+        default, and so do `Resolver.resolve_many()`,
+        `Resolver.resolve_environments()` and
+        `resolvelib.service.ResolutionService`. A provider that does look at
+        other identifiers must not be used with them, or only with a
+        ``find_matches`` key function covering what it looks at.
         """
         raise NotImplementedError
 
@@ -194,3 +210,305 @@ class AbstractProvider(Generic[RT, CT, KT]):
             Iterable[KT]: A non-empty subset of `identifiers`.
         """
         return identifiers
+
+    def get_candidate_domain(self, identifier: KT) -> Iterable[CT] | None:
+        """An optional method to give all candidates of an identifier at once.
+
+        :param identifier: An identifier as returned by ``identify()``.
+
+        Return every candidate of ``identifier``, ordered by preference like
+        the return value of ``find_matches()``, or ``None`` (the default) to
+        have the resolver use ``find_matches()`` for this identifier.
+
+        When a domain is returned, the resolver calls this at most once per
+        identifier in a resolution, and never calls ``find_matches()`` for it.
+        Instead, the candidates of a criterion are those of the domain that
+        satisfy all of its requirements, according to ``is_satisfied_by()``,
+        and that are not known to be incompatible. Each distinct requirement
+        is checked against the domain once, and the resulting sets of
+        candidates are combined with bitwise operations. The order must not
+        change during a resolution, and the domain should only be returned if
+        ``is_satisfied_by()`` alone decides which candidates match.
+        """
+        return None
+
+    def get_environment_dependencies(
+        self, candidate: CT, environment: Any
+    ) -> Iterable[RT] | None:
+        """An optional method to give the dependencies of a candidate in an
+        environment.
+
+        :param candidate: A candidate, as returned by ``find_matches()``.
+        :param environment: One of the environments given to
+            ``Resolver.resolve_environments()``.
+
+        Return the dependencies of ``candidate`` when it is used in
+        ``environment``, like ``get_dependencies()``, or ``None`` if the
+        candidate cannot be used in that environment at all. The default
+        returns ``get_dependencies(candidate)`` in every environment.
+
+        This is only called by ``resolve_environments()``, which resolves
+        environments together for as long as the candidates they can use and
+        the dependencies of those candidates are equal, according to ``==``.
+        It is called lazily, once per candidate and environment, as
+        candidates are considered.
+        """
+        return self.get_dependencies(candidate)
+
+
+class ProviderWrapper(AbstractProvider[RT, CT, KT]):
+    """A provider that forwards every call to another provider.
+
+    Subclass this to add behavior around some of the provider methods. The
+    wrapped provider is available as `provider`. Calls are forwarded with
+    keyword arguments, the same way the resolver makes them, through
+    `_call()`; override it to wrap all methods at once. The resolver only
+    asks for candidate domains if the innermost wrapped provider implements
+    `get_candidate_domain()`.
+    """
+
+    def __init__(self, provider: AbstractProvider[RT, CT, KT]) -> None:
+        self.provider = provider
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.provider!r})"
+
+    def _call(self, name: str, **kwargs: Any) -> Any:
+        """Call the wrapped provider's method ``name`` with ``kwargs``."""
+        return getattr(self.provider, name)(**kwargs)
+
+    def identify(self, requirement_or_candidate: RT | CT) -> KT:
+        return self._call(
+            "identify",
+            requirement_or_candidate=requirement_or_candidate,
+        )
+
+    def get_preference(
+        self,
+        identifier: KT,
+        resolutions: Mapping[KT, CT],
+        candidates: Mapping[KT, Iterator[CT]],
+        information: Mapping[KT, Iterator[RequirementInformation[RT, CT]]],
+        backtrack_causes: Sequence[RequirementInformation[RT, CT]],
+    ) -> Preference:
+        return self._call(
+            "get_preference",
+            identifier=identifier,
+            resolutions=resolutions,
+            candidates=candidates,
+            information=information,
+            backtrack_causes=backtrack_causes,
+        )
+
+    def find_matches(
+        self,
+        identifier: KT,
+        requirements: Mapping[KT, Iterator[RT]],
+        incompatibilities: Mapping[KT, Iterator[CT]],
+    ) -> Matches[CT]:
+        return self._call(
+            "find_matches",
+            identifier=identifier,
+            requirements=requirements,
+            incompatibilities=incompatibilities,
+        )
+
+    def is_satisfied_by(self, requirement: RT, candidate: CT) -> bool:
+        return self._call(
+            "is_satisfied_by",
+            requirement=requirement,
+            candidate=candidate,
+        )
+
+    def get_dependencies(self, candidate: CT) -> Iterable[RT]:
+        return self._call("get_dependencies", candidate=candidate)
+
+    def narrow_requirement_selection(
+        self,
+        identifiers: Iterable[KT],
+        resolutions: Mapping[KT, CT],
+        candidates: Mapping[KT, Iterator[CT]],
+        information: Mapping[KT, Iterator[RequirementInformation[RT, CT]]],
+        backtrack_causes: Sequence[RequirementInformation[RT, CT]],
+    ) -> Iterable[KT]:
+        return self._call(
+            "narrow_requirement_selection",
+            identifiers=identifiers,
+            resolutions=resolutions,
+            candidates=candidates,
+            information=information,
+            backtrack_causes=backtrack_causes,
+        )
+
+    def get_candidate_domain(self, identifier: KT) -> Iterable[CT] | None:
+        return self._call("get_candidate_domain", identifier=identifier)
+
+    def get_environment_dependencies(
+        self, candidate: CT, environment: Any
+    ) -> Iterable[RT] | None:
+        return self._call(
+            "get_environment_dependencies",
+            candidate=candidate,
+            environment=environment,
+        )
+
+
+# Cache keys of provider methods, from the arguments they are called with.
+# Other methods depend on the whole resolution state, and are only cached
+# with a key function given by the caller.
+_DEFAULT_CACHE_KEYS: dict[str, Callable[..., Hashable]] = {
+    "identify": lambda requirement_or_candidate: requirement_or_candidate,
+    "find_matches": lambda identifier, requirements, incompatibilities: (
+        identifier,
+        tuple(requirements[identifier]),
+        tuple(incompatibilities[identifier]),
+    ),
+    "is_satisfied_by": lambda requirement, candidate: (requirement, candidate),
+    "get_dependencies": lambda candidate: candidate,
+    "get_candidate_domain": lambda identifier: identifier,
+    "get_environment_dependencies": lambda candidate, environment: (
+        candidate,
+        environment,
+    ),
+}
+
+# Methods returning iterables, which are cached as tuples.
+_MATERIALIZED_METHODS = frozenset(
+    [
+        "find_matches",
+        "get_dependencies",
+        "narrow_requirement_selection",
+        "get_candidate_domain",
+        "get_environment_dependencies",
+    ]
+)
+
+_CACHE_POLICIES: dict[str, Callable[..., Cache[Any]]] = {
+    "lru": LRUCache,
+    "lfu": LFUCache,
+}
+
+_MISSING: Any = object()
+
+
+class _HashedKey:
+    """A cache key hashed once, as caches look keys up several times.
+
+    Keys made of requirements or candidates can be expensive to hash, and
+    tuples do not remember their hash.
+    """
+
+    __slots__ = ("hash", "key")
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+        self.hash = hash(key)
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _HashedKey) and self.key == other.key
+
+
+class CachingProvider(ProviderWrapper[RT, CT, KT]):
+    """A provider remembering the results of some methods of another.
+
+    :param provider: The provider to wrap.
+    :param methods: Names of the provider methods to cache.
+    :param policy: The eviction policy of each method's cache, ``"lru"``
+        (least recently used first), ``"lfu"`` (least frequently used first),
+        or a `resolvelib.caches.Cache` subclass.
+    :param max_size: The total size of the entries kept by each method's
+        cache, or None to never evict any.
+    :param size: A function giving the size of a cached result, e.g. `len`
+        to bound the number of candidates or requirements kept. By default
+        each result counts as 1. Results of ``get_candidate_domain()`` and
+        ``get_environment_dependencies()`` may be None.
+    :param key_functions: Functions computing the cache key of a method from
+        its keyword arguments, by method name, replacing the default ones.
+
+    By default, results are cached by all the arguments of the call, except
+    for ``find_matches()``, whose results are cached by the identifier, the
+    requirements on it and its incompatible candidates. The wrapped
+    provider's ``find_matches()`` must then not depend on the requirements
+    or incompatibilities of other identifiers, as documented by
+    `AbstractProvider.find_matches()`; otherwise, leave it out of
+    ``methods``, or give it a key function covering what it depends on.
+    ``get_preference()`` and ``narrow_requirement_selection()`` can only be
+    cached with a key function. Calls whose key is unhashable are forwarded
+    without caching, so give a key function to cache calls with unhashable
+    requirements. Iterable results are cached as tuples.
+
+    Hits, misses and calls forwarded without caching are counted by method,
+    see `cache_info()`. Wrapped providers are expected to give the same
+    results for the same keys for as long as they are cached.
+    """
+
+    def __init__(
+        self,
+        provider: AbstractProvider[RT, CT, KT],
+        methods: Iterable[str] = ("find_matches", "get_dependencies"),
+        *,
+        policy: str | Callable[..., Cache[Any]] = "lru",
+        max_size: int | None = 1024,
+        size: Callable[[Any], int] | None = None,
+        key_functions: Mapping[str, Callable[..., Hashable]] | None = None,
+    ) -> None:
+        super().__init__(provider)
+        if isinstance(policy, str):
+            try:
+                policy = _CACHE_POLICIES[policy]
+            except KeyError:
+                raise ValueError(f"unknown cache policy {policy!r}") from None
+        self._key_functions = dict(_DEFAULT_CACHE_KEYS, **(key_functions or {}))
+        self._caches: dict[str, Cache[Any]] = {}
+        for name in methods:
+            if name not in self._key_functions:
+                raise ValueError(f"no cache key function for {name!r}")
+            self._caches[name] = policy(max_size, size)
+        self.hits = dict.fromkeys(self._caches, 0)
+        self.misses = dict.fromkeys(self._caches, 0)
+        self.uncached = dict.fromkeys(self._caches, 0)
+
+    def _call(self, name: str, **kwargs: Any) -> Any:
+        cache = self._caches.get(name)
+        if cache is None:
+            return super()._call(name, **kwargs)
+        try:
+            key = _HashedKey(self._key_functions[name](**kwargs))
+            result = cache.get(key, _MISSING)
+        except TypeError:
+            self.uncached[name] += 1
+            return super()._call(name, **kwargs)
+        if result is not _MISSING:
+            self.hits[name] += 1
+            return result
+        self.misses[name] += 1
+        result = super()._call(name, **kwargs)
+        if name in _MATERIALIZED_METHODS and result is not None:
+            if callable(result):
+                result = result()
+            result = tuple(result)
+        cache.put(key, result)
+        return result
+
+    def cache_info(self) -> dict[str, dict[str, Any]]:
+        """Return statistics of each method's cache, by method name.
+
+        Each is a JSON-serializable dict of ``hits``, ``misses``,
+        ``uncached`` calls, the ``hit_rate`` among cached calls, and the
+        number of ``entries`` held and their ``total_size``.
+        """
+        info = {}
+        for name, cache in self._caches.items():
+            hits, misses = self.hits[name], self.misses[name]
+            info[name] = {
+                "hits": hits,
+                "misses": misses,
+                "uncached": self.uncached[name],
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "entries": len(cache),
+                "total_size": cache.total_size,
+            }
+        return info
@@ -0,0 +1,278 @@
+"""Sets of versions described as unions of intervals.
+
+A `VersionRange` is an immutable union of disjoint intervals over any totally
+ordered version type, such as tuples or a provider's own version class.
+Ranges support intersection (``&``), union (``|``), difference (``-``) and
+complement (``~``), and membership checks with a binary search::
+
+    allowed = VersionRange.at_least((1, 2)) & VersionRange.less_than((2, 0))
+    allowed &= ~VersionRange.exactly((1, 4))
+    (1, 5) in allowed  # True
+
+This lets a provider combine all requirements on an identifier once in
+`find_matches()`, and detect that they conflict with `is_empty()` before
+enumerating any candidate.
+"""
+
+from __future__ import annotations
+
+import bisect
+import collections
+from typing import TYPE_CHECKING, Any, Generic, Iterable, NamedTuple
+
+from .structs import VT
+
+if TYPE_CHECKING:
+
+    class Interval(NamedTuple, Generic[VT]):
+        """An interval between two versions.
+
+        A bound of None means the interval is unbounded on that side.
+        """
+
+        low: VT | None
+        high: VT | None
+        include_low: bool
+        include_high: bool
+
+else:
+    Interval = collections.namedtuple(
+        "Interval", ["low", "high", "include_low", "include_high"]
+    )
+
+
+def _low_key(interval: Interval[VT]) -> tuple[Any, ...]:
+    if interval.low is None:
+        return (0,)
+    return (1, interval.low, not interval.include_low)
+
+
+def _is_empty(interval: Interval[VT]) -> bool:
+    low, high = interval.low, interval.high
+    if low is None or high is None:
+        return False
+    if low == high:
+        return not (interval.include_low and interval.include_high)
+    return high < low
+
+
+def _overlaps_or_touches(left: Interval[VT], right: Interval[VT]) -> bool:
+    """Whether ``right``, which does not start before ``left``, can be merged."""
+    if left.high is None or right.low is None:
+        return True
+    if right.low == left.high:
+        return left.include_high or right.include_low
+    return right.low < left.high
+
+
+def _intersect(left: Interval[VT], right: Interval[VT]) -> Interval[VT]:
+    if left.low is None:
+        low, include_low = right.low, right.include_low
+    elif right.low is None or right.low < left.low:
+        low, include_low = left.low, left.include_low
+    elif left.low < right.low:
+        low, include_low = right.low, right.include_low
+    else:
+        low, include_low = left.low, left.include_low and right.include_low
+
+    if left.high is None:
+        high, include_high = right.high, right.include_high
+    elif right.high is None or left.high < right.high:
+        high, include_high = left.high, left.include_high
+    elif right.high < left.high:
+        high, include_high = right.high, right.include_high
+    else:
+        high, include_high = left.high, left.include_high and right.include_high
+
+    return Interval(low, high, include_low, include_high)
+
+
+def _normalize(intervals: Iterable[Interval[VT]]) -> tuple[Interval[VT], ...]:
+    """Sort intervals, dropping empty ones and merging those that overlap.
+
+    Unbounded sides are marked as exclusive, so equal ranges compare equal.
+    """
+    merged: list[Interval[VT]] = []
+    canonical = (
+        Interval(
+            i.low,
+            i.high,
+            i.include_low and i.low is not None,
+            i.include_high and i.high is not None,
+        )
+        for i in intervals
+        if not _is_empty(i)
+    )
+    for interval in sorted(canonical, key=_low_key):
+        if not merged or not _overlaps_or_touches(merged[-1], interval):
+            merged.append(interval)
+            continue
+        last = merged[-1]
+        if last.high is None:
+            continue
+        if interval.high is None or last.high < interval.high:
+            merged[-1] = last._replace(
+                high=interval.high, include_high=interval.include_high
+            )
+        elif interval.high == last.high and interval.include_high:
+            merged[-1] = last._replace(include_high=True)
+    return tuple(merged)
+
+
+class VersionRange(Generic[VT]):
+    """An immutable set of versions, as a union of disjoint intervals."""
+
+    __slots__ = ("_intervals", "_lows")
+
+    def __init__(self, intervals: Iterable[Interval[VT]] = ()) -> None:
+        self._intervals = _normalize(intervals)
+        # Bounded lower ends, for binary searches in __contains__.
+        self._lows = [i.low for i in self._intervals if i.low is not None]
+
+    @classmethod
+    def any(cls) -> VersionRange[VT]:
+        """Return a range containing all versions."""
+        return cls([Interval(None, None, False, False)])
+
+    @classmethod
+    def empty(cls) -> VersionRange[VT]:
+        """Return a range containing no version."""
+        return cls()
+
+    @classmethod
+    def exactly(cls, version: VT) -> VersionRange[VT]:
+        return cls([Interval(version, version, True, True)])
+
+    @classmethod
+    def at_least(cls, version: VT) -> VersionRange[VT]:
+        return cls([Interval(version, None, True, False)])
+
+    @classmethod
+    def greater_than(cls, version: VT) -> VersionRange[VT]:
+        return cls([Interval(version, None, False, False)])
+
+    @classmethod
+    def at_most(cls, version: VT) -> VersionRange[VT]:
+        return cls([Interval(None, version, False, True)])
+
+    @classmethod
+    def less_than(cls, version: VT) -> VersionRange[VT]:
+        return cls([Interval(None, version, False, False)])
+
+    @classmethod
+    def between(
+        cls,
+        low: VT | None,
+        high: VT | None,
+        *,
+        include_low: bool = True,
+        include_high: bool = False,
+    ) -> VersionRange[VT]:
+        """Return a range between two versions, including ``low`` by default."""
+        return cls([Interval(low, high, include_low, include_high)])
+
+    @property
+    def intervals(self) -> tuple[Interval[VT], ...]:
+        """The disjoint intervals of the range, in ascending order."""
+        return self._intervals
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._intervals)!r})"
+
+    def __str__(self) -> str:
+        if not self._intervals:
+            return "<empty>"
+        parts = []
+        for i in self._intervals:
+            if i.low is not None and i.low == i.high:
+                parts.append(f"=={i.low}")
+                continue
+            bounds = []
+            if i.low is not None:
+                bounds.append(f"{'>=' if i.include_low else '>'}{i.low}")
+            if i.high is not None:
+                bounds.append(f"{'<=' if i.include_high else '<'}{i.high}")
+            parts.append(", ".join(bounds) or "*")
+        return " || ".join(parts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VersionRange):
+            return NotImplemented
+        return self._intervals == other._intervals
+
+    def __hash__(self) -> int:
+        return hash(self._intervals)
+
+    def __bool__(self) -> bool:
+        return bool(self._intervals)
+
+    def is_empty(self) -> bool:
+        """Whether the range contains no version."""
+        return not self._intervals
+
+    def is_any(self) -> bool:
+        """Whether the range contains all versions."""
+        return self._intervals == (Interval(None, None, False, False),)
+
+    def __contains__(self, version: VT) -> bool:
+        intervals = self._intervals
+        if not intervals:
+            return False
+        # Find the last interval starting at or before the version.
+        index = bisect.bisect_right(self._lows, version)
+        if intervals[0].low is None:
+            index += 1
+        if index == 0:
+            return False
+        interval = intervals[index - 1]
+        if interval.low is not None and interval.low == version:
+            return interval.include_low
+        if interval.high is None or version < interval.high:
+            return True
+        return interval.include_high and version == interval.high
+
+    def intersection(self, other: VersionRange[VT]) -> VersionRange[VT]:
+        return type(self)(
+            _intersect(left, right)
+            for left in self._intervals
+            for right in other._intervals
+        )
+
+    def union(self, other: VersionRange[VT]) -> VersionRange[VT]:
+        return type(self)(self._intervals + other._intervals)
+
+    def complement(self) -> VersionRange[VT]:
+        """Return a range containing exactly the versions not in this one."""
+        gaps = []
+        low: VT | None = None
+        include_low = False
+        for interval in self._intervals:
+            if interval.low is not None:
+                gaps.append(
+                    Interval(low, interval.low, include_low, not interval.include_low)
+                )
+            if interval.high is None:
+                break
+            low, include_low = interval.high, not interval.include_high
+        else:
+            gaps.append(Interval(low, None, include_low, False))
+        return type(self)(gaps)
+
+    def difference(self, other: VersionRange[VT]) -> VersionRange[VT]:
+        return self.intersection(other.complement())
+
+    def __and__(self, other: VersionRange[VT]) -> VersionRange[VT]:
+        return self.intersection(other)
+
+    def __or__(self, other: VersionRange[VT]) -> VersionRange[VT]:
+        return self.union(other)
+
+    def __sub__(self, other: VersionRange[VT]) -> VersionRange[VT]:
+        return self.difference(other)
+
+    def __invert__(self) -> VersionRange[VT]:
+        return self.complement()
+
+    def filter(self, versions: Iterable[VT]) -> Iterable[VT]:
+        """Yield versions in ``versions`` that are in the range."""
+        return (v for v in versions if v in self)
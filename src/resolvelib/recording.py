@@ -0,0 +1,280 @@
+"""Record provider answers and replay them without the original provider.
+
+Wrap a provider in a `RecordingProvider` to log every call made to it by the
+resolver, along with its result::
+
+    with RecordingProvider(provider, "resolution.pickle.gz", requirements) as p:
+        Resolver(p, reporter).resolve(requirements)
+
+The log can later be served by a `ReplayProvider`, which answers the same
+calls from memory, without doing any I/O::
+
+    provider = ReplayProvider("resolution.pickle.gz")
+    Resolver(provider, reporter).resolve(provider.requirements)
+    provider.check_finished()
+
+Calls must be made in the same order as they were recorded, with the same
+arguments. If a resolver change alters the sequence of calls, the replay
+raises `ReplayMismatch` at the first call that differs.
+
+The log is a gzip-compressed stream of pickles sharing one memo, so objects
+seen in multiple calls, such as candidates and requirements, are stored only
+once; they must not be mutated during the recording. Everything passed to and
+returned by the provider must be picklable. Only load logs from trusted
+sources.
+"""
+
+from __future__ import annotations
+
+import gzip
+import pickle
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+
+from .providers import AbstractProvider, ProviderWrapper
+from .structs import CT, KT, RT, Matches, RequirementInformation
+
+if TYPE_CHECKING:
+    import os
+
+    from .providers import Preference
+
+_FORMAT_VERSION = 1
+
+# Methods that may return lazy iterables, which are recorded as lists.
+_MATERIALIZED_METHODS = (
+    "find_matches",
+    "get_dependencies",
+    "narrow_requirement_selection",
+    "get_candidate_domain",
+    "get_environment_dependencies",
+)
+
+
+class ReplayMismatch(Exception):
+    """Raised when a replayed call does not match the recorded one.
+
+    :param index: The zero-based index of the call in the log.
+    :param expected: The recorded ``(method, arguments)`` pair, or None if the
+        log has no more calls.
+    :param actual: The ``(method, arguments)`` pair of the call made, or None
+        if the log has unreplayed calls left.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        expected: tuple[str, tuple[Any, ...]] | None,
+        actual: tuple[str, tuple[Any, ...]] | None,
+    ) -> None:
+        super().__init__(index, expected, actual)
+        self.index = index
+        self.expected = expected
+        self.actual = actual
+
+    def __str__(self) -> str:
+        if self.expected is None:
+            return f"call {self.index} is not recorded: {self.actual!r}"
+        if self.actual is None:
+            return f"call {self.index} was not replayed: {self.expected!r}"
+        return f"call {self.index} differs: {self.actual!r} != {self.expected!r}"
+
+
+def _call_arguments(name: str, kwargs: Mapping[str, Any]) -> tuple[Any, ...]:
+    """Return the arguments identifying a call in the log.
+
+    Mappings passed by the resolver are reduced to the entries the provider is
+    asked about, since the rest describe resolver state and are large.
+    """
+    if name == "identify":
+        return (kwargs["requirement_or_candidate"],)
+    if name == "get_preference":
+        return (kwargs["identifier"],)
+    if name == "find_matches":
+        identifier = kwargs["identifier"]
+        return (
+            identifier,
+            tuple(kwargs["requirements"].get(identifier, ())),
+            tuple(kwargs["incompatibilities"].get(identifier, ())),
+        )
+    if name == "is_satisfied_by":
+        return (kwargs["requirement"], kwargs["candidate"])
+    if name == "get_dependencies":
+        return (kwargs["candidate"],)
+    if name == "narrow_requirement_selection":
+        return (tuple(kwargs["identifiers"]),)
+    if name == "get_candidate_domain":
+        return (kwargs["identifier"],)
+    if name == "get_environment_dependencies":
+        return (kwargs["candidate"], kwargs["environment"])
+    raise ValueError(f"unknown provider method {name!r}")
+
+
+class RecordingProvider(ProviderWrapper[RT, CT, KT]):
+    """A provider wrapper that logs every call and its result to a file.
+
+    :param provider: The provider to record.
+    :param file: A path or binary file object to write the log to.
+    :param requirements: Root requirements to store in the log, so a replay
+        can resolve them without the original inputs.
+
+    Results returned lazily by `find_matches()` and `get_dependencies()` are
+    materialized into lists so they can be recorded. Close the provider, or
+    use it as a context manager, to flush the log.
+    """
+
+    def __init__(
+        self,
+        provider: AbstractProvider[RT, CT, KT],
+        file: str | os.PathLike[str] | IO[bytes],
+        requirements: Iterable[RT] = (),
+    ) -> None:
+        super().__init__(provider)
+        self._file = gzip.open(file, "wb")
+        self._pickler = pickle.Pickler(self._file, pickle.HIGHEST_PROTOCOL)
+        self._pickler.dump(
+            {"version": _FORMAT_VERSION, "requirements": list(requirements)}
+        )
+
+    def __enter__(self) -> RecordingProvider[RT, CT, KT]:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Finish writing the log."""
+        self._file.close()
+
+    def _call(self, name: str, **kwargs: Any) -> Any:
+        if name == "narrow_requirement_selection":
+            kwargs["identifiers"] = list(kwargs["identifiers"])
+        arguments = _call_arguments(name, kwargs)
+        result = super()._call(name, **kwargs)
+        if name == "find_matches" and callable(result):
+            result = list(result())
+        elif name in _MATERIALIZED_METHODS and result is not None:
+            result = list(result)
+        self._pickler.dump((name, arguments, result))
+        return result
+
+
+class ReplayProvider(AbstractProvider[RT, CT, KT]):
+    """A provider answering calls from a log written by `RecordingProvider`.
+
+    :param file: A path or binary file object to read the log from. The whole
+        log is loaded on construction.
+
+    The root requirements stored in the log are available as `requirements`.
+    """
+
+    def __init__(self, file: str | os.PathLike[str] | IO[bytes]) -> None:
+        with gzip.open(file, "rb") as f:
+            unpickler = pickle.Unpickler(f)
+            header = unpickler.load()
+            if header.get("version") != _FORMAT_VERSION:
+                raise ValueError(f"unsupported log version {header.get('version')}")
+            self.requirements: list[RT] = header["requirements"]
+            self._calls: list[tuple[str, tuple[Any, ...], Any]] = []
+            while True:
+                try:
+                    self._calls.append(unpickler.load())
+                except EOFError:
+                    break
+        self._index = 0
+        # Logs of providers without candidate domains never record the call.
+        self._has_domains = any(
+            name == "get_candidate_domain" for name, _, _ in self._calls
+        )
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def check_finished(self) -> None:
+        """Raise `ReplayMismatch` if some recorded calls were not replayed."""
+        if self._index < len(self._calls):
+            name, arguments, _ = self._calls[self._index]
+            raise ReplayMismatch(self._index, (name, arguments), None)
+
+    def _replay(self, name: str, **kwargs: Any) -> Any:
+        actual = (name, _call_arguments(name, kwargs))
+        try:
+            expected_name, expected_arguments, result = self._calls[self._index]
+        except IndexError:
+            raise ReplayMismatch(self._index, None, actual) from None
+        if actual != (expected_name, expected_arguments):
+            raise ReplayMismatch(
+                self._index, (expected_name, expected_arguments), actual
+            )
+        self._index += 1
+        return result
+
+    def identify(self, requirement_or_candidate: RT | CT) -> KT:
+        return self._replay(
+            "identify",
+            requirement_or_candidate=requirement_or_candidate,
+        )
+
+    def get_preference(
+        self,
+        identifier: KT,
+        resolutions: Mapping[KT, CT],
+        candidates: Mapping[KT, Iterator[CT]],
+        information: Mapping[KT, Iterator[RequirementInformation[RT, CT]]],
+        backtrack_causes: Sequence[RequirementInformation[RT, CT]],
+    ) -> Preference:
+        return self._replay("get_preference", identifier=identifier)
+
+    def find_matches(
+        self,
+        identifier: KT,
+        requirements: Mapping[KT, Iterator[RT]],
+        incompatibilities: Mapping[KT, Iterator[CT]],
+    ) -> Matches[CT]:
+        return self._replay(
+            "find_matches",
+            identifier=identifier,
+            requirements=requirements,
+            incompatibilities=incompatibilities,
+        )
+
+    def is_satisfied_by(self, requirement: RT, candidate: CT) -> bool:
+        return self._replay(
+            "is_satisfied_by",
+            requirement=requirement,
+            candidate=candidate,
+        )
+
+    def get_dependencies(self, candidate: CT) -> Iterable[RT]:
+        return self._replay("get_dependencies", candidate=candidate)
+
+    def narrow_requirement_selection(
+        self,
+        identifiers: Iterable[KT],
+        resolutions: Mapping[KT, CT],
+        candidates: Mapping[KT, Iterator[CT]],
+        information: Mapping[KT, Iterator[RequirementInformation[RT, CT]]],
+        backtrack_causes: Sequence[RequirementInformation[RT, CT]],
+    ) -> Iterable[KT]:
+        return self._replay("narrow_requirement_selection", identifiers=identifiers)
+
+    def get_candidate_domain(self, identifier: KT) -> Iterable[CT] | None:
+        if not self._has_domains:
+            return None
+        return self._replay("get_candidate_domain", identifier=identifier)
+
+    def get_environment_dependencies(
+        self, candidate: CT, environment: Any
+    ) -> Iterable[RT] | None:
+        return self._replay(
+            "get_environment_dependencies",
+            candidate=candidate,
+            environment=environment,
+        )
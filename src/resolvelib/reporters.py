@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Collection, Generic
 
-from .structs import CT, KT, RT, RequirementInformation, State
+from .structs import CT, KT, RT, RequirementInformation, RoundDelta, State
 
 if TYPE_CHECKING:
     from .resolvers import Criterion
@@ -27,6 +27,28 @@ class BaseReporter(Generic[RT, CT, KT]):
         if you want to report finalization. The index is zero-based.
         """
 
+    def ending_round_delta(self, delta: RoundDelta[RT, CT, KT]) -> None:
+        """Called before each round of resolution ends, with its changes.
+
+        This is called right after `ending_round`, with what the round changed
+        in the state rather than the whole state. ``delta`` is a `RoundDelta`:
+
+        * `round_index`: The zero-based index of the round.
+        * `pinned`: ``(identifier, candidate)`` pairs pinned in the round,
+          including those replacing another pin.
+        * `unpinned`: Identifiers whose pin was removed.
+        * `changed`: Identifiers whose criterion was added or replaced.
+        * `removed`: Identifiers whose criterion was removed.
+        * `incompatibilities`: ``(identifier, candidate)`` pairs found to be
+          incompatible while backjumping.
+        * `backjump_distance`: The number of states backjumping went back.
+
+        Changes are only tracked if this hook is overridden. Tracking costs
+        time proportional to the changes, except in rounds that backjump, where
+        the state is compared with the one reported at the end of the previous
+        round.
+        """
+
     def ending(self, state: State[RT, CT, KT]) -> None:
         """Called before the resolution ends successfully."""
 
@@ -53,3 +75,29 @@ class BaseReporter(Generic[RT, CT, KT]):
 
     def pinning(self, candidate: CT) -> None:
         """Called when adding a candidate to the potential solution."""
+
+    def pinning_implied(self, candidate: CT) -> None:
+        """Called when pinning a candidate because it is the only one left.
+
+        This is only called when pin propagation is enabled with
+        ``Resolver.resolve(propagate_pins=True)``. By default, it calls
+        `pinning`, so reporters counting pins see implied ones too.
+        """
+        self.pinning(candidate)
+
+    def starting_optimistic_backjumping(self, index: int, budget: int) -> None:
+        """Called when the resolver starts backjumping optimistically.
+
+        :param index: The zero-based index of the current round.
+        :param budget: The number of rounds the resolution may take before
+            the resolver rolls back and falls back to regular backjumping.
+        """
+
+    def rolling_back_optimistic_backjumping(self, index: int, ratio: float) -> None:
+        """Called when the resolver rolls back an optimistic backjumping attempt.
+
+        :param index: The zero-based index of the current round.
+        :param ratio: The ratio of remaining rounds the backjumping policy
+            allows for further attempts, or 0.0 if optimistic backjumping is
+            disabled for the rest of the resolution.
+        """
@@ -1,8 +1,10 @@
 from ..structs import RequirementInformation
 from .abstract import AbstractResolver, Result
+from .backjumping import AdaptiveBackjumpingPolicy, BackjumpingPolicy
 from .criterion import Criterion
 from .exceptions import (
     InconsistentCandidate,
+    InvalidPins,
     RequirementsConflicted,
     ResolutionError,
     ResolutionImpossible,
@@ -10,16 +12,21 @@ from .exceptions import (
     ResolverException,
 )
 from .resolution import Resolution, Resolver
+from .stats import ResolutionStats
 
 __all__ = [
     "AbstractResolver",
+    "AdaptiveBackjumpingPolicy",
+    "BackjumpingPolicy",
     "Criterion",
     "InconsistentCandidate",
+    "InvalidPins",
     "RequirementInformation",
     "RequirementsConflicted",
     "Resolution",
     "ResolutionError",
     "ResolutionImpossible",
+    "ResolutionStats",
     "ResolutionTooDeep",
     "Resolver",
     "ResolverException",
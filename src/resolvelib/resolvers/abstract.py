@@ -9,14 +9,21 @@ if TYPE_CHECKING:
     from ..providers import AbstractProvider
     from ..reporters import BaseReporter
     from .criterion import Criterion
+    from .stats import ResolutionStats
 
-    class Result(NamedTuple, Generic[RT, CT, KT]):
+    class _Result(NamedTuple, Generic[RT, CT, KT]):
         mapping: dict[KT, CT]
         graph: DirectedGraph[KT | None]
         criteria: dict[KT, Criterion[RT, CT]]
 
+    class Result(_Result[RT, CT, KT]):
+        stats: ResolutionStats | None
+
 else:
-    Result = collections.namedtuple("Result", ["mapping", "graph", "criteria"])
+
+    class Result(collections.namedtuple("Result", ["mapping", "graph", "criteria"])):
+        # Set by the resolver if statistics are collected.
+        stats = None
 
 
 class AbstractResolver(Generic[RT, CT, KT]):
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+
+class BackjumpingPolicy:
+    """Decide how much optimistic backjumping the resolver may attempt.
+
+    When a conflict is found, the resolver may backjump *optimistically*,
+    skipping past pins that do not look related to the conflict. States are
+    saved when this first happens, and if the resolution does not finish
+    within a budget of rounds (or runs out of states to backjump to), the
+    resolver rolls back to them and continues with regular backjumping.
+
+    This default policy gives an attempt a fixed ``ratio`` of the remaining
+    rounds, and disables optimistic backjumping for the rest of a resolution
+    once an attempt is rolled back. A ratio of zero disables optimistic
+    backjumping entirely.
+    """
+
+    def __init__(self, ratio: float) -> None:
+        self.ratio = ratio
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(ratio={self.ratio!r})"
+
+    def get_budget(self, ratio: float, round_index: int, max_rounds: int) -> int:
+        """Return how many rounds an attempt starting now may take.
+
+        :param ratio: The ratio currently in effect for the resolution.
+        :param round_index: The zero-based index of the current round.
+        :param max_rounds: The maximum number of rounds of the resolution.
+        """
+        return int((max_rounds - round_index) * ratio)
+
+    def record_jump(self, skipped: int) -> None:
+        """Called when an optimistic backjump skipped ``skipped`` states that
+        regular backjumping would have stopped at.
+        """
+
+    def record_rollback(self, rounds: int) -> float:
+        """Called when an attempt is rolled back after ``rounds`` rounds.
+
+        Return the ratio to use for the rest of the resolution. Zero disables
+        optimistic backjumping until the resolution ends.
+        """
+        return 0.0
+
+    def record_success(self, rounds: int) -> None:
+        """Called when a resolution finishes while an attempt is in progress,
+        ``rounds`` rounds after it started.
+        """
+
+
+class AdaptiveBackjumpingPolicy(BackjumpingPolicy):
+    """A backjumping policy that adjusts itself from past attempts.
+
+    The policy keeps two counters across all resolutions it is used for:
+
+    * `rounds_saved`: states skipped by optimistic backjumps in attempts that
+      led to a successful resolution, i.e. rounds that regular backjumping
+      would have spent unpinning and re-pinning them.
+    * `rounds_spent`: rounds spent in attempts that were rolled back.
+
+    Each rollback divides the ratio by ``factor``, and each success multiplies
+    it, within ``[min_ratio, max_ratio]``. After a rollback, optimistic
+    backjumping is kept enabled for the rest of the resolution only if the
+    rounds saved so far outweigh the rounds spent.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        *,
+        min_ratio: float = 0.01,
+        max_ratio: float = 0.5,
+        factor: float = 2.0,
+    ) -> None:
+        super().__init__(ratio)
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+        self.factor = factor
+        self.rounds_saved = 0
+        self.rounds_spent = 0
+        self._pending = 0
+
+    def record_jump(self, skipped: int) -> None:
+        self._pending += skipped
+
+    def record_rollback(self, rounds: int) -> float:
+        self._pending = 0
+        self.rounds_spent += rounds
+        self.ratio = max(self.min_ratio, self.ratio / self.factor)
+        if self.rounds_saved > self.rounds_spent:
+            return self.ratio
+        return 0.0
+
+    def record_success(self, rounds: int) -> None:
+        if self._pending:
+            self.rounds_saved += self._pending
+            self.ratio = min(self.max_ratio, self.ratio * self.factor)
+        self._pending = 0
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+from ..providers import CachingProvider
+from ..structs import CT, KT, RT
+from .exceptions import ResolutionError
+
+if TYPE_CHECKING:
+    from ..providers import AbstractProvider
+    from .abstract import AbstractResolver, Result
+
+
+class _SharedCacheProvider(CachingProvider[RT, CT, KT]):
+    """Share provider results between the resolutions of `resolve_many()`.
+
+    Matches are cached by identifier, the requirements on it and its
+    incompatible candidates, so `find_matches()` must not depend on the
+    requirements of other identifiers. Dependencies are cached by candidate,
+    and candidate domains by identifier. Nothing is evicted, and calls with
+    unhashable arguments are forwarded without caching.
+    """
+
+    def __init__(self, provider: AbstractProvider[RT, CT, KT]) -> None:
+        super().__init__(
+            provider,
+            ("find_matches", "get_dependencies", "get_candidate_domain"),
+            max_size=None,
+        )
+
+
+def resolve_or_error(
+    resolver: AbstractResolver[RT, CT, KT],
+    requirements: Iterable[RT],
+    kwargs: dict[str, Any],
+) -> Result[RT, CT, KT] | ResolutionError:
+    """Resolve ``requirements``, returning the error if there is no resolution."""
+    try:
+        return resolver.resolve(requirements, **kwargs)
+    except ResolutionError as e:
+        return e
+
+
+# The resolver of the current worker process, set up once by the pool, so
+# its provider caches stay warm across the requirement sets it resolves.
+_worker_resolvers: list[AbstractResolver[Any, Any, Any]] = []
+
+
+def set_worker_resolver(resolver: AbstractResolver[Any, Any, Any]) -> None:
+    _worker_resolvers[:] = [resolver]
+
+
+def resolve_in_worker(
+    requirements: list[Any], kwargs: dict[str, Any]
+) -> Result[Any, Any, Any] | ResolutionError:
+    return resolve_or_error(_worker_resolvers[0], requirements, kwargs)
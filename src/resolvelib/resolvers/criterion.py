@@ -14,12 +14,17 @@ class Criterion(Generic[RT, CT]):
       Each pair is a requirement contributing to this criterion, and the
       candidate that provides the requirement.
     * `incompatibilities` is a collection of all known not-to-work candidates
-      to exclude from consideration.
+      to exclude from consideration. The resolver stores these as an
+      `IncompatibilitySet`, which is deduplicated and supports fast ``in``
+      checks.
     * `candidates` is a collection containing all possible candidates deducted
       from the union of contributing requirements and known incompatibilities.
       It should never be empty, except when the criterion is an attribute of a
       raised `RequirementsConflicted` (in which case it is always empty).
 
+    If the provider gives a candidate domain for the identifier, both
+    `candidates` and `incompatibilities` are `CandidateMask` instances instead.
+
     .. note::
         This class is intended to be externally immutable. **Do not** mutate
         any of its attribute containers.
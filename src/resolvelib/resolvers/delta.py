@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Generic, Iterable
+
+from ..structs import CT, KT, RT, RoundDelta, State
+
+_MISSING = object()
+
+
+class _DeltaTracker(Generic[RT, CT, KT]):
+    """Keep track of changes made to the state between rounds.
+
+    Pins and criteria changes are noted as the resolver makes them. Only the
+    state on top of the stack is ever mutated, so while no backjump or
+    rollback restructures the stack, these notes are exactly how the state
+    reported last changed. Otherwise that state was left as it was, and is
+    compared with the new one instead.
+    """
+
+    def __init__(self, state: State[RT, CT, KT]) -> None:
+        self._base = state
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pinned: dict[KT, CT] = {}
+        self._changed: dict[KT, None] = {}
+        self._incompatibilities: list[tuple[KT, CT]] = []
+        self._backjump_distance = 0
+        self._restructured = False
+
+    def pin(self, name: KT, candidate: CT, changed: Iterable[KT]) -> None:
+        """Note a pin, and the identifiers whose criteria it changed."""
+        self._pinned[name] = candidate
+        self._changed.update(dict.fromkeys(changed))
+
+    def change(self, names: Iterable[KT]) -> None:
+        self._changed.update(dict.fromkeys(names))
+
+    def backjump(self, incompatibilities: list[tuple[KT, CT]], distance: int) -> None:
+        self._incompatibilities.extend(incompatibilities)
+        self._backjump_distance += distance
+        self._restructured = True
+
+    def restructure(self) -> None:
+        self._restructured = True
+
+    def build(self, index: int, state: State[RT, CT, KT]) -> RoundDelta[RT, CT, KT]:
+        """Return the changes since the last call, and start over from ``state``."""
+        if self._restructured:
+            base = self._base
+            pinned = [
+                (k, c)
+                for k, c in state.mapping.items()
+                if base.mapping.get(k, _MISSING) is not c
+            ]
+            unpinned = [k for k in base.mapping if k not in state.mapping]
+            changed = [
+                k for k, v in state.criteria.items() if base.criteria.get(k) is not v
+            ]
+            removed = [k for k in base.criteria if k not in state.criteria]
+        else:
+            pinned = list(self._pinned.items())
+            unpinned = []
+            changed = list(self._changed)
+            removed = []
+        delta = RoundDelta(
+            round_index=index,
+            pinned=pinned,
+            unpinned=unpinned,
+            changed=changed,
+            removed=removed,
+            incompatibilities=self._incompatibilities,
+            backjump_distance=self._backjump_distance,
+        )
+        self._base = state
+        self._reset()
+        return delta
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    overload,
+)
+
+from ..providers import ProviderWrapper
+from ..structs import CT, KT, RT, Matches, build_iter_view
+from .exceptions import ResolverException
+
+if TYPE_CHECKING:
+    from ..providers import AbstractProvider
+
+
+class _EnvironmentsDiverged(ResolverException):
+    """Raised when environments resolved together disagree on a candidate.
+
+    ``groups`` partitions the environments into those that agree.
+    ``resolution`` is set to the resolution interrupted, to fork from.
+    """
+
+    def __init__(self, candidate: Any, groups: list[tuple[Any, ...]]) -> None:
+        super().__init__(candidate, groups)
+        self.candidate = candidate
+        self.groups = groups
+        self.resolution: Any = None
+
+
+class _UsableMatches(Sequence[CT]):
+    """Matches usable in the group of environments being resolved.
+
+    Candidates are checked again each time they are iterated, rather than
+    once, so criteria built while resolving a group stay valid for the
+    groups it is split into, and resolutions can be forked for them.
+    """
+
+    def __init__(
+        self, provider: _EnvironmentProvider[Any, CT, Any], matches: Iterable[CT]
+    ) -> None:
+        self._provider = provider
+        self._matches = matches
+
+    def __iter__(self) -> Iterator[CT]:
+        for candidate in self._matches:
+            if self._provider._get_shared_dependencies(candidate) is not None:
+                yield candidate
+
+    def __bool__(self) -> bool:
+        return any(True for _ in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @overload
+    def __getitem__(self, index: int) -> CT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[CT]: ...
+
+    def __getitem__(self, index: int | slice) -> CT | Sequence[CT]:
+        return list(self)[index]
+
+
+class _EnvironmentProvider(ProviderWrapper[RT, CT, KT]):
+    """Resolve a group of environments as one, for as long as they agree.
+
+    Candidates unusable in every environment of the group are left out of
+    matches, and dependencies are those shared by all of them. As soon as a
+    candidate is usable in only some environments, or has different
+    dependencies in some, `_EnvironmentsDiverged` is raised to split the
+    group.
+
+    ``environments`` is the group being resolved, and is changed when
+    moving on to another group. Matches follow it, so criteria found for a
+    group can be reused for the groups split from it.
+
+    Candidate domains are not used, so that availability is checked lazily,
+    only for candidates the resolver considers.
+    """
+
+    def __init__(
+        self, provider: AbstractProvider[RT, CT, KT], environments: tuple[Any, ...]
+    ) -> None:
+        super().__init__(provider)
+        self.environments = environments
+        self._cache: dict[tuple[Hashable, Any], tuple[RT, ...] | None] = {}
+
+    def _get_dependencies_in(
+        self, candidate: CT, environment: Any
+    ) -> tuple[RT, ...] | None:
+        key: tuple[Any, Any] | None = (candidate, environment)
+        try:
+            return self._cache[key]  # type: ignore[index]
+        except KeyError:
+            pass
+        except TypeError:
+            key = None
+        dependencies = self.provider.get_environment_dependencies(
+            candidate, environment
+        )
+        if dependencies is not None:
+            dependencies = tuple(dependencies)
+        if key is not None:
+            self._cache[key] = dependencies  # type: ignore[index]
+        return dependencies
+
+    def _get_shared_dependencies(self, candidate: CT) -> tuple[RT, ...] | None:
+        """Return dependencies of ``candidate`` in all environments of the group.
+
+        None means the candidate is not usable in any of them.
+        """
+        groups: list[tuple[tuple[RT, ...] | None, list[Any]]] = []
+        for environment in self.environments:
+            dependencies = self._get_dependencies_in(candidate, environment)
+            for value, members in groups:
+                if value == dependencies:
+                    members.append(environment)
+                    break
+            else:
+                groups.append((dependencies, [environment]))
+        if len(groups) > 1:
+            raise _EnvironmentsDiverged(
+                candidate, [tuple(members) for _, members in groups]
+            )
+        return groups[0][0]
+
+    def find_matches(
+        self,
+        identifier: KT,
+        requirements: Mapping[KT, Iterator[RT]],
+        incompatibilities: Mapping[KT, Iterator[CT]],
+    ) -> Matches[CT]:
+        matches = build_iter_view(
+            super().find_matches(identifier, requirements, incompatibilities)
+        )
+        return _UsableMatches(self, matches)
+
+    def get_dependencies(self, candidate: CT) -> Iterable[RT]:
+        return self._get_shared_dependencies(candidate) or ()
+
+    def get_candidate_domain(self, identifier: KT) -> Iterable[CT] | None:
+        return None
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Collection, Generic
+from typing import TYPE_CHECKING, Any, Collection, Generic
 
-from ..structs import CT, RT, RequirementInformation
+from ..structs import CT, KT, RT, RequirementInformation
 
 if TYPE_CHECKING:
     from .criterion import Criterion
+    from .stats import ResolutionStats
 
 
 class ResolverException(Exception):
@@ -41,16 +42,44 @@ class InconsistentCandidate(ResolverException, Generic[RT, CT]):
 
 
 class ResolutionError(ResolverException):
-    pass
+    # Set by the resolver if statistics are collected.
+    stats: ResolutionStats | None = None
+    # Set by resolve_environments() to the environments that failed.
+    environments: tuple[Any, ...] | None = None
 
 
 class ResolutionImpossible(ResolutionError, Generic[RT, CT]):
+    # Set by the resolver if causes are minimized.
+    minimal_causes: list[RequirementInformation[RT, CT]] | None = None
+    root_causes: list[RT] | None = None
+
     def __init__(self, causes: Collection[RequirementInformation[RT, CT]]):
         super().__init__(causes)
         # causes is a list of RequirementInformation objects
         self.causes = causes
 
 
+class InvalidPins(ResolutionError, Generic[RT, CT, KT]):
+    """Raised by `Resolver.verify()` when pins do not satisfy the requirements.
+
+    ``identifiers`` lists the identifiers that are required but not pinned,
+    or whose pins do not satisfy a requirement on them, and ``causes`` the
+    requirements that are not satisfied, with their parents.
+    """
+
+    def __init__(
+        self,
+        causes: Collection[RequirementInformation[RT, CT]],
+        identifiers: Collection[KT],
+    ) -> None:
+        super().__init__(causes, identifiers)
+        self.causes = causes
+        self.identifiers = identifiers
+
+    def __str__(self) -> str:
+        return "Invalid pins: {}".format(", ".join(repr(k) for k in self.identifiers))
+
+
 class ResolutionTooDeep(ResolutionError):
     def __init__(self, round_count: int) -> None:
         super().__init__(round_count)
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import collections
+import concurrent.futures
+import copy
 import itertools
 import operator
-from typing import TYPE_CHECKING, Generic
+from typing import TYPE_CHECKING, Any, Generic, Hashable, TypeVar
 
+from ..providers import AbstractProvider, ProviderWrapper
+from ..reporters import BaseReporter
 from ..structs import (
     CT,
     KT,
     RT,
+    CandidateDomain,
+    CandidateMask,
     DirectedGraph,
+    IncompatibilitySet,
     IterableView,
     IteratorMapping,
     RequirementInformation,
@@ -17,35 +24,127 @@ from ..structs import (
     build_iter_view,
 )
 from .abstract import AbstractResolver, Result
+from .backjumping import BackjumpingPolicy
+from .batch import (
+    _SharedCacheProvider,
+    resolve_in_worker,
+    resolve_or_error,
+    set_worker_resolver,
+)
 from .criterion import Criterion
+from .delta import _DeltaTracker
+from .environments import _EnvironmentProvider, _EnvironmentsDiverged
 from .exceptions import (
     InconsistentCandidate,
     RequirementsConflicted,
+    ResolutionError,
     ResolutionImpossible,
     ResolutionTooDeep,
     ResolverException,
 )
+from .stats import ResolutionStats, _StatsProvider
+from .verification import verify_pins
 
 if TYPE_CHECKING:
-    from collections.abc import Collection, Iterable, Mapping
+    from collections.abc import Collection, Iterable, Iterator, Mapping
+    from typing import NamedTuple
+
+    from ..providers import Preference
 
-    from ..providers import AbstractProvider, Preference
-    from ..reporters import BaseReporter
+# Type of the environments given to resolve_environments().
+ET = TypeVar("ET", bound=Hashable)
 
 _OPTIMISTIC_BACKJUMPING_RATIO: float = 0.1
 
 
-def _build_result(state: State[RT, CT, KT]) -> Result[RT, CT, KT]:
-    mapping = state.mapping
-    all_keys: dict[int, KT | None] = {id(v): k for k, v in mapping.items()}
+def _as_incompatibility_set(
+    incompatibilities: Collection[CT],
+) -> IncompatibilitySet[CT]:
+    if isinstance(incompatibilities, IncompatibilitySet):
+        return incompatibilities
+    return IncompatibilitySet(incompatibilities)
+
+
+def _provides_candidate_domains(provider: AbstractProvider[RT, CT, KT]) -> bool:
+    """Whether the innermost provider implements get_candidate_domain().
+
+    Wrappers only forward the wrapped provider's domains, or hide them by
+    returning None, so they are looked through. Whether an identifier has a
+    domain is then decided by the value returned for it.
+    """
+    while isinstance(provider, ProviderWrapper):
+        provider = provider.provider
+    method = type(provider).get_candidate_domain
+    return method is not AbstractProvider.get_candidate_domain
+
+
+def _get_overridden_hooks(reporter: BaseReporter[RT, CT, KT]) -> frozenset[str]:
+    """Return the names of the reporter's hooks that are not no-ops.
+
+    Hooks inherited from `BaseReporter` do nothing, except `pinning_implied`,
+    which forwards to `pinning`. Hooks the reporter does not have at all are
+    skipped too, as reporters not derived from `BaseReporter` may predate
+    some of them; implied pins are then reported to `pinning`.
+    """
+    hooks = set()
+    for name, default in vars(BaseReporter).items():
+        if name.startswith("_") or not callable(default):
+            continue
+        method = getattr(reporter, name, None)
+        if method is None:
+            continue
+        if getattr(method, "__func__", None) is not default:
+            hooks.add(name)
+    if "pinning" in hooks:
+        hooks.add("pinning_implied")
+    return frozenset(hooks)
+
+
+def _get_only_candidate(candidates: Iterable[CT]) -> CT | None:
+    """Return the candidate if there is exactly one, and None otherwise."""
+    iterator = iter(candidates)
+    for candidate in iterator:
+        for _ in iterator:
+            return None
+        return candidate
+    return None
+
+
+def _get_connected_keys(state: State[RT, CT, KT]) -> set[KT | None]:
+    """Return the keys of criteria reachable from the root requirements.
+
+    A criterion is reachable if one of its requirements comes from the root,
+    or from a pinned candidate whose own criterion is reachable.
+    """
+    all_keys: dict[int, KT] = {id(v): k for k, v in state.mapping.items()}
+    children: dict[KT | None, list[KT]] = collections.defaultdict(list)
+    for key, criterion in state.criteria.items():
+        for p in criterion.iter_parent():
+            if p is None:
+                children[None].append(key)
+            elif id(p) in all_keys:
+                children[all_keys[id(p)]].append(key)
+    connected: set[KT | None] = {None}
+    pending: list[KT | None] = [None]
+    while pending:
+        for child in children[pending.pop()]:
+            if child not in connected:
+                connected.add(child)
+                pending.append(child)
+    return connected
+
+
+def _build_graph(
+    state: State[RT, CT, KT], connected: set[KT | None]
+) -> DirectedGraph[KT | None]:
+    all_keys: dict[int, KT | None] = {id(v): k for k, v in state.mapping.items()}
     all_keys[id(None)] = None
 
     graph: DirectedGraph[KT | None] = DirectedGraph()
     graph.add(None)  # Sentinel as root dependencies' parent.
 
-    connected: set[KT | None] = {None}
     for key, criterion in state.criteria.items():
-        if not _has_route_to_root(state.criteria, key, all_keys, connected):
+        if key not in connected:
             continue
         if key not in graph:
             graph.add(key)
@@ -57,10 +156,51 @@ def _build_result(state: State[RT, CT, KT]) -> Result[RT, CT, KT]:
             if pkey not in graph:
                 graph.add(pkey)
             graph.connect(pkey, key)
+    return graph
+
+
+def _get_connected_mapping(state: State[RT, CT, KT]) -> dict[KT, CT]:
+    """Return the pins of ``state`` reachable from the root requirements."""
+    connected = _get_connected_keys(state)
+    return {k: v for k, v in state.mapping.items() if k in connected}
+
+
+def _copy_state(state: State[RT, CT, KT]) -> State[RT, CT, KT]:
+    return State(
+        mapping=state.mapping.copy(),
+        criteria=state.criteria.copy(),
+        backtrack_causes=state.backtrack_causes[:],
+    )
+
+
+if TYPE_CHECKING:
 
+    class _Checkpoint(NamedTuple, Generic[RT, CT, KT]):
+        """How a resolution was at the start of a round, to fork from there.
+
+        The state on top of the stack is copied, as it is changed during the
+        round; the others are never changed. ``optimistic`` holds the
+        optimistic backjumping ratio, start round and rounds cutoff.
+        """
+
+        round_index: int
+        states: list[State[RT, CT, KT]]
+        save_states: list[State[RT, CT, KT]] | None
+        narrowed: dict[KT, None]
+        optimistic: tuple[float, int | None, int | None]
+
+else:
+    _Checkpoint = collections.namedtuple(
+        "_Checkpoint",
+        ["round_index", "states", "save_states", "narrowed", "optimistic"],
+    )
+
+
+def _build_result(state: State[RT, CT, KT]) -> Result[RT, CT, KT]:
+    connected = _get_connected_keys(state)
     return Result(
-        mapping={k: v for k, v in mapping.items() if k in connected},
-        graph=graph,
+        mapping={k: v for k, v in state.mapping.items() if k in connected},
+        graph=_build_graph(state, connected),
         criteria=state.criteria,
     )
 
@@ -76,15 +216,57 @@ class Resolution(Generic[RT, CT, KT]):
         self,
         provider: AbstractProvider[RT, CT, KT],
         reporter: BaseReporter[RT, CT, KT],
+        backjumping_policy: BackjumpingPolicy | None = None,
+        stats: ResolutionStats | None = None,
+        propagate_pins: bool = False,
+        reorder_candidates: bool = False,
+        minimize_causes: bool = False,
+        checkpoint_rounds: bool = False,
     ) -> None:
+        self._use_domains = _provides_candidate_domains(provider)
+        if stats is not None:
+            provider = _StatsProvider(provider, stats)
         self._p = provider
         self._r = reporter
+        # Reporter hooks worth calling. Calls to the others are skipped,
+        # except for starting() and ending(), called once per resolution.
+        self._hooks = _get_overridden_hooks(reporter)
+        self._stats = stats
+        self._propagate_pins = propagate_pins
+        # The criterion and pin last found satisfying each other, by
+        # identifier. Criteria are replaced rather than changed when their
+        # requirements change, so they need not be checked again.
+        self._satisfying: dict[KT, tuple[Criterion[RT, CT], CT]] = {}
+        # Identifiers whose candidates were narrowed other than by a pin, by
+        # the root requirements or backjumping, for pin propagation to check.
+        self._narrowed: dict[KT, None] = {}
+        self._reorder_candidates = reorder_candidates
+        # Requirement information of the criterion each candidate was tried
+        # from, by candidate id, to trace causes back to root requirements.
+        self._reasons: (
+            dict[int, tuple[CT, Collection[RequirementInformation[RT, CT]]]] | None
+        ) = {} if minimize_causes else None
         self._states: list[State[RT, CT, KT]] = []
+        # Where the current round started from, kept for `resume()`.
+        self._checkpoint_rounds = checkpoint_rounds
+        self._checkpoint: _Checkpoint[RT, CT, KT] | None = None
+        # Changes made since the end of the last round, if they are reported.
+        self._deltas: _DeltaTracker[RT, CT, KT] | None = None
+
+        # Candidate domains given by the provider, and masks of requirements
+        # over them. None marks identifiers matched with find_matches().
+        self._domains: dict[KT, CandidateDomain[CT] | None] = {}
+        self._requirement_masks: dict[tuple[KT, Hashable], int] = {}
+        self._unhashable_masks: dict[tuple[KT, int], tuple[RT, int]] = {}
 
         # Optimistic backjumping variables
-        self._optimistic_backjumping_ratio = _OPTIMISTIC_BACKJUMPING_RATIO
+        if backjumping_policy is None:
+            backjumping_policy = BackjumpingPolicy(_OPTIMISTIC_BACKJUMPING_RATIO)
+        self._policy = backjumping_policy
+        self._optimistic_backjumping_ratio = backjumping_policy.ratio
         self._save_states: list[State[RT, CT, KT]] | None = None
         self._optimistic_start_round: int | None = None
+        self._optimistic_rounds_cutoff: int | None = None
 
     @property
     def state(self) -> State[RT, CT, KT]:
@@ -99,28 +281,82 @@ class Resolution(Generic[RT, CT, KT]):
         This new state will be used to hold resolution results of the next
         coming round.
         """
-        base = self._states[-1]
-        state = State(
-            mapping=base.mapping.copy(),
-            criteria=base.criteria.copy(),
-            backtrack_causes=base.backtrack_causes[:],
+        self._states.append(_copy_state(self._states[-1]))
+        if self._stats is not None:
+            self._stats.max_depth = max(self._stats.max_depth, len(self._states))
+
+    def _get_domain(self, identifier: KT) -> CandidateDomain[CT] | None:
+        if not self._use_domains:
+            return None
+        try:
+            return self._domains[identifier]
+        except KeyError:
+            pass
+        candidates = self._p.get_candidate_domain(identifier=identifier)
+        domain = None if candidates is None else CandidateDomain(candidates)
+        self._domains[identifier] = domain
+        return domain
+
+    def _get_requirement_mask(
+        self, identifier: KT, domain: CandidateDomain[CT], requirement: RT
+    ) -> int:
+        """Return the mask of candidates in ``domain`` satisfying ``requirement``.
+
+        Masks are cached, so each distinct requirement is only checked against
+        the domain once per resolution. Unhashable requirements are keyed by
+        identity instead, and kept alive with their mask so the key is not
+        reused by another object.
+        """
+        try:
+            return self._requirement_masks[identifier, requirement]
+        except KeyError:
+            mask = self._requirement_masks[identifier, requirement] = (
+                self._compute_requirement_mask(domain, requirement)
+            )
+            return mask
+        except TypeError:
+            pass
+        key = (identifier, id(requirement))
+        try:
+            return self._unhashable_masks[key][1]
+        except KeyError:
+            mask = self._compute_requirement_mask(domain, requirement)
+            self._unhashable_masks[key] = (requirement, mask)
+            return mask
+
+    def _compute_requirement_mask(
+        self, domain: CandidateDomain[CT], requirement: RT
+    ) -> int:
+        return domain.mask_where(
+            lambda c: self._p.is_satisfied_by(requirement=requirement, candidate=c)
         )
-        self._states.append(state)
 
     def _add_to_criteria(
         self,
         criteria: dict[KT, Criterion[RT, CT]],
         requirement: RT,
         parent: CT | None,
+        *,
+        report: bool = True,
     ) -> None:
-        self._r.adding_requirement(requirement=requirement, parent=parent)
+        if report and "adding_requirement" in self._hooks:
+            self._r.adding_requirement(requirement=requirement, parent=parent)
 
         identifier = self._p.identify(requirement_or_candidate=requirement)
         criterion = criteria.get(identifier)
+        domain = self._get_domain(identifier)
+        if domain is not None:
+            self._add_to_domain_criteria(
+                criteria, identifier, domain, requirement, parent
+            )
+            return
+
+        new_incompatibilities: dict[KT, IncompatibilitySet[CT]] = {}
         if criterion:
-            incompatibilities = list(criterion.incompatibilities)
+            incompatibilities = _as_incompatibility_set(criterion.incompatibilities)
         else:
-            incompatibilities = []
+            incompatibilities = IncompatibilitySet()
+            new_incompatibilities = {identifier: incompatibilities}
 
         matches = self._p.find_matches(
             identifier=identifier,
@@ -132,7 +368,7 @@ class Resolution(Generic[RT, CT, KT]):
             incompatibilities=IteratorMapping(
                 criteria,
                 operator.attrgetter("incompatibilities"),
-                {identifier: incompatibilities},
+                new_incompatibilities,
             ),
         )
 
@@ -151,6 +387,57 @@ class Resolution(Generic[RT, CT, KT]):
             raise RequirementsConflicted(criterion)
         criteria[identifier] = criterion
 
+    def _get_domain_candidates(
+        self,
+        identifier: KT,
+        domain: CandidateDomain[CT],
+        requirements: Iterable[RT],
+        incompatibilities: CandidateMask[CT],
+    ) -> CandidateMask[CT]:
+        """Return candidates in ``domain`` matching like `find_matches()` would.
+
+        This is a bitwise AND of the requirements' masks, and AND NOT of the
+        incompatibilities, so the provider is only asked about requirements
+        not seen before.
+        """
+        mask = domain.full_mask & ~incompatibilities.mask
+        for requirement in requirements:
+            if not mask:
+                break
+            mask &= self._get_requirement_mask(identifier, domain, requirement)
+        return CandidateMask(domain, mask)
+
+    def _add_to_domain_criteria(
+        self,
+        criteria: dict[KT, Criterion[RT, CT]],
+        identifier: KT,
+        domain: CandidateDomain[CT],
+        requirement: RT,
+        parent: CT | None,
+    ) -> None:
+        criterion = criteria.get(identifier)
+        information = RequirementInformation(requirement, parent)
+        if criterion:
+            incompatibilities = criterion.incompatibilities
+            assert isinstance(incompatibilities, CandidateMask)
+            information_list = [*criterion.information, information]
+        else:
+            incompatibilities = CandidateMask(domain)
+            information_list = [information]
+        criterion = Criterion(
+            candidates=self._get_domain_candidates(
+                identifier,
+                domain,
+                (i.requirement for i in information_list),
+                incompatibilities,
+            ),
+            information=information_list,
+            incompatibilities=incompatibilities,
+        )
+        if not criterion.candidates:
+            raise RequirementsConflicted(criterion)
+        criteria[identifier] = criterion
+
     def _remove_information_from_criteria(
         self, criteria: dict[KT, Criterion[RT, CT]], parents: Collection[KT]
     ) -> None:
@@ -165,18 +452,21 @@ class Resolution(Generic[RT, CT, KT]):
         if not parents:
             return
         for key, criterion in criteria.items():
+            information = [
+                information
+                for information in criterion.information
+                if (
+                    information.parent is None
+                    or self._p.identify(information.parent) not in parents
+                )
+            ]
+            if len(information) == len(criterion.information):
+                continue
             criteria[key] = Criterion(
-                criterion.candidates,
-                [
-                    information
-                    for information in criterion.information
-                    if (
-                        information.parent is None
-                        or self._p.identify(information.parent) not in parents
-                    )
-                ],
-                criterion.incompatibilities,
+                criterion.candidates, information, criterion.incompatibilities
             )
+            if self._deltas is not None:
+                self._deltas.change([key])
 
     def _get_preference(self, name: KT) -> Preference:
         return self._p.get_preference(
@@ -200,10 +490,29 @@ class Resolution(Generic[RT, CT, KT]):
             current_pin = self.state.mapping[name]
         except KeyError:
             return False
-        return all(
+        checked = self._satisfying.get(name)
+        if (
+            checked is not None
+            and checked[0] is criterion
+            and checked[1] is current_pin
+        ):
+            return True
+        satisfied = all(
             self._p.is_satisfied_by(requirement=r, candidate=current_pin)
             for r in criterion.iter_requirement()
         )
+        if satisfied:
+            self._satisfying[name] = (criterion, current_pin)
+        return satisfied
+
+    def _record_reason(self, candidate: CT, criterion: Criterion[RT, CT]) -> None:
+        if self._reasons is not None:
+            self._reasons[id(candidate)] = (candidate, criterion.information)
+
+    def _get_changed_keys(self, criteria: dict[KT, Criterion[RT, CT]]) -> list[KT]:
+        """Return the keys of ``criteria`` differing from the current state."""
+        current = self.state.criteria
+        return [k for k, v in criteria.items() if current.get(k) is not v]
 
     def _get_updated_criteria(self, candidate: CT) -> dict[KT, Criterion[RT, CT]]:
         criteria = self.state.criteria.copy()
@@ -211,45 +520,177 @@ class Resolution(Generic[RT, CT, KT]):
             self._add_to_criteria(criteria, requirement, parent=candidate)
         return criteria
 
+    def _find_unfitting_pin(
+        self, candidate: CT, criteria: dict[KT, Criterion[RT, CT]], changed: list[KT]
+    ) -> Criterion[RT, CT] | None:
+        """Find a pinned criterion whose pin ``candidate`` does not satisfy.
+
+        ``criteria`` are updated with the dependencies of ``candidate``, and
+        ``changed`` are their keys that differ from the current state.
+        Unpinned criteria left empty already raised `RequirementsConflicted`
+        when updated, so this checks pinned ones, whose pin must then satisfy
+        the requirements ``candidate`` added, or be replaced later. This costs
+        one `is_satisfied_by()` call per dependency on a pinned identifier.
+
+        :returns: The first criterion found whose pin does not satisfy it, or
+            None.
+        """
+        mapping = self.state.mapping
+        for key in changed:
+            if key not in mapping:
+                continue
+            criterion = criteria[key]
+            pin = mapping[key]
+            for requirement, parent in criterion.information:
+                if parent is candidate and not self._p.is_satisfied_by(
+                    requirement=requirement, candidate=pin
+                ):
+                    return criterion
+        return None
+
     def _attempt_to_pin_criterion(self, name: KT) -> list[Criterion[RT, CT]]:
         criterion = self.state.criteria[name]
 
         causes: list[Criterion[RT, CT]] = []
+        # When reordering candidates, the first candidate conflicting with
+        # current pins, its updated criteria and changed keys, pinned if no
+        # other candidate works.
+        deferred: tuple[CT, dict[KT, Criterion[RT, CT]], list[KT]] | None = None
         for candidate in criterion.candidates:
+            self._record_reason(candidate, criterion)
             try:
                 criteria = self._get_updated_criteria(candidate)
             except RequirementsConflicted as e:
-                self._r.rejecting_candidate(e.criterion, candidate)
+                if self._stats is not None:
+                    self._stats.rejections += 1
+                if "rejecting_candidate" in self._hooks:
+                    self._r.rejecting_candidate(e.criterion, candidate)
                 causes.append(e.criterion)
                 continue
 
-            # Check the newly-pinned candidate actually works. This should
-            # always pass under normal circumstances, but in the case of a
-            # faulty provider, we will raise an error to notify the implementer
-            # to fix find_matches() and/or is_satisfied_by().
-            satisfied = all(
-                self._p.is_satisfied_by(requirement=r, candidate=candidate)
-                for r in criterion.iter_requirement()
-            )
-            if not satisfied:
-                raise InconsistentCandidate(candidate, criterion)
-
-            self._r.pinning(candidate=candidate)
-            self.state.criteria.update(criteria)
+            changed: list[KT] = []
+            if (
+                self._deltas is not None
+                or self._propagate_pins
+                or self._reorder_candidates
+            ):
+                changed = self._get_changed_keys(criteria)
+
+            if self._reorder_candidates and self._find_unfitting_pin(
+                candidate, criteria, changed
+            ):
+                if self._stats is not None:
+                    self._stats.deferred_candidates += 1
+                if deferred is None:
+                    deferred = (candidate, criteria, changed)
+                continue
 
-            # Put newly-pinned candidate at the end. This is essential because
-            # backtracking looks at this mapping to get the last pin.
-            self.state.mapping.pop(name, None)
-            self.state.mapping[name] = candidate
+            self._pin(name, criterion, candidate, criteria, changed)
+            return []
 
+        if deferred is not None:
+            self._pin(name, criterion, *deferred)
             return []
 
         # All candidates tried, nothing works. This criterion is a dead
         # end, signal for backtracking.
         return causes
 
+    def _pin(
+        self,
+        name: KT,
+        criterion: Criterion[RT, CT],
+        candidate: CT,
+        criteria: dict[KT, Criterion[RT, CT]],
+        changed: list[KT],
+    ) -> None:
+        # Check the newly-pinned candidate actually works. This should
+        # always pass under normal circumstances, but in the case of a
+        # faulty provider, we will raise an error to notify the implementer
+        # to fix find_matches() and/or is_satisfied_by().
+        satisfied = all(
+            self._p.is_satisfied_by(requirement=r, candidate=candidate)
+            for r in criterion.iter_requirement()
+        )
+        if not satisfied:
+            raise InconsistentCandidate(candidate, criterion)
+        self._satisfying[name] = (criterion, candidate)
+
+        if self._stats is not None:
+            self._stats.pins += 1
+        if "pinning" in self._hooks:
+            self._r.pinning(candidate=candidate)
+        if self._deltas is not None:
+            self._deltas.pin(name, candidate, changed)
+        self.state.criteria.update(criteria)
+        self.state.mapping[name] = candidate
+        if self._propagate_pins:
+            self._propagate_implied_pins(changed)
+
+        # Put newly-pinned candidate at the end, after any pin it implied.
+        # This is essential because backtracking looks at this mapping to
+        # get the last pin.
+        self.state.mapping.pop(name)
+        self.state.mapping[name] = candidate
+
+    def _propagate_implied_pins(self, changed: Iterable[KT]) -> None:
+        """Pin every unpinned identifier left with exactly one candidate.
+
+        This runs right after a pin, in the same state, so implied pins are
+        reverted along with it when backjumping. Dependencies of implied pins
+        are added too, which may leave more identifiers with one candidate.
+        Propagation stops at the first implied pin whose dependencies
+        conflict; the conflict is then found by a regular round.
+
+        Only criteria that may have just been left with one candidate are
+        checked: those ``changed`` by the pin, those narrowed by the root
+        requirements or backjumping since the last propagation, and those
+        changed by the dependencies of implied pins.
+        """
+        mapping = self.state.mapping
+        pending = self._narrowed
+        pending.update(dict.fromkeys(changed))
+        self._narrowed = {}
+        while pending:
+            key = next(iter(pending))
+            del pending[key]
+            if key in mapping:
+                continue
+            criterion = self.state.criteria.get(key)
+            if criterion is None:
+                continue
+            candidate = _get_only_candidate(criterion.candidates)
+            if candidate is None:
+                continue
+            self._record_reason(candidate, criterion)
+            try:
+                criteria = self._get_updated_criteria(candidate)
+            except RequirementsConflicted:
+                return
+            satisfied = all(
+                self._p.is_satisfied_by(requirement=r, candidate=candidate)
+                for r in criterion.iter_requirement()
+            )
+            if not satisfied:
+                raise InconsistentCandidate(candidate, criterion)
+            self._satisfying[key] = (criterion, candidate)
+
+            if self._stats is not None:
+                self._stats.pins += 1
+                self._stats.implied_pins += 1
+            if "pinning_implied" in self._hooks:
+                getattr(self._r, "pinning_implied", self._r.pinning)(
+                    candidate=candidate
+                )
+            changed = self._get_changed_keys(criteria)
+            pending.update(dict.fromkeys(changed))
+            if self._deltas is not None:
+                self._deltas.pin(key, candidate, changed)
+            self.state.criteria.update(criteria)
+            mapping[key] = candidate
+
     def _patch_criteria(
-        self, incompatibilities_from_broken: list[tuple[KT, list[CT]]]
+        self, incompatibilities_from_broken: list[tuple[KT, Collection[CT]]]
     ) -> bool:
         # Create a new state from the last known-to-work one, and apply
         # the previously gathered incompatibility information.
@@ -260,6 +701,27 @@ class Resolution(Generic[RT, CT, KT]):
                 criterion = self.state.criteria[k]
             except KeyError:
                 continue
+            if isinstance(criterion.incompatibilities, CandidateMask):
+                if not self._patch_domain_criterion(k, criterion, incompatibilities):
+                    return False
+                if self._propagate_pins:
+                    self._narrowed[k] = None
+                continue
+            known = _as_incompatibility_set(criterion.incompatibilities)
+            learned = known.union(incompatibilities)
+            # Nothing new was learned for this identifier since the state we
+            # are patching, so its candidates are still accurate.
+            if len(learned) == len(known):
+                continue
+            # Record the incompatibilities on the state first, so the provider
+            # sees them through the criteria. The state is discarded if
+            # patching fails.
+            patched = Criterion(
+                candidates=criterion.candidates,
+                information=list(criterion.information),
+                incompatibilities=learned,
+            )
+            self.state.criteria[k] = patched
             matches = self._p.find_matches(
                 identifier=k,
                 requirements=IteratorMapping(
@@ -269,38 +731,100 @@ class Resolution(Generic[RT, CT, KT]):
                 incompatibilities=IteratorMapping(
                     self.state.criteria,
                     operator.attrgetter("incompatibilities"),
-                    {k: incompatibilities},
                 ),
             )
             candidates: IterableView[CT] = build_iter_view(matches)
             if not candidates:
                 return False
-            incompatibilities.extend(criterion.incompatibilities)
-            self.state.criteria[k] = Criterion(
-                candidates=candidates,
-                information=list(criterion.information),
-                incompatibilities=incompatibilities,
-            )
+            patched.candidates = candidates
+            if self._propagate_pins:
+                self._narrowed[k] = None
+        return True
+
+    def _patch_domain_criterion(
+        self,
+        name: KT,
+        criterion: Criterion[RT, CT],
+        incompatibilities: Collection[CT],
+    ) -> bool:
+        """Exclude incompatibilities from a criterion with a domain mask.
+
+        Returns False if no candidate is left.
+        """
+        known = criterion.incompatibilities
+        assert isinstance(known, CandidateMask)
+        learned = known.union(incompatibilities)
+        if learned.mask == known.mask:
+            return True
+        candidates = self._get_domain_candidates(
+            name, known.domain, criterion.iter_requirement(), learned
+        )
+        if not candidates:
+            return False
+        self.state.criteria[name] = Criterion(
+            candidates=candidates,
+            information=list(criterion.information),
+            incompatibilities=learned,
+        )
         return True
 
-    def _save_state(self) -> None:
-        """Save states for potential rollback if optimistic backjumping fails."""
+    def _save_state(self, states: list[State[RT, CT, KT]]) -> None:
+        """Save states for potential rollback if optimistic backjumping fails.
+
+        ``states`` is the stack as it was before backjumping started, so a
+        rollback retries the failed round and then backjumps regularly.
+
+        States are saved by reference rather than copied. Only the state on
+        top of the stack is ever mutated, and backjumping always pushes a new
+        state (a copy of the one below) before working on it, so states kept
+        here are never changed afterwards. This makes saving cost one list
+        of references no matter how deep the stack is.
+        """
         if self._save_states is None:
-            self._save_states = [
-                State(
-                    mapping=s.mapping.copy(),
-                    criteria=s.criteria.copy(),
-                    backtrack_causes=s.backtrack_causes[:],
-                )
-                for s in self._states
-            ]
+            self._save_states = states
 
-    def _rollback_states(self) -> None:
-        """Rollback states and disable optimistic backjumping."""
-        self._optimistic_backjumping_ratio = 0.0
+    def _rollback_states(self, round_index: int) -> None:
+        """Rollback states and let the policy decide whether to keep
+        backjumping optimistically.
+        """
+        if self._optimistic_start_round is None:
+            rounds = 0
+        else:
+            rounds = round_index - self._optimistic_start_round
+        ratio = self._policy.record_rollback(rounds)
+        if self._stats is not None:
+            self._stats.optimistic_rollbacks += 1
+        self._optimistic_backjumping_ratio = ratio
+        self._optimistic_start_round = None
+        self._optimistic_rounds_cutoff = None
         if self._save_states:
             self._states = self._save_states
-            self._save_states = None
+        self._save_states = None
+        if self._deltas is not None:
+            self._deltas.restructure()
+        if "rolling_back_optimistic_backjumping" in self._hooks:
+            self._r.rolling_back_optimistic_backjumping(index=round_index, ratio=ratio)
+
+    def _is_optimistic_budget_exhausted(
+        self, round_index: int, max_rounds: int
+    ) -> bool:
+        if not self._optimistic_backjumping_ratio or self._save_states is None:
+            return False
+        if self._optimistic_start_round is None:
+            self._optimistic_start_round = round_index
+            self._optimistic_rounds_cutoff = self._policy.get_budget(
+                self._optimistic_backjumping_ratio, round_index, max_rounds
+            )
+            if self._optimistic_rounds_cutoff <= 0:
+                return True
+            if "starting_optimistic_backjumping" in self._hooks:
+                self._r.starting_optimistic_backjumping(
+                    index=round_index, budget=self._optimistic_rounds_cutoff
+                )
+        elif self._optimistic_rounds_cutoff is not None:
+            rounds = round_index - self._optimistic_start_round
+            return rounds >= self._optimistic_rounds_cutoff
+        return False
 
     def _backjump(self, causes: list[RequirementInformation[RT, CT]]) -> bool:
         """Perform backjumping.
@@ -338,6 +862,12 @@ class Resolution(Generic[RT, CT, KT]):
             (c.requirement for c in causes),
         )
         incompatible_deps = {self._p.identify(r) for r in incompatible_reqs}
+        skipped = 0
+        learned: list[tuple[KT, CT]] = []
+
+        # Keep the stack as it is now in case we backjump optimistically and
+        # need to roll back to it.
+        states_before_backjump = self._states[:]
         while len(self._states) >= 3:
             # Remove the state that triggered backtracking.
             del self._states[-1]
@@ -346,10 +876,12 @@ class Resolution(Generic[RT, CT, KT]):
             broken_state = self.state
             while True:
                 # Retrieve the last candidate pin and known incompatibilities.
+                # The broken state may be saved for a rollback, so read its
+                # last pin without mutating it.
                 try:
                     broken_state = self._states.pop()
-                    name, candidate = broken_state.mapping.popitem()
-                except (IndexError, KeyError):
+                    name, candidate = next(reversed(broken_state.mapping.items()))
+                except (IndexError, StopIteration):
                     raise ResolutionImpossible(causes) from None
 
                 if (
@@ -367,7 +899,7 @@ class Resolution(Generic[RT, CT, KT]):
                     and self._save_states is None
                     and name not in incompatible_deps
                 ):
-                    self._save_state()
+                    self._save_state(states_before_backjump)
 
                 # If the current dependencies and the incompatible dependencies
                 # are overlapping then we have likely found a cause of the
@@ -381,7 +913,7 @@ class Resolution(Generic[RT, CT, KT]):
                 # Fallback: We should not backtrack to the point where
                 # broken_state.mapping is empty, so stop backtracking for
                 # a chance for the resolution to recover
-                if not broken_state.mapping:
+                if len(broken_state.mapping) <= 1:
                     break
 
                 # Guard: We need at least two state to remain to both
@@ -389,18 +921,28 @@ class Resolution(Generic[RT, CT, KT]):
                 if len(self._states) <= 1:
                     raise ResolutionImpossible(causes)
 
-            incompatibilities_from_broken = [
-                (k, list(v.incompatibilities)) for k, v in broken_state.criteria.items()
+                # Regular backjumping would have stopped at this state.
+                if name not in incompatible_deps:
+                    skipped += 1
+
+            incompatibilities_from_broken: list[tuple[KT, Collection[CT]]] = [
+                (k, v.incompatibilities) for k, v in broken_state.criteria.items()
             ]
 
             # Also mark the newly known incompatibility.
             incompatibilities_from_broken.append((name, [candidate]))
+            learned.append((name, candidate))
 
             self._push_new_state()
             success = self._patch_criteria(incompatibilities_from_broken)
 
             # It works! Let's work on this new state.
             if success:
+                if skipped:
+                    self._policy.record_jump(skipped)
+                if self._deltas is not None:
+                    distance = len(states_before_backjump) - len(self._states)
+                    self._deltas.backjump(learned, distance)
                 return True
 
             # State does not work after applying known incompatibilities.
@@ -409,12 +951,139 @@ class Resolution(Generic[RT, CT, KT]):
         # No way to backtrack anymore.
         return False
 
+    def _has_matches(
+        self, identifier: KT, causes: list[RequirementInformation[RT, CT]]
+    ) -> bool:
+        """Whether any candidate satisfies all requirements of ``causes``.
+
+        Known incompatibilities are ignored. Masks of requirements already
+        computed for a candidate domain are reused instead of asking the
+        provider again.
+        """
+        requirements = [c.requirement for c in causes]
+        domain = self._get_domain(identifier)
+        if domain is not None:
+            return bool(
+                self._get_domain_candidates(
+                    identifier, domain, requirements, CandidateMask(domain)
+                )
+            )
+        matches = self._p.find_matches(
+            identifier=identifier,
+            requirements=IteratorMapping(
+                {},
+                operator.methodcaller("iter_requirement"),
+                {identifier: requirements},
+            ),
+            incompatibilities=IteratorMapping(
+                {}, operator.attrgetter("incompatibilities"), {identifier: ()}
+            ),
+        )
+        return bool(build_iter_view(matches))
+
+    def minimize_causes(
+        self, causes: Collection[RequirementInformation[RT, CT]]
+    ) -> list[RequirementInformation[RT, CT]]:
+        """Return a small subset of ``causes`` that conflict by themselves.
+
+        Causes are grouped by the identifier of their requirement. In each
+        group without any matching candidate, every cause is dropped in turn
+        if the rest still match nothing (a deletion filter), leaving a group
+        where each remaining requirement is needed for the conflict. This
+        takes at most one `find_matches()` call per cause, or none for
+        identifiers with a candidate domain. If no group conflicts by itself,
+        i.e. the conflict needs known incompatibilities, ``causes`` are
+        returned unchanged.
+        """
+        groups: dict[KT, list[RequirementInformation[RT, CT]]] = {}
+        for cause in causes:
+            identifier = self._p.identify(requirement_or_candidate=cause.requirement)
+            groups.setdefault(identifier, []).append(cause)
+
+        minimal: list[RequirementInformation[RT, CT]] = []
+        for identifier, group in groups.items():
+            if self._has_matches(identifier, group):
+                continue
+            kept = group
+            for cause in group:
+                trial = [c for c in kept if c is not cause]
+                if trial and not self._has_matches(identifier, trial):
+                    kept = trial
+            minimal.extend(kept)
+        return minimal or list(causes)
+
+    def trace_root_causes(
+        self, causes: Iterable[RequirementInformation[RT, CT]]
+    ) -> list[RT]:
+        """Return the root requirements ``causes`` derive from.
+
+        Each cause is followed through the requirements its parent was tried
+        from, up to requirements without a parent. This is only available
+        when the resolution was created with ``minimize_causes=True``.
+        """
+        if self._reasons is None:
+            raise RuntimeError("reasons of candidates are not recorded")
+        roots: dict[int, RT] = {}
+        seen: set[int] = set()
+        pending = collections.deque(causes)
+        while pending:
+            cause = pending.popleft()
+            if cause.parent is None:
+                roots.setdefault(id(cause.requirement), cause.requirement)
+                continue
+            if id(cause.parent) in seen:
+                continue
+            seen.add(id(cause.parent))
+            reason = self._reasons.get(id(cause.parent))
+            if reason is not None and reason[0] is cause.parent:
+                pending.extend(reason[1])
+        return list(roots.values())
+
     def _extract_causes(
         self, criteria: list[Criterion[RT, CT]]
     ) -> list[RequirementInformation[RT, CT]]:
         """Extract causes from list of criteria and deduplicate"""
         return list({id(i): i for c in criteria for i in c.information}.values())
 
+    def _end_round(self, index: int) -> None:
+        if "ending_round" in self._hooks:
+            self._r.ending_round(index=index, state=self.state)
+        if self._deltas is not None:
+            self._r.ending_round_delta(delta=self._deltas.build(index, self.state))
+
+    def _choose_name(self, unsatisfied_names: list[KT]) -> KT:
+        """Choose the unsatisfied identifier to work on in this round."""
+        if len(unsatisfied_names) > 1:
+            narrowed_unstatisfied_names = list(
+                self._p.narrow_requirement_selection(
+                    identifiers=unsatisfied_names,
+                    resolutions=self.state.mapping,
+                    candidates=IteratorMapping(
+                        self.state.criteria,
+                        operator.attrgetter("candidates"),
+                    ),
+                    information=IteratorMapping(
+                        self.state.criteria,
+                        operator.attrgetter("information"),
+                    ),
+                    backtrack_causes=self.state.backtrack_causes,
+                )
+            )
+        else:
+            narrowed_unstatisfied_names = unsatisfied_names
+
+        # If there are no unsatisfied names use unsatisfied names
+        if not narrowed_unstatisfied_names:
+            raise RuntimeError("narrow_requirement_selection returned 0 names")
+
+        # If there is only 1 unsatisfied name skip calling self._get_preference
+        if len(narrowed_unstatisfied_names) > 1:
+            # Choose the most preferred unpinned criterion to try.
+            name = min(narrowed_unstatisfied_names, key=self._get_preference)
+        else:
+            name = narrowed_unstatisfied_names[0]
+        return name
+
     def resolve(self, requirements: Iterable[RT], max_rounds: int) -> State[RT, CT, KT]:
         if self._states:
             raise RuntimeError("already resolved")
@@ -434,37 +1103,84 @@ class Resolution(Generic[RT, CT, KT]):
                 self._add_to_criteria(self.state.criteria, r, parent=None)
             except RequirementsConflicted as e:
                 raise ResolutionImpossible(e.criterion.information) from e
+        if self._propagate_pins:
+            self._narrowed = dict.fromkeys(self.state.criteria)
 
         # The root state is saved as a sentinel so the first ever pin can have
         # something to backtrack to if it fails. The root state is basically
         # pinning the virtual "root" package in the graph.
         self._push_new_state()
+        return self._resolve_rounds(0, max_rounds)
+
+    def resume(
+        self, resolution: Resolution[RT, CT, KT], max_rounds: int
+    ) -> State[RT, CT, KT]:
+        """Continue ``resolution`` from the start of its last round.
+
+        ``resolution`` must have been created with ``checkpoint_rounds``, and
+        have been interrupted by an error raised by the provider. It is left
+        as it was, so it can be resumed several times, by resolutions using
+        other providers: that round and the following ones are resolved
+        again with this resolution's provider. Everything resolved before
+        that round must still hold with it.
+        """
+        if self._states:
+            raise RuntimeError("already resolved")
+        checkpoint = resolution._checkpoint
+        if checkpoint is None:
+            raise RuntimeError("no round to resume")
 
-        # Variables for optimistic backjumping
-        optimistic_rounds_cutoff: int | None = None
-        optimistic_backjumping_start_round: int | None = None
+        self._r.starting()
 
-        for round_index in range(max_rounds):
-            self._r.starting_round(index=round_index)
+        # States on top of the stacks are changed as the resolution goes on,
+        # so each resumption gets its own copies.
+        self._states = [*checkpoint.states[:-1], _copy_state(checkpoint.states[-1])]
+        save_states = checkpoint.save_states
+        if save_states:
+            save_states = [*save_states[:-1], _copy_state(save_states[-1])]
+        self._save_states = save_states
+        (
+            self._optimistic_backjumping_ratio,
+            self._optimistic_start_round,
+            self._optimistic_rounds_cutoff,
+        ) = checkpoint.optimistic
+        self._narrowed = dict(checkpoint.narrowed)
+        if self._reasons is not None and resolution._reasons:
+            self._reasons.update(resolution._reasons)
+        if self._stats is not None:
+            self._stats.rounds = checkpoint.round_index
+        return self._resolve_rounds(checkpoint.round_index, max_rounds)
+
+    def _take_checkpoint(self, round_index: int) -> None:
+        self._checkpoint = _Checkpoint(
+            round_index=round_index,
+            states=[*self._states[:-1], _copy_state(self.state)],
+            save_states=self._save_states,
+            narrowed=dict(self._narrowed),
+            optimistic=(
+                self._optimistic_backjumping_ratio,
+                self._optimistic_start_round,
+                self._optimistic_rounds_cutoff,
+            ),
+        )
 
-            # Handle if optimistic backjumping has been running for too long
-            if self._optimistic_backjumping_ratio and self._save_states is not None:
-                if optimistic_backjumping_start_round is None:
-                    optimistic_backjumping_start_round = round_index
-                    optimistic_rounds_cutoff = int(
-                        (max_rounds - round_index) * self._optimistic_backjumping_ratio
-                    )
+    def _resolve_rounds(self, start: int, max_rounds: int) -> State[RT, CT, KT]:
+        if "ending_round_delta" in self._hooks:
+            self._deltas = _DeltaTracker(State({}, {}, []))
+            self._deltas.restructure()
 
-                    if optimistic_rounds_cutoff <= 0:
-                        self._rollback_states()
-                        continue
-                elif optimistic_rounds_cutoff is not None:
-                    if (
-                        round_index - optimistic_backjumping_start_round
-                        >= optimistic_rounds_cutoff
-                    ):
-                        self._rollback_states()
-                        continue
+        for round_index in range(start, max_rounds):
+            if self._checkpoint_rounds:
+                self._take_checkpoint(round_index)
+            if self._stats is not None:
+                self._stats.rounds += 1
+            if "starting_round" in self._hooks:
+                self._r.starting_round(index=round_index)
+
+            # Handle if optimistic backjumping has been running for too long
+            if self._is_optimistic_budget_exhausted(round_index, max_rounds):
+                self._rollback_states(round_index)
+                continue
 
             unsatisfied_names = [
                 key
@@ -474,41 +1190,17 @@ class Resolution(Generic[RT, CT, KT]):
 
             # All criteria are accounted for. Nothing more to pin, we are done!
             if not unsatisfied_names:
+                if self._optimistic_start_round is not None:
+                    self._policy.record_success(
+                        round_index - self._optimistic_start_round
+                    )
                 self._r.ending(state=self.state)
                 return self.state
 
             # keep track of satisfied names to calculate diff after pinning
             satisfied_names = set(self.state.criteria.keys()) - set(unsatisfied_names)
 
-            if len(unsatisfied_names) > 1:
-                narrowed_unstatisfied_names = list(
-                    self._p.narrow_requirement_selection(
-                        identifiers=unsatisfied_names,
-                        resolutions=self.state.mapping,
-                        candidates=IteratorMapping(
-                            self.state.criteria,
-                            operator.attrgetter("candidates"),
-                        ),
-                        information=IteratorMapping(
-                            self.state.criteria,
-                            operator.attrgetter("information"),
-                        ),
-                        backtrack_causes=self.state.backtrack_causes,
-                    )
-                )
-            else:
-                narrowed_unstatisfied_names = unsatisfied_names
-
-            # If there are no unsatisfied names use unsatisfied names
-            if not narrowed_unstatisfied_names:
-                raise RuntimeError("narrow_requirement_selection returned 0 names")
-
-            # If there is only 1 unsatisfied name skip calling self._get_preference
-            if len(narrowed_unstatisfied_names) > 1:
-                # Choose the most preferred unpinned criterion to try.
-                name = min(narrowed_unstatisfied_names, key=self._get_preference)
-            else:
-                name = narrowed_unstatisfied_names[0]
+            name = self._choose_name(unsatisfied_names)
 
             failure_criterion = self._attempt_to_pin_criterion(name)
 
@@ -516,7 +1208,10 @@ class Resolution(Generic[RT, CT, KT]):
                 causes = self._extract_causes(failure_criterion)
                 # Backjump if pinning fails. The backjump process puts us in
                 # an unpinned state, so we can work on it in the next round.
-                self._r.resolving_conflicts(causes=causes)
+                if "resolving_conflicts" in self._hooks:
+                    self._r.resolving_conflicts(causes=causes)
+                if self._stats is not None:
+                    self._stats.backjumps += 1
 
                 try:
                     success = self._backjump(causes)
@@ -533,7 +1228,7 @@ class Resolution(Generic[RT, CT, KT]):
                     )
 
                 if failed_optimistic_backjumping and self._save_states:
-                    self._rollback_states()
+                    self._rollback_states(round_index)
                 else:
                     self.state.backtrack_causes[:] = causes
 
@@ -555,7 +1250,7 @@ class Resolution(Generic[RT, CT, KT]):
                 # Pinning was successful. Push a new state to do another pin.
                 self._push_new_state()
 
-            self._r.ending_round(index=round_index, state=self.state)
+            self._end_round(round_index)
 
         raise ResolutionTooDeep(max_rounds)
 
@@ -565,10 +1260,32 @@ class Resolver(AbstractResolver[RT, CT, KT]):
 
     base_exception = ResolverException
 
+    def __init__(
+        self,
+        provider: AbstractProvider[RT, CT, KT],
+        reporter: BaseReporter[RT, CT, KT],
+        *,
+        backjumping_policy: BackjumpingPolicy | None = None,
+    ) -> None:
+        """
+        :param backjumping_policy: A `BackjumpingPolicy` deciding how much
+            optimistic backjumping to attempt. The same policy object is used
+            by every resolution run by this resolver, so a policy that adapts
+            itself (e.g. `AdaptiveBackjumpingPolicy`) learns across them. By
+            default, each resolution gets a fixed ratio of 0.1.
+        """
+        super().__init__(provider, reporter)
+        self.backjumping_policy = backjumping_policy
+
     def resolve(  # type: ignore[override]
         self,
         requirements: Iterable[RT],
         max_rounds: int = 100,
+        *,
+        collect_stats: bool = False,
+        propagate_pins: bool = False,
+        reorder_candidates: bool = False,
+        minimize_causes: bool = False,
     ) -> Result[RT, CT, KT]:
         """Take a collection of constraints, spit out the resolution result.
 
@@ -596,32 +1313,274 @@ class Resolver(AbstractResolver[RT, CT, KT]):
             the resolver gave up. This is usually caused by a circular
             dependency, but you can try to resolve this by increasing the
             `max_rounds` argument.
+
+        If `collect_stats` is true, a `ResolutionStats` instance describing
+        the resolution process is attached as ``stats`` to the result, or to
+        the raised `ResolutionError`. Otherwise ``stats`` is None.
+
+        If `propagate_pins` is true, identifiers left with a single candidate
+        after a pin are pinned right away, in the same round, instead of each
+        taking a round of their own. These implied pins are reported with the
+        reporter's `pinning_implied` hook, and are reverted along with the
+        pin that implied them when backjumping.
+
+        If `reorder_candidates` is true, candidates whose dependencies fit the
+        current pins are tried first: a candidate is put off if one of its
+        dependencies is not satisfied by the current pin of that identifier,
+        and the next candidate fitting the current pins is pinned instead.
+        Without it, the pin is only found unsatisfied, and replaced, when the
+        identifier is worked on again later, after other pins may have been
+        stacked on top. This is an ordering heuristic, not forward checking:
+        pins can still be replaced, so no candidate is ruled out, and the
+        first candidate put off is pinned if none fits. It costs one
+        `is_satisfied_by()` call per dependency on a pinned identifier, but
+        favors earlier pins over preferred candidates: the resolution found
+        may differ.
+
+        If `minimize_causes` is true and the resolution is impossible, the
+        raised `ResolutionImpossible` also has ``minimal_causes``, a subset
+        of ``causes`` whose requirements conflict by themselves, and
+        ``root_causes``, the root requirements those derive from. They are
+        computed from the conflicts already found, with at most one extra
+        `find_matches()` call per cause; otherwise both are None.
         """
-        resolution = Resolution(self.provider, self.reporter)
-        state = resolution.resolve(requirements, max_rounds=max_rounds)
-        return _build_result(state)
-
-
-def _has_route_to_root(
-    criteria: Mapping[KT, Criterion[RT, CT]],
-    key: KT | None,
-    all_keys: dict[int, KT | None],
-    connected: set[KT | None],
-) -> bool:
-    if key in connected:
-        return True
-    if key not in criteria:
-        return False
-    assert key is not None
-    for p in criteria[key].iter_parent():
+        stats = ResolutionStats() if collect_stats else None
+        state = self._resolve_state(
+            requirements,
+            max_rounds,
+            stats,
+            propagate_pins=propagate_pins,
+            reorder_candidates=reorder_candidates,
+            minimize_causes=minimize_causes,
+        )
+        result = _build_result(state)
+        result.stats = stats
+        return result
+
+    def resolve_mapping(
+        self,
+        requirements: Iterable[RT],
+        max_rounds: int = 100,
+        *,
+        propagate_pins: bool = False,
+        reorder_candidates: bool = False,
+        minimize_causes: bool = False,
+    ) -> dict[KT, CT]:
+        """Resolve like `resolve()`, but only return the resolved candidates.
+
+        This is the ``mapping`` of the result `resolve()` would return, for
+        callers that only install the pins: the dependency graph is not
+        built. Errors are raised as by `resolve()`.
+        """
+        state = self._resolve_state(
+            requirements,
+            max_rounds,
+            None,
+            propagate_pins=propagate_pins,
+            reorder_candidates=reorder_candidates,
+            minimize_causes=minimize_causes,
+        )
+        return _get_connected_mapping(state)
+
+    def _resolve_state(
+        self,
+        requirements: Iterable[RT],
+        max_rounds: int,
+        stats: ResolutionStats | None,
+        *,
+        propagate_pins: bool = False,
+        reorder_candidates: bool = False,
+        minimize_causes: bool = False,
+        checkpoint_rounds: bool = False,
+        fork_from: Resolution[RT, CT, KT] | None = None,
+    ) -> State[RT, CT, KT]:
+        resolution = Resolution(
+            self.provider,
+            self.reporter,
+            self.backjumping_policy,
+            stats,
+            propagate_pins=propagate_pins,
+            reorder_candidates=reorder_candidates,
+            minimize_causes=minimize_causes,
+            checkpoint_rounds=checkpoint_rounds,
+        )
         try:
-            pkey = all_keys[id(p)]
-        except KeyError:
-            continue
-        if pkey in connected:
-            connected.add(key)
-            return True
-        if _has_route_to_root(criteria, pkey, all_keys, connected):
-            connected.add(key)
-            return True
-    return False
+            return self._run_resolution(
+                resolution, requirements, max_rounds, stats, minimize_causes, fork_from
+            )
+        except _EnvironmentsDiverged as e:
+            e.resolution = resolution
+            raise
+
+    def _run_resolution(
+        self,
+        resolution: Resolution[RT, CT, KT],
+        requirements: Iterable[RT],
+        max_rounds: int,
+        stats: ResolutionStats | None,
+        minimize_causes: bool,
+        fork_from: Resolution[RT, CT, KT] | None,
+    ) -> State[RT, CT, KT]:
+        try:
+            if fork_from is not None:
+                return resolution.resume(fork_from, max_rounds)
+            return resolution.resolve(requirements, max_rounds=max_rounds)
+        except ResolutionImpossible as e:
+            if minimize_causes:
+                e.minimal_causes = resolution.minimize_causes(e.causes)
+                e.root_causes = resolution.trace_root_causes(e.minimal_causes)
+            e.stats = stats
+            raise
+        except ResolutionError as e:
+            e.stats = stats
+            raise
+
+    def verify(
+        self, requirements: Iterable[RT], pins: Mapping[KT, CT]
+    ) -> Result[RT, CT, KT]:
+        """Check that existing pins still resolve a collection of constraints.
+
+        `pins` maps identifiers to candidates, e.g. the ``mapping`` of an
+        earlier result, or of a lock loaded by `resolvelib.locks.load_lock()`.
+        Starting from `requirements`, every requirement met, including the
+        dependencies of each pin, must have a pin satisfying it. This is
+        checked in a single pass with `get_dependencies()` and
+        `is_satisfied_by()`, without finding matches or searching, and the
+        reporter is not called.
+
+        If the pins are valid, a result is returned as by `resolve()`, with
+        only the pins reachable from `requirements`. Otherwise `InvalidPins`
+        is raised, with the ``identifiers`` missing a pin or pinned to a
+        candidate not satisfying a requirement, and the unsatisfied
+        requirements as ``causes``.
+        """
+        return _build_result(verify_pins(self.provider, requirements, pins))
+
+    def resolve_many(
+        self,
+        requirement_sets: Iterable[Iterable[RT]],
+        max_rounds: int = 100,
+        *,
+        processes: int | None = None,
+        **kwargs: Any,
+    ) -> Iterator[tuple[int, Result[RT, CT, KT] | ResolutionError]]:
+        """Resolve each of many collections of constraints.
+
+        This yields ``(index, outcome)`` pairs, where ``index`` is the position
+        of the requirements in ``requirement_sets``, and ``outcome`` is either
+        the result of `resolve()`, or the `ResolutionError` it raised. Other
+        keyword arguments are passed to `resolve()`.
+
+        All resolutions share the provider, and a cache of the candidates
+        found for each identifier and requirements on it, and of the
+        dependencies of each candidate, so work common to several sets is
+        only done once. This requires `find_matches()` to only depend on the
+        requirements and incompatibilities of the identifier it is given.
+
+        By default, sets are resolved one after another, and outcomes are
+        yielded in order. If `processes` is given, they are resolved by a pool
+        of that many processes, each with its own cache, and outcomes are
+        yielded as they finish. The resolver, with its provider and reporter,
+        must then be picklable, and reporter hooks are called in the worker
+        processes.
+        """
+        resolver = copy.copy(self)
+        resolver.provider = _SharedCacheProvider(self.provider)
+        if processes is None:
+            for index, requirements in enumerate(requirement_sets):
+                yield (
+                    index,
+                    resolve_or_error(
+                        resolver, requirements, dict(kwargs, max_rounds=max_rounds)
+                    ),
+                )
+            return
+
+        executor = concurrent.futures.ProcessPoolExecutor(
+            processes, initializer=set_worker_resolver, initargs=(resolver,)
+        )
+        try:
+            indexes = {
+                executor.submit(
+                    resolve_in_worker,
+                    list(requirements),
+                    dict(kwargs, max_rounds=max_rounds),
+                ): index
+                for index, requirements in enumerate(requirement_sets)
+            }
+            for future in concurrent.futures.as_completed(indexes):
+                yield indexes[future], future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def resolve_environments(
+        self,
+        requirements: Iterable[RT],
+        environments: Iterable[ET],
+        max_rounds: int = 100,
+        **kwargs: Any,
+    ) -> dict[ET, Result[RT, CT, KT]]:
+        """Resolve constraints for several target environments at once.
+
+        This returns a dict mapping each environment to its resolution
+        result. Environments resolved to the same pins share the same result
+        object. Other keyword arguments are passed to `resolve()`.
+
+        Environments are opaque hashable values, passed to the provider's
+        `get_environment_dependencies()` to find out which candidates can be
+        used in each one, and their dependencies there. All environments
+        start out resolved together. When a candidate considered by the
+        resolver turns out to be usable in only some of them, or to have
+        different dependencies in some, the environments are split into
+        groups that agree on it, and the resolution is forked: each group
+        goes on from the start of the round the candidate was found in,
+        keeping the pins made so far and what was learned about conflicts.
+        Candidates found and dependencies are cached across groups, so the
+        provider is only asked once for each. As with `resolve_many()`,
+        this requires `find_matches()` to only depend on the requirements and
+        incompatibilities of the identifier it is given.
+
+        If a group cannot be resolved, the `ResolutionError` is raised with
+        the group's environments as ``environments``.
+        """
+        requirements = list(requirements)
+        environments = tuple(environments)
+        collect_stats = kwargs.pop("collect_stats", False)
+        provider = _EnvironmentProvider(
+            _SharedCacheProvider(self.provider), environments
+        )
+        resolver = copy.copy(self)
+        resolver.provider = provider
+        results: dict[ET, Result[RT, CT, KT]] = {}
+        # Groups left to resolve, with the resolution each was split from.
+        pending: list[tuple[tuple[ET, ...], Resolution[RT, CT, KT] | None]] = []
+        if environments:
+            pending.append((environments, None))
+        while pending:
+            group, parent = pending.pop()
+            provider.environments = group
+            if parent is None:
+                stats = ResolutionStats() if collect_stats else None
+            else:
+                stats = copy.deepcopy(parent._stats)
+            try:
+                state = resolver._resolve_state(
+                    requirements,
+                    max_rounds,
+                    stats,
+                    checkpoint_rounds=True,
+                    fork_from=parent,
+                    **kwargs,
+                )
+            except _EnvironmentsDiverged as e:
+                # Groups split while adding the root requirements start over.
+                parent = e.resolution if e.resolution._checkpoint else None
+                pending.extend((part, parent) for part in reversed(e.groups))
+                continue
+            except ResolutionError as e:
+                e.environments = group
+                raise
+            result = _build_result(state)
+            result.stats = stats
+            results.update(dict.fromkeys(group, result))
+        return {environment: results[environment] for environment in environments}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from ..providers import ProviderWrapper
+from ..structs import CT, KT, RT
+
+if TYPE_CHECKING:
+    from ..providers import AbstractProvider
+
+PROVIDER_METHODS = (
+    "identify",
+    "find_matches",
+    "get_dependencies",
+    "is_satisfied_by",
+    "get_preference",
+    "narrow_requirement_selection",
+    "get_candidate_domain",
+    "get_environment_dependencies",
+)
+
+
+class ResolutionStats:
+    """Statistics collected during a resolution.
+
+    Pass ``collect_stats=True`` to `Resolver.resolve()` to have one of these
+    attached as ``stats`` to the returned result, or to the raised
+    `ResolutionError`.
+
+    * `rounds`: Number of rounds started.
+    * `pins`: Number of candidates pinned.
+    * `implied_pins`: Number of those pins made by pin propagation, because
+      they were the only candidate left.
+    * `rejections`: Number of candidates rejected because their dependencies
+      conflicted with the current criteria.
+    * `deferred_candidates`: Number of candidates put off by candidate
+      reordering, as a dependency was not satisfied by a current pin.
+    * `backjumps`: Number of times the resolver backjumped after a conflict.
+    * `optimistic_rollbacks`: Number of optimistic backjumping attempts that
+      were rolled back.
+    * `max_depth`: Peak depth of the resolution state stack.
+    * `provider_calls`: Number of calls to each provider method, by name.
+    * `provider_time`: Cumulative wall time in seconds spent in each provider
+      method, by name. This only includes the time spent in the call itself;
+      iterating through lazy results returned by `find_matches()` is not
+      included.
+    """
+
+    def __init__(self) -> None:
+        self.rounds = 0
+        self.pins = 0
+        self.implied_pins = 0
+        self.rejections = 0
+        self.deferred_candidates = 0
+        self.backjumps = 0
+        self.optimistic_rollbacks = 0
+        self.max_depth = 0
+        self.provider_calls: dict[str, int] = dict.fromkeys(PROVIDER_METHODS, 0)
+        self.provider_time: dict[str, float] = dict.fromkeys(PROVIDER_METHODS, 0.0)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(rounds={self.rounds}, pins={self.pins}, "
+            f"rejections={self.rejections}, backjumps={self.backjumps})"
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a JSON-serializable dict."""
+        return {
+            "rounds": self.rounds,
+            "pins": self.pins,
+            "implied_pins": self.implied_pins,
+            "rejections": self.rejections,
+            "deferred_candidates": self.deferred_candidates,
+            "backjumps": self.backjumps,
+            "optimistic_rollbacks": self.optimistic_rollbacks,
+            "max_depth": self.max_depth,
+            "provider_calls": dict(self.provider_calls),
+            "provider_time": dict(self.provider_time),
+        }
+
+
+class _StatsProvider(ProviderWrapper[RT, CT, KT]):
+    """Count and time calls to the wrapped provider."""
+
+    def __init__(
+        self, provider: AbstractProvider[RT, CT, KT], stats: ResolutionStats
+    ) -> None:
+        super().__init__(provider)
+        self._stats = stats
+
+    def _call(self, name: str, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._call(name, **kwargs)
+        finally:
+            self._stats.provider_time[name] += time.perf_counter() - start
+            self._stats.provider_calls[name] += 1
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from ..structs import CT, KT, RT, RequirementInformation, State
+from .criterion import Criterion
+from .exceptions import InvalidPins
+
+if TYPE_CHECKING:
+    from ..providers import AbstractProvider
+
+
+def verify_pins(
+    provider: AbstractProvider[RT, CT, KT],
+    requirements: Iterable[RT],
+    pins: Mapping[KT, CT],
+) -> State[RT, CT, KT]:
+    """Check that ``pins`` satisfy ``requirements`` and all their dependencies.
+
+    Requirements are followed from the root, through the dependencies of each
+    pin reached, with each pin's dependencies only fetched once. Pins not
+    reached are left out of the returned state. If a requirement has no pin,
+    or its pin does not satisfy it, `InvalidPins` is raised once all of them
+    are checked.
+    """
+    mapping: dict[KT, CT] = {}
+    information: dict[KT, list[RequirementInformation[RT, CT]]] = {}
+    causes: list[RequirementInformation[RT, CT]] = []
+    invalid: dict[KT, None] = {}
+    pending: list[tuple[CT | None, Iterable[RT]]] = [(None, requirements)]
+    while pending:
+        parent, dependencies = pending.pop()
+        for requirement in dependencies:
+            name = provider.identify(requirement)
+            info = RequirementInformation(requirement, parent)
+            information.setdefault(name, []).append(info)
+            try:
+                candidate = pins[name]
+            except KeyError:
+                causes.append(info)
+                invalid[name] = None
+                continue
+            if not provider.is_satisfied_by(requirement, candidate):
+                causes.append(info)
+                invalid[name] = None
+            if name not in mapping:
+                mapping[name] = candidate
+                pending.append((candidate, provider.get_dependencies(candidate)))
+    if causes:
+        raise InvalidPins(causes, list(invalid))
+    criteria = {
+        name: Criterion([mapping[name]], infos, ())
+        for name, infos in information.items()
+    }
+    return State(mapping, criteria, [])
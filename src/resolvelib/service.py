@@ -0,0 +1,241 @@
+"""Serve resolutions from a long-lived process, keeping provider caches warm.
+
+A `ResolutionService` hosts resolvers for short-lived clients, such as command
+line tools, so they do not pay for imports and cold provider caches on every
+run. Requests and responses are newline-delimited JSON, read from a stream
+such as standard input, or from connections to a UNIX socket::
+
+    service = ResolutionService(make_provider, decode_requirement, encode)
+    service.serve_unix("/tmp/resolver.sock").serve_forever()
+
+    send_request("/tmp/resolver.sock", {"requirements": ["a>=1", "b"]})
+
+A request names the requirements to resolve, encoded as JSON values, and
+optionally an ``"id"`` echoed in the response, a ``"provider"`` key, and
+resolver options. The response lists pins as in a lock file, or the error
+that prevented the resolution::
+
+    {"id":1,"provider":"py3","requirements":["a>=1"],"max_rounds":200}
+    {"id":1,"pins":[{"key":"a","candidate":"a 1.2","parents":[null]}]}
+    {"id":2,"error":"ResolutionImpossible","message":"..."}
+
+Each distinct provider key gets a provider from ``provider_factory``,
+wrapped in a `CachingProvider` keeping its matches, dependencies and
+candidate domains across requests. Matches are cached by identifier, with the
+requirements and incompatibilities of that identifier only, so the provider's
+``find_matches()`` must not depend on those of other identifiers. Each of
+those caches holds at most ``max_cache_size`` entries, evicted by
+``cache_policy``. The least recently used providers are dropped, along with
+their caches, once there are more than ``max_providers``.
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import socket
+import socketserver
+import threading
+from typing import IO, TYPE_CHECKING, Any, Callable, Generic, Hashable, Iterable
+
+from .providers import CachingProvider
+from .reporters import BaseReporter
+from .resolvers import Resolver
+from .structs import CT, KT, RT
+
+if TYPE_CHECKING:
+    import io
+    import os
+
+    from .caches import Cache
+    from .providers import AbstractProvider
+    from .resolvers import Result
+
+# Request fields passed to `Resolver.resolve()` as keyword arguments.
+_RESOLVE_OPTIONS = (
+    "max_rounds",
+    "propagate_pins",
+    "reorder_candidates",
+    "minimize_causes",
+)
+
+# Provider methods cached across requests.
+_CACHED_METHODS = ("find_matches", "get_dependencies", "get_candidate_domain")
+
+_DEFAULT_MAX_PROVIDERS = 8
+
+_DEFAULT_MAX_CACHE_SIZE = 4096
+
+
+class _WarmResolver:
+    """A resolver kept between requests, created on first use.
+
+    Requests using the same resolver are handled one at a time, as providers
+    are not expected to be thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.resolver: Resolver[Any, Any, Any] | None = None
+
+
+class ResolutionService(Generic[RT, CT, KT]):
+    """Resolve requirements sent as JSON, reusing warm providers.
+
+    :param provider_factory: A function creating a provider, given the
+        ``"provider"`` key of a request, or None if it has none. Keys must be
+        JSON strings, numbers or null.
+    :param decode_requirement: A function converting a JSON value from a
+        request to a requirement.
+    :param encode_candidate: A function converting a candidate to a JSON
+        value.
+    :param reporter_factory: A function creating the reporter of each
+        provider's resolver.
+    :param max_providers: The number of providers kept with their caches.
+    :param max_cache_size: The size of each provider's cache of each method,
+        as ``max_size`` of `CachingProvider`.
+    :param cache_policy: The eviction policy of those caches, as ``policy``
+        of `CachingProvider`.
+
+    Requests for different providers are resolved concurrently, requests for
+    the same provider one after another.
+    """
+
+    def __init__(
+        self,
+        provider_factory: Callable[[Any], AbstractProvider[RT, CT, KT]],
+        decode_requirement: Callable[[Any], RT],
+        encode_candidate: Callable[[CT], Any],
+        *,
+        reporter_factory: Callable[[], BaseReporter[RT, CT, KT]] = BaseReporter,
+        max_providers: int = _DEFAULT_MAX_PROVIDERS,
+        max_cache_size: int | None = _DEFAULT_MAX_CACHE_SIZE,
+        cache_policy: str | Callable[..., Cache[Any]] = "lru",
+    ) -> None:
+        self.provider_factory = provider_factory
+        self.decode_requirement = decode_requirement
+        self.encode_candidate = encode_candidate
+        self.reporter_factory = reporter_factory
+        self.max_providers = max_providers
+        self.max_cache_size = max_cache_size
+        self.cache_policy = cache_policy
+        self._resolvers: collections.OrderedDict[Hashable, _WarmResolver] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _get_warm_resolver(self, key: Hashable) -> _WarmResolver:
+        with self._lock:
+            try:
+                warm = self._resolvers[key]
+            except KeyError:
+                warm = self._resolvers[key] = _WarmResolver()
+            else:
+                self._resolvers.move_to_end(key)
+            while len(self._resolvers) > self.max_providers:
+                self._resolvers.popitem(last=False)
+        return warm
+
+    def cache_info(self) -> dict[Hashable, dict[str, dict[str, Any]]]:
+        """Return `CachingProvider.cache_info()` of each provider kept, by key."""
+        with self._lock:
+            warms = list(self._resolvers.items())
+        return {
+            key: warm.resolver.provider.cache_info()
+            for key, warm in warms
+            if warm.resolver is not None
+            and isinstance(warm.resolver.provider, CachingProvider)
+        }
+
+    def _summarize(self, result: Result[RT, CT, KT]) -> list[dict[str, Any]]:
+        graph = result.graph
+        return [
+            {
+                "key": key,
+                "candidate": self.encode_candidate(candidate),
+                "parents": list(graph.iter_parents(key)),
+            }
+            for key, candidate in result.mapping.items()
+        ]
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Resolve one decoded request, and return the response to encode.
+
+        Errors, including those raised by the provider, are returned as the
+        response's ``"error"`` type name and ``"message"``.
+        """
+        response: dict[str, Any] = {"id": request.get("id")}
+        try:
+            key = request.get("provider")
+            if isinstance(key, (list, dict)):
+                raise TypeError(f"invalid provider key {key!r}")
+            requirements = [self.decode_requirement(r) for r in request["requirements"]]
+            options = {k: request[k] for k in _RESOLVE_OPTIONS if k in request}
+            warm = self._get_warm_resolver(key)
+            with warm.lock:
+                if warm.resolver is None:
+                    provider = CachingProvider(
+                        self.provider_factory(key),
+                        _CACHED_METHODS,
+                        policy=self.cache_policy,
+                        max_size=self.max_cache_size,
+                    )
+                    warm.resolver = Resolver(provider, self.reporter_factory())
+                result = warm.resolver.resolve(requirements, **options)
+            response["pins"] = self._summarize(result)
+        except Exception as e:
+            response.update(error=type(e).__name__, message=str(e))
+        return response
+
+    def serve_stream(
+        self, rfile: Iterable[bytes], wfile: IO[bytes] | io.BufferedIOBase
+    ) -> None:
+        """Answer requests read from ``rfile``, one per line, until it ends.
+
+        Each response is written to ``wfile`` as a line, and flushed, before
+        the next request is read. Serve standard input and output with::
+
+            service.serve_stream(sys.stdin.buffer, sys.stdout.buffer)
+        """
+        for line in rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                response = {"id": None, "error": type(e).__name__, "message": str(e)}
+            else:
+                response = self.handle(request)
+            wfile.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+            wfile.flush()
+
+    def serve_unix(
+        self, path: str | os.PathLike[str]
+    ) -> socketserver.ThreadingUnixStreamServer:
+        """Create a server answering requests on a UNIX socket at ``path``.
+
+        Each connection is served by `serve_stream()` in its own thread, so
+        a client may send several requests over one connection. Call the
+        server's ``serve_forever()`` to start it, and ``server_close()`` to
+        stop listening; the socket file is left for the caller to remove.
+        """
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                service.serve_stream(self.rfile, self.wfile)
+
+        server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+        server.daemon_threads = True
+        return server
+
+
+def send_request(path: str | os.PathLike[str], request: dict[str, Any]) -> Any:
+    """Send one request to a service listening at ``path``, return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+        with sock.makefile("rb") as rfile:
+            return json.loads(rfile.readline())
@@ -5,6 +5,7 @@ from collections import namedtuple
 from typing import (
     TYPE_CHECKING,
     Callable,
+    Collection,
     Generic,
     Iterable,
     Iterator,
@@ -18,12 +19,18 @@ from typing import (
 KT = TypeVar("KT")  # Identifier.
 RT = TypeVar("RT")  # Requirement.
 CT = TypeVar("CT")  # Candidate.
+VT = TypeVar("VT", bound="Comparable")  # Version.
 
 Matches = Union[Iterable[CT], Callable[[], Iterable[CT]]]
 
 if TYPE_CHECKING:
+    from typing import Any, Protocol
+
     from .resolvers.criterion import Criterion
 
+    class Comparable(Protocol):
+        def __lt__(self, __other: Any) -> bool: ...
+
     class RequirementInformation(NamedTuple, Generic[RT, CT]):
         requirement: RT
         parent: CT | None
@@ -35,11 +42,34 @@ if TYPE_CHECKING:
         criteria: dict[KT, Criterion[RT, CT]]
         backtrack_causes: list[RequirementInformation[RT, CT]]
 
+    class RoundDelta(NamedTuple, Generic[RT, CT, KT]):
+        """Changes made to the resolution state in a round."""
+
+        round_index: int
+        pinned: list[tuple[KT, CT]]
+        unpinned: list[KT]
+        changed: list[KT]
+        removed: list[KT]
+        incompatibilities: list[tuple[KT, CT]]
+        backjump_distance: int
+
 else:
     RequirementInformation = namedtuple(
         "RequirementInformation", ["requirement", "parent"]
     )
     State = namedtuple("State", ["mapping", "criteria", "backtrack_causes"])
+    RoundDelta = namedtuple(
+        "RoundDelta",
+        [
+            "round_index",
+            "pinned",
+            "unpinned",
+            "changed",
+            "removed",
+            "incompatibilities",
+            "backjump_distance",
+        ],
+    )
 
 
 class DirectedGraph(Generic[KT]):
@@ -137,7 +167,11 @@ class IteratorMapping(Mapping[KT, Iterator[CT]], Generic[RT, CT, KT]):
             v = self._mapping[k]
         except KeyError:
             return iter(self._appends[k])
-        return itertools.chain(self._accessor(v), self._appends.get(k, ()))
+        try:
+            appends = self._appends[k]
+        except KeyError:
+            return iter(self._accessor(v))
+        return itertools.chain(self._accessor(v), appends)
 
     def __iter__(self) -> Iterator[KT]:
         more = (k for k in self._appends if k not in self._mapping)
@@ -148,6 +182,205 @@ class IteratorMapping(Mapping[KT, Iterator[CT]], Generic[RT, CT, KT]):
         return len(self._mapping) + more
 
 
+class IncompatibilitySet(Collection[CT]):
+    """An insertion-ordered collection of known incompatible candidates.
+
+    Candidates are deduplicated as they are added. Hashable candidates are
+    deduplicated by equality and can be checked for membership in constant
+    time. Unhashable candidates are deduplicated by identity, and membership
+    checks on them fall back to a linear scan with equality.
+
+    This is intended to be externally immutable; the resolver creates a new
+    instance with `union()` whenever it learns new incompatibilities.
+    """
+
+    __slots__ = ("_hashable", "_items", "_unhashable")
+
+    def __init__(self, candidates: Iterable[CT] = ()) -> None:
+        self._items: list[CT] = []
+        self._hashable: set[CT] = set()
+        self._unhashable: dict[int, CT] = {}
+        for candidate in candidates:
+            self._add(candidate)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._items!r})"
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[CT]:
+        return _IncompatibilityIterator(self)
+
+    def __contains__(self, candidate: object) -> bool:
+        try:
+            return candidate in self._hashable
+        except TypeError:
+            return any(c == candidate for c in self._unhashable.values())
+
+    def _add(self, candidate: CT) -> bool:
+        try:
+            if candidate in self._hashable:
+                return False
+            self._hashable.add(candidate)
+        except TypeError:
+            if id(candidate) in self._unhashable:
+                return False
+            self._unhashable[id(candidate)] = candidate
+        self._items.append(candidate)
+        return True
+
+    def union(self, candidates: Iterable[CT]) -> IncompatibilitySet[CT]:
+        """Return a new set with ``candidates`` added after existing ones."""
+        other: IncompatibilitySet[CT] = type(self)()
+        other._items = self._items[:]
+        other._hashable = self._hashable.copy()
+        other._unhashable = self._unhashable.copy()
+        for candidate in candidates:
+            other._add(candidate)
+        return other
+
+
+class _IncompatibilityIterator(Iterator[CT]):
+    """Iterator over an `IncompatibilitySet`.
+
+    Providers receive this as values of the ``incompatibilities`` mapping
+    passed to `find_matches()`. Besides iteration, it supports ``in`` checks
+    against the *whole* set, regardless of how far it has been consumed, so
+    ``candidate in incompatibilities[identifier]`` does not scan linearly.
+    """
+
+    __slots__ = ("_iterator", "_set")
+
+    def __init__(self, incompatibilities: IncompatibilitySet[CT]) -> None:
+        self._set = incompatibilities
+        self._iterator = iter(incompatibilities._items)
+
+    def __next__(self) -> CT:
+        return next(self._iterator)
+
+    def __contains__(self, candidate: object) -> bool:
+        return candidate in self._set
+
+
+class CandidateDomain(Generic[CT]):
+    """All candidates of an identifier, in a stable order.
+
+    Each candidate is identified by its position in the order. A *mask* is an
+    integer whose bit ``n`` is set if the candidate at position ``n`` is
+    included, so sets of candidates are combined with bitwise operations.
+    Candidates are looked up by equality if hashable, and by identity
+    otherwise. Duplicates are ignored.
+    """
+
+    __slots__ = ("_candidates", "_ranks", "_unhashable_ranks", "full_mask")
+
+    def __init__(self, candidates: Iterable[CT]) -> None:
+        self._candidates: list[CT] = []
+        self._ranks: dict[CT, int] = {}
+        self._unhashable_ranks: dict[int, int] = {}
+        for candidate in candidates:
+            if self.rank(candidate) is not None:
+                continue
+            rank = len(self._candidates)
+            try:
+                self._ranks[candidate] = rank
+            except TypeError:
+                self._unhashable_ranks[id(candidate)] = rank
+            self._candidates.append(candidate)
+        self.full_mask = (1 << len(self._candidates)) - 1
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._candidates!r})"
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def __iter__(self) -> Iterator[CT]:
+        return iter(self._candidates)
+
+    def rank(self, candidate: object) -> int | None:
+        """Return the position of ``candidate``, or None if it is not here."""
+        try:
+            return self._ranks.get(candidate)  # type: ignore[arg-type]
+        except TypeError:
+            return self._unhashable_ranks.get(id(candidate))
+
+    def mask_of(self, candidates: Iterable[object]) -> int:
+        """Return the mask of ``candidates``, ignoring those not in the domain."""
+        mask = 0
+        for candidate in candidates:
+            rank = self.rank(candidate)
+            if rank is not None:
+                mask |= 1 << rank
+        return mask
+
+    def mask_where(self, predicate: Callable[[CT], bool]) -> int:
+        """Return the mask of candidates for which ``predicate`` is true."""
+        mask = 0
+        for rank, candidate in enumerate(self._candidates):
+            if predicate(candidate):
+                mask |= 1 << rank
+        return mask
+
+    def iter_candidates(self, mask: int) -> Iterator[CT]:
+        """Iterate through candidates in ``mask``, in the domain's order."""
+        while mask:
+            lowest = mask & -mask
+            yield self._candidates[lowest.bit_length() - 1]
+            mask ^= lowest
+
+
+class CandidateMask(Collection[CT]):
+    """An immutable set of candidates from a `CandidateDomain`, as a mask.
+
+    Iteration follows the order of the domain. The resolver uses this for the
+    candidates and incompatibilities of criteria whose identifier has a
+    domain, so narrowing them is a bitwise operation.
+    """
+
+    __slots__ = ("domain", "mask")
+
+    def __init__(self, domain: CandidateDomain[CT], mask: int = 0) -> None:
+        self.domain = domain
+        self.mask = mask
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def __len__(self) -> int:
+        return bin(self.mask).count("1")
+
+    def __iter__(self) -> Iterator[CT]:
+        return self.domain.iter_candidates(self.mask)
+
+    def __contains__(self, candidate: object) -> bool:
+        rank = self.domain.rank(candidate)
+        return rank is not None and bool(self.mask >> rank & 1)
+
+    def intersection(self, mask: int) -> CandidateMask[CT]:
+        """Return a new set keeping only candidates in ``mask``."""
+        return type(self)(self.domain, self.mask & mask)
+
+    def difference(self, other: CandidateMask[CT]) -> CandidateMask[CT]:
+        """Return a new set without the candidates in ``other``."""
+        return type(self)(self.domain, self.mask & ~other.mask)
+
+    def union(self, candidates: Iterable[CT]) -> CandidateMask[CT]:
+        """Return a new set with ``candidates`` in the domain added."""
+        if isinstance(candidates, CandidateMask) and candidates.domain is self.domain:
+            mask = candidates.mask
+        else:
+            mask = self.domain.mask_of(candidates)
+        return type(self)(self.domain, self.mask | mask)
+
+
 class _FactoryIterableView(Iterable[RT]):
     """Wrap an iterator factory returned by `find_matches()`.
 
@@ -0,0 +1,234 @@
+"""Export resolution timelines in the Chrome Trace Event format.
+
+Use a `TracingReporter` as the resolver's reporter, and wrap the provider in a
+`TracingProvider` sharing the same reporter::
+
+    tracer = TracingReporter()
+    resolver = Resolver(TracingProvider(provider, tracer), tracer)
+    try:
+        resolver.resolve(requirements)
+    finally:
+        tracer.write("resolution.json")
+
+The written file can be opened in ``chrome://tracing`` or Perfetto. It contains
+a span for the whole resolution, one span per round, nested spans for each
+provider call, and instant events for pins, rejections and backjumps.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import IO, TYPE_CHECKING, Any, Collection
+
+from .providers import ProviderWrapper
+from .reporters import BaseReporter
+from .resolvers.resolution import _get_overridden_hooks
+from .structs import CT, KT, RT, RequirementInformation, State
+
+if TYPE_CHECKING:
+    from .providers import AbstractProvider
+    from .resolvers import Criterion
+
+# Reporter hooks that only forward to the wrapped reporter, so they are only
+# set on instances whose wrapped reporter implements them, for the resolver
+# to skip them otherwise.
+_FORWARDED_HOOKS = ("ending_round_delta", "adding_requirement")
+
+# Provider call arguments shown in the trace, by method name.
+_TRACED_ARGUMENTS = {
+    "identify": "requirement_or_candidate",
+    "get_preference": "identifier",
+    "find_matches": "identifier",
+    "is_satisfied_by": "candidate",
+    "get_dependencies": "candidate",
+}
+
+
+class TracingReporter(BaseReporter[RT, CT, KT]):
+    """A reporter that records a timeline of the resolution.
+
+    :param reporter: An optional reporter to forward hooks to, so tracing can
+        be added without giving up an existing reporter. Only hooks it
+        implements are forwarded, and hooks tracing does not use are only
+        enabled if it implements them.
+
+    Events are collected in `events` as Chrome Trace Event dicts, with
+    timestamps in microseconds since the reporter was created. A reporter can
+    be reused across resolutions; each resolution adds its own spans.
+    """
+
+    def __init__(self, reporter: BaseReporter[RT, CT, KT] | None = None) -> None:
+        self.reporter = reporter
+        self._forwarded: frozenset[str] = frozenset()
+        if reporter is not None:
+            self._forwarded = _get_overridden_hooks(reporter)
+            for name in _FORWARDED_HOOKS:
+                if name in self._forwarded:
+                    setattr(self, name, getattr(reporter, name))
+        self.events: list[dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._resolution_start: float | None = None
+        self._round_start: float | None = None
+        self._round_index = 0
+
+    def _now(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def add_span(
+        self, name: str, category: str, start: float, **args: Any
+    ) -> dict[str, Any]:
+        """Record a span from ``start`` until now, and return its event.
+
+        :param start: The start timestamp, as returned by `timestamp()`.
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start,
+            "dur": self._now() - start,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        self.events.append(event)
+        return event
+
+    def add_instant(self, name: str, category: str, **args: Any) -> dict[str, Any]:
+        """Record an instant event happening now, and return it."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": self._now(),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        self.events.append(event)
+        return event
+
+    def _forward(self, name: str, *args: Any) -> None:
+        if name in self._forwarded:
+            getattr(self.reporter, name)(*args)
+
+    def timestamp(self) -> float:
+        """Return the current timestamp for use with `add_span()`."""
+        return self._now()
+
+    def _close_round(self, **args: Any) -> None:
+        if self._round_start is None:
+            return
+        start, self._round_start = self._round_start, None
+        self.add_span(f"round {self._round_index}", "round", start, **args)
+
+    def _close_resolution(self, **args: Any) -> None:
+        self._close_round()
+        if self._resolution_start is None:
+            return
+        start, self._resolution_start = self._resolution_start, None
+        self.add_span("resolve", "resolution", start, **args)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace as a Chrome Trace Event JSON object.
+
+        Spans left open by a resolution that ended with an exception are
+        closed at the current time.
+        """
+        self._close_resolution(finished=False)
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write(self, file: str | os.PathLike[str] | IO[str]) -> None:
+        """Write the trace as JSON to a path or text file object."""
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "w", encoding="utf-8") as f:
+                json.dump(self.as_dict(), f)
+        else:
+            json.dump(self.as_dict(), file)
+
+    def starting(self) -> None:
+        self._close_resolution(finished=False)
+        self._resolution_start = self._now()
+        self._forward("starting")
+
+    def starting_round(self, index: int) -> None:
+        self._close_round()
+        self._round_index = index
+        self._round_start = self._now()
+        self._forward("starting_round", index)
+
+    def ending_round(self, index: int, state: State[RT, CT, KT]) -> None:
+        self._close_round(pinned=len(state.mapping))
+        self._forward("ending_round", index, state)
+
+    def ending(self, state: State[RT, CT, KT]) -> None:
+        self._close_resolution(finished=True, pinned=len(state.mapping))
+        self._forward("ending", state)
+
+    def resolving_conflicts(
+        self, causes: Collection[RequirementInformation[RT, CT]]
+    ) -> None:
+        self.add_instant(
+            "backjump",
+            "conflict",
+            causes=[repr(cause.requirement) for cause in causes],
+        )
+        self._forward("resolving_conflicts", causes)
+
+    def rejecting_candidate(self, criterion: Criterion[RT, CT], candidate: CT) -> None:
+        self.add_instant("reject", "conflict", candidate=repr(candidate))
+        self._forward("rejecting_candidate", criterion, candidate)
+
+    def pinning(self, candidate: CT) -> None:
+        self.add_instant("pin", "pin", candidate=repr(candidate))
+        self._forward("pinning", candidate)
+
+    def pinning_implied(self, candidate: CT) -> None:
+        self.add_instant("implied pin", "pin", candidate=repr(candidate))
+        if "pinning_implied" in self._forwarded:
+            # Reporters not derived from BaseReporter may not have this hook.
+            name = "pinning_implied"
+            if not hasattr(self.reporter, name):
+                name = "pinning"
+            self._forward(name, candidate)
+
+    def starting_optimistic_backjumping(self, index: int, budget: int) -> None:
+        self.add_instant("optimistic backjumping", "conflict", budget=budget)
+        self._forward("starting_optimistic_backjumping", index, budget)
+
+    def rolling_back_optimistic_backjumping(self, index: int, ratio: float) -> None:
+        self.add_instant("optimistic rollback", "conflict", ratio=ratio)
+        self._forward("rolling_back_optimistic_backjumping", index, ratio)
+
+
+class TracingProvider(ProviderWrapper[RT, CT, KT]):
+    """A provider wrapper that records a span for each provider call.
+
+    Spans are added to the events of ``tracer``, which should also be the
+    resolver's reporter so provider calls nest within rounds. Only the time
+    spent in the call itself is recorded; iterating through lazy results
+    returned by `find_matches()` happens outside of its span.
+    """
+
+    def __init__(
+        self,
+        provider: AbstractProvider[RT, CT, KT],
+        tracer: TracingReporter[RT, CT, KT],
+    ) -> None:
+        super().__init__(provider)
+        self.tracer = tracer
+
+    def _call(self, name: str, **kwargs: Any) -> Any:
+        start = self.tracer.timestamp()
+        try:
+            return super()._call(name, **kwargs)
+        finally:
+            args = {}
+            if name in _TRACED_ARGUMENTS:
+                args["arg"] = repr(kwargs[_TRACED_ARGUMENTS[name]])
+            self.tracer.add_span(name, "provider", start, **args)
@@ -14,6 +14,7 @@ import pytest
 
 import resolvelib.resolvers.resolution
 from resolvelib import AbstractProvider, ResolutionImpossible, Resolver
+from resolvelib.index import IndexedProvider
 
 Candidate = collections.namedtuple("Candidate", "name version extras")
 
@@ -157,6 +158,48 @@ class PythonInputProviderNarrowRequirements(PythonInputProvider):
         return identifiers
 
 
+class PythonInputIndexedProvider(IndexedProvider, PythonInputProvider):
+    def __init__(self, filename):
+        IndexedProvider.__init__(self)
+        PythonInputProvider.__init__(self, filename)
+        self._final_masks = {}
+
+    def get_versions(self, identifier):
+        name, _, _ = identifier.partition("[")
+        return map(packaging.version.parse, self.index[name])
+
+    def get_candidate_version(self, candidate):
+        return candidate.version
+
+    def build_candidate(self, identifier, version, requirements):
+        name, _, _ = identifier.partition("[")
+        extras = {e for r in requirements for e in r.extras}
+        return Candidate(name=name, version=version, extras=extras)
+
+    def get_requirement_key(self, requirement):
+        return str(requirement.specifier)
+
+    def version_matches(self, requirement, version):
+        return requirement.specifier.contains(version, prereleases=True)
+
+    def get_matching_mask(self, identifier, requirements, incompatible_mask):
+        mask = super().get_matching_mask(identifier, requirements, incompatible_mask)
+        if any(r.specifier.prereleases for r in requirements):
+            return mask
+        # Like SpecifierSet.filter(), only match pre-releases if nothing else does.
+        if identifier not in self._final_masks:
+            index = self.get_index(identifier)
+            final_mask = index.mask_where(lambda v: not v.is_prerelease)
+            self._final_masks[identifier] = final_mask
+        return mask & self._final_masks[identifier] or mask
+
+
+PROVIDER_CLASSES = [
+    PythonInputProvider,
+    PythonInputProviderNarrowRequirements,
+    PythonInputIndexedProvider,
+]
+
 INPUTS_DIR = os.path.abspath(os.path.join(__file__, "..", "inputs"))
 
 CASE_DIR = os.path.join(INPUTS_DIR, "case")
@@ -182,15 +225,8 @@ def create_params(provider_class):
 
 
 @pytest.fixture(
-    params=[
-        *create_params(PythonInputProvider),
-        *create_params(PythonInputProviderNarrowRequirements),
-    ],
-    ids=[
-        f"{n[:-5]}-{cls.__name__}"
-        for cls in [PythonInputProvider, PythonInputProviderNarrowRequirements]
-        for n in CASE_NAMES
-    ],
+    params=[param for cls in PROVIDER_CLASSES for param in create_params(cls)],
+    ids=[f"{n[:-5]}-{cls.__name__}" for cls in PROVIDER_CLASSES for n in CASE_NAMES],
 )
 def provider(request):
     path, provider_class = request.param
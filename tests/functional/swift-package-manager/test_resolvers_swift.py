@@ -6,6 +6,7 @@ import os
 import pytest
 
 from resolvelib import AbstractProvider, Resolver
+from resolvelib.ranges import VersionRange
 
 Requirement = collections.namedtuple("Requirement", "container constraint")
 Candidate = collections.namedtuple("Candidate", "container version")
@@ -131,12 +132,121 @@ class SwiftInputProvider(AbstractProvider):
         return list(self._iter_dependencies(candidate))
 
 
+def _version_range(ranges):
+    """Build a version range matching the same versions as _is_version_allowed."""
+    allowed = VersionRange.empty()
+    for r in ranges:
+        major, minor, patch, rest = _parse_version(r)
+        if major == 0:
+            low, high = (0, minor, patch, ""), (0, minor + 1, 0, "")
+        else:
+            low, high = (major, minor, patch, rest), (major + 1, 0, 0, "")
+        allowed |= VersionRange.between(low, high)
+    return allowed
+
+
+class SwiftRangeInputProvider(SwiftInputProvider):
+    """Combine requirements into a version range before matching candidates."""
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self._ranges = {}
+
+    def _get_range(self, requirement):
+        key = tuple(requirement.constraint["requirement"])
+        try:
+            return self._ranges[key]
+        except KeyError:
+            allowed = self._ranges[key] = _version_range(key)
+            return allowed
+
+    def _iter_matches(self, identifier, requirements, incompatibilities):
+        allowed = VersionRange.any()
+        for r in requirements[identifier]:
+            allowed &= self._get_range(r)
+        if allowed.is_empty():
+            return
+        bad_versions = {c.version for c in incompatibilities[identifier]}
+        container = next(requirements[identifier]).container
+        for version in container["versions"]:
+            if version in bad_versions:
+                continue
+            ver = _parse_version(version)
+            if ver not in allowed:
+                continue
+            yield (_calculate_preference(ver), Candidate(container, version))
+
+    def is_satisfied_by(self, requirement, candidate):
+        return _parse_version(candidate.version) in self._get_range(requirement)
+
+
+class _HashableRequirement(Requirement):
+    """A requirement equal to others on the same container and versions.
+
+    Masks of hashable requirements over a candidate domain are shared by
+    every parent with the same constraint.
+    """
+
+    __slots__ = ()
+
+    def _key(self):
+        return (
+            self.container["identifier"],
+            tuple(self.constraint["requirement"]),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, _HashableRequirement):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+class SwiftDomainInputProvider(SwiftInputProvider):
+    """Give the resolver all candidates of each container up front."""
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.root_requirements = [
+            _HashableRequirement(*r) for r in self.root_requirements
+        ]
+
+    def get_dependencies(self, candidate):
+        return [_HashableRequirement(*r) for r in self._iter_dependencies(candidate)]
+
+    def get_candidate_domain(self, identifier):
+        try:
+            container = self.containers[identifier]
+        except KeyError:
+            return []
+        versions = sorted(
+            container["versions"],
+            key=lambda v: _calculate_preference(_parse_version(v)),
+            reverse=True,
+        )
+        return [Candidate(container, version) for version in versions]
+
+
+PROVIDER_CLASSES = [
+    SwiftInputProvider,
+    SwiftRangeInputProvider,
+    SwiftDomainInputProvider,
+]
+
+
 @pytest.fixture(
-    params=[os.path.join(INPUTS_DIR, n) for n in INPUT_NAMES],
-    ids=[n[:-5] for n in INPUT_NAMES],
+    params=[
+        (os.path.join(INPUTS_DIR, n), cls)
+        for cls in PROVIDER_CLASSES
+        for n in INPUT_NAMES
+    ],
+    ids=[f"{n[:-5]}-{cls.__name__}" for cls in PROVIDER_CLASSES for n in INPUT_NAMES],
 )
 def provider(request):
-    return SwiftInputProvider(request.param)
+    path, provider_class = request.param
+    return provider_class(path)
 
 
 def test_resolver(provider, reporter):
@@ -0,0 +1,74 @@
+"""A small in-memory package index, and a provider over it, shared by tests."""
+
+from __future__ import annotations
+
+from collections import namedtuple
+
+from resolvelib import AbstractProvider
+
+Requirement = namedtuple("Requirement", ["name", "versions"])
+Candidate = namedtuple("Candidate", ["name", "version"])
+
+
+def requirement(name, *versions):
+    return Requirement(name, versions)
+
+
+# name -> version -> dependencies. "a" and "b" both depend on "q"; the
+# preferred "a" 2 conflicts with "b".
+INDEX = {
+    "a": {1: (requirement("q", 1),), 2: (requirement("q", 2),)},
+    "b": {1: (requirement("q", 1),)},
+    "c": {1: (requirement("a", 1, 2),)},
+    "q": {1: (), 2: ()},
+    "x": {1: ()},
+    "y": {1: ()},
+}
+
+
+class IndexProvider(AbstractProvider):
+    """Provider over an index, preferring higher versions.
+
+    Requirements are ``(name, versions)`` pairs, and candidates ``(name,
+    version)`` pairs. Identifiers are preferred in the order given by
+    ``order``, falling back to alphabetical order. Calls to find_matches() and
+    get_dependencies() are recorded in ``calls``.
+    """
+
+    def __init__(self, index=INDEX, order=()):
+        self.index = index
+        self.order = {name: i for i, name in enumerate(order)}
+        self.calls = []
+
+    def identify(self, requirement_or_candidate):
+        return requirement_or_candidate[0]
+
+    def get_preference(self, identifier, **_):
+        return (self.order.get(identifier, len(self.order)), identifier)
+
+    def find_matches(self, identifier, requirements, incompatibilities):
+        self.calls.append(("find_matches", identifier))
+        bad = {c[1] for c in incompatibilities[identifier]}
+        return [
+            Candidate(identifier, v)
+            for v in sorted(self.index.get(identifier, ()), reverse=True)
+            if v not in bad and all(v in r[1] for r in requirements[identifier])
+        ]
+
+    def is_satisfied_by(self, requirement, candidate):
+        return candidate[1] in requirement[1]
+
+    def get_dependencies(self, candidate):
+        self.calls.append(("get_dependencies", candidate))
+        return self.index[candidate[0]][candidate[1]]
+
+
+class DomainProvider(IndexProvider):
+    """Provider giving a candidate domain for every identifier."""
+
+    def get_candidate_domain(self, identifier):
+        versions = sorted(self.index[identifier], reverse=True)
+        return [Candidate(identifier, v) for v in versions]
+
+    def find_matches(self, identifier, requirements, incompatibilities):
+        raise AssertionError("find_matches() must not be called")
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import importlib
+import pathlib
+import random
+
+import pytest
+
+from resolvelib import BaseReporter, Resolver
+
+BENCHMARKS_DIR = pathlib.Path(__file__).resolve().parent.parent / "benchmarks"
+
+
+@pytest.fixture
+def synthetic(monkeypatch):
+    monkeypatch.syspath_prepend(str(BENCHMARKS_DIR))
+    return importlib.import_module("synthetic")
+
+
+@pytest.fixture
+def latency(monkeypatch):
+    monkeypatch.syspath_prepend(str(BENCHMARKS_DIR))
+    return importlib.import_module("latency")
+
+
+def test_synthetic_index_with_traps(synthetic):
+    # Each trap multiplies the backjumps needed, so the index is kept small.
+    kwargs = {"conflict_density": 0.5, "traps": 2, "seed": 1}
+    index, requirements = synthetic.generate_index(6, **kwargs)
+    assert synthetic.generate_index(6, **kwargs) == (index, requirements)
+    assert synthetic.generate_index(6, **{**kwargs, "seed": 2})[0] != index
+
+    resolver = Resolver(synthetic.SyntheticProvider(index), BaseReporter())
+    result = resolver.resolve(requirements, max_rounds=2000, collect_stats=True)
+    assert result.stats.backjumps > 0
+    assert result.stats.rejections > 0
+
+    # Newer versions of trap roots conflict with the sink at the end of the
+    # chain, so only version 1 of each is left.
+    assert result.mapping[synthetic.SINK].version == 1
+    assert result.mapping["trap0-0"].version == 1
+    assert result.mapping["trap1-0"].version == 1
+    for requirement in requirements:
+        pin = result.mapping[requirement.name]
+        assert requirement.low <= pin.version <= requirement.high
+    for candidate in result.mapping.values():
+        for dependency in index[candidate.name][candidate.version]:
+            pin = result.mapping[dependency.name]
+            assert dependency.low <= pin.version <= dependency.high
+
+    resolver = Resolver(synthetic.SyntheticDomainProvider(index), BaseReporter())
+    domain_result = resolver.resolve(requirements, max_rounds=2000)
+    assert domain_result.mapping == result.mapping
+
+
+def test_latency_distributions(latency):
+    distribution = latency.parse_distribution("uniform:5:200")
+    delays = [distribution(random.Random(0)) for _ in range(2)]
+    assert delays[0] == delays[1]
+    assert 0.005 <= delays[0] <= 0.2
+    assert latency.parse_distribution("constant:20")(random.Random()) == 0.02
+    with pytest.raises(ValueError, match="unknown distribution"):
+        latency.parse_distribution("normal:5:1")
+
+
+def test_latency_provider(synthetic, latency):
+    index, requirements = synthetic.generate_index(12, seed=0)
+    provider = latency.LatencyProvider(
+        synthetic.SyntheticProvider(index),
+        {"get_dependencies": latency.constant(2)},
+    )
+    resolver = Resolver(provider, BaseReporter())
+    result = resolver.resolve(requirements, collect_stats=True)
+
+    totals = provider.stats.as_dict()
+    assert totals["calls"] == {
+        name: count for name, count in result.stats.provider_calls.items() if count
+    }
+    # Only get_dependencies() waits, for 2 ms on each call.
+    dependencies_calls = totals["calls"]["get_dependencies"]
+    assert totals["wait_time"]["get_dependencies"] >= 0.002 * dependencies_calls
+    assert totals["wait_time"]["find_matches"] < 0.001
+    assert set(totals["compute_time"]) == set(totals["calls"])
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+from index_provider import INDEX, IndexProvider
+
+from resolvelib import BaseReporter, CachingProvider, Resolver
+from resolvelib.caches import LFUCache, LRUCache
+
+
+def _matches_key(identifier, requirements, incompatibilities):
+    return (
+        identifier,
+        tuple(tuple(r[1]) for r in requirements[identifier]),
+        tuple(incompatibilities[identifier]),
+    )
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b", "missing") == "missing"
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_lfu_cache():
+    cache = LFUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.put("c", 3)
+    assert "b" not in cache
+    cache.put("d", 4)
+    assert "c" not in cache
+    assert (cache.get("a"), cache.get("d")) == (1, 4)
+
+
+@pytest.mark.parametrize("cache_class", [LRUCache, LFUCache])
+def test_cache_size(cache_class):
+    cache = cache_class(5, size=len)
+    cache.put("a", (1, 2))
+    cache.put("b", (1, 2, 3))
+    assert cache.total_size == 5
+    cache.put("c", (1,))
+    assert "a" not in cache
+    assert cache.total_size == 4
+    cache.put("d", tuple(range(6)))
+    assert "d" not in cache
+    cache.put("b", ())
+    assert (len(cache), cache.total_size) == (2, 1)
+
+
+def test_caching_provider():
+    provider = IndexProvider()
+    caching = CachingProvider(provider, key_functions={"find_matches": _matches_key})
+    resolver = Resolver(caching, BaseReporter())
+    for _ in range(2):
+        result = resolver.resolve([["a", [1, 2]], ["b", [1]]])
+        assert result.mapping == {"a": ("a", 1), "b": ("b", 1), "q": ("q", 1)}
+
+    assert provider.calls.count(("get_dependencies", ("a", 1))) == 1
+    info = caching.cache_info()
+    assert info["find_matches"]["misses"] == len(
+        [c for c in provider.calls if c[0] == "find_matches"]
+    )
+    assert info["find_matches"]["hits"] >= info["find_matches"]["misses"]
+    assert info["get_dependencies"]["hit_rate"] >= 0.5
+    assert info["get_dependencies"]["uncached"] == 0
+
+
+def test_caching_provider_unhashable_and_evicted():
+    # Dependencies given as lists make the requirements unhashable.
+    index = {
+        name: {v: [list(r) for r in dependencies] for v, dependencies in d.items()}
+        for name, d in INDEX.items()
+    }
+    provider = IndexProvider(index)
+    caching = CachingProvider(provider, policy="lfu", max_size=1)
+    resolver = Resolver(caching, BaseReporter())
+    resolver.resolve([["a", [1, 2]], ["b", [1]]])
+    resolver.resolve([["a", [1, 2]], ["b", [1]]])
+
+    info = caching.cache_info()
+    assert info["find_matches"]["hits"] == info["find_matches"]["misses"] == 0
+    assert info["find_matches"]["uncached"] > 0
+    assert info["get_dependencies"]["entries"] == 1
+    assert info["get_dependencies"]["misses"] > 3
+
+
+def test_caching_provider_arguments():
+    with pytest.raises(ValueError, match="unknown cache policy"):
+        CachingProvider(IndexProvider(), policy="fifo")
+    with pytest.raises(ValueError, match="no cache key function"):
+        CachingProvider(IndexProvider(), ["get_preference"])
+    caching = CachingProvider(
+        IndexProvider(),
+        ["get_preference"],
+        key_functions={"get_preference": lambda identifier, **_: identifier},
+    )
+    assert list(caching.cache_info()) == ["get_preference"]
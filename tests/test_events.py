@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+
+from index_provider import IndexProvider
+
+from resolvelib import Resolver
+from resolvelib.events import EventWriter
+
+
+def test_events_replay_to_result():
+    output = io.BytesIO()
+    writer = EventWriter(output)
+    result = Resolver(IndexProvider(), writer).resolve([("a", [1, 2]), ("b", [1])])
+    events = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert events[0] == {"event": "start"}
+    assert events[-1] == {"event": "end", "pinned": 3}
+    rounds = [e for e in events if e["event"] == "round"]
+    assert [e["round"] for e in rounds] == list(range(len(rounds)))
+    assert any(e.get("backjump_distance") for e in rounds)
+    assert ["a", ["a", 2]] in [
+        i for e in rounds for i in e.get("incompatibilities", [])
+    ]
+
+    mapping = {}
+    for event in rounds:
+        for name in event.get("unpinned", []):
+            del mapping[name]
+        mapping.update((name, tuple(c)) for name, c in event.get("pinned", []))
+    assert mapping == result.mapping
+
+
+def test_round_deltas_list_exact_changes():
+    output = io.BytesIO()
+    Resolver(IndexProvider(), EventWriter(output)).resolve(
+        [("a", [1, 2]), ("x", [1]), ("y", [1])]
+    )
+    rounds = [
+        json.loads(line)
+        for line in output.getvalue().splitlines()
+        if b'"round"' in line
+    ]
+    # The first round adds the root criteria, and the dependency "q" of "a";
+    # later pins change no criterion.
+    assert [(e.get("pinned"), e.get("changed")) for e in rounds[:4]] == [
+        ([["a", ["a", 2]]], ["a", "x", "y", "q"]),
+        ([["q", ["q", 2]]], None),
+        ([["x", ["x", 1]]], None),
+        ([["y", ["y", 1]]], None),
+    ]
+
+
+def test_events_are_buffered():
+    output = io.BytesIO()
+    writer = EventWriter(output, buffer_size=40)
+    writer.starting()
+    assert output.getvalue() == b""
+    writer.write_event({"event": "custom", "value": 1})
+    assert output.getvalue() == b'{"event":"start"}\n{"event":"custom","value":1}\n'
+
+
+def test_events_gzip(tmp_path):
+    path = tmp_path / "events.ndjson.gz"
+    with EventWriter(path, encode=repr) as writer:
+        writer.write_event({"event": "custom", "value": object()})
+    with gzip.open(path, "rt") as f:
+        (event,) = (json.loads(line) for line in f)
+    assert event["value"].startswith("<object object")
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import collections
+
+from resolvelib import BaseReporter, Resolver
+from resolvelib.index import IndexedProvider, VersionIndex
+
+Requirement = collections.namedtuple("Requirement", "name low high")
+Candidate = collections.namedtuple("Candidate", "name version")
+
+
+def test_version_index_masks():
+    index = VersionIndex([3, 1, 4, 1, 5, 9, 2, 6])
+    assert list(index) == [1, 2, 3, 4, 5, 6, 9]
+    assert index.rank(4) == 3
+    assert 7 not in index
+
+    assert index.mask_of([1, 9, 7]) == 0b1000001
+    assert index.mask_where(lambda v: v % 2 == 0) == 0b0101010
+    assert index.mask_between(2, 5) == 0b0011110
+    assert index.mask_between(2, 5, include_low=False) == 0b0011100
+    assert index.mask_between(high=5, include_high=False) == 0b0001111
+    assert index.mask_between(low=7) == 0b1000000
+    assert index.mask_between(6, 3) == 0
+    assert index.mask_between() == index.full_mask
+
+    assert list(index.iter_versions(0b1010011)) == [9, 5, 2, 1]
+    assert list(index.iter_versions(0b1010011, reverse=False)) == [1, 2, 5, 9]
+
+
+class Provider(IndexedProvider):
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+        self.compiled = []
+
+    def identify(self, requirement_or_candidate):
+        return requirement_or_candidate.name
+
+    def get_preference(self, identifier, **_):
+        return identifier
+
+    def get_dependencies(self, candidate):
+        return self.index[candidate.name][candidate.version]
+
+    def get_versions(self, identifier):
+        return self.index[identifier]
+
+    def get_candidate_version(self, candidate):
+        return candidate.version
+
+    def build_candidate(self, identifier, version, requirements):
+        return Candidate(identifier, version)
+
+    def compile_requirement(self, requirement, index):
+        self.compiled.append(requirement)
+        return index.mask_between(requirement.low, requirement.high)
+
+
+def test_indexed_provider():
+    index = {
+        "a": {1: [Requirement("q", 1, 1)], 2: [Requirement("q", 2, 3)]},
+        "b": {1: [Requirement("q", 1, 2)], 2: [Requirement("q", 1, 1)]},
+        "q": {1: [], 2: [], 3: []},
+    }
+    provider = Provider(index)
+    resolver = Resolver(provider, BaseReporter())
+    requirements = [Requirement("a", 1, 2), Requirement("b", 2, 2)]
+
+    result = resolver.resolve(requirements)
+    assert result.mapping == {
+        "a": Candidate("a", 1),
+        "b": Candidate("b", 2),
+        "q": Candidate("q", 1),
+    }
+    # Each distinct requirement is compiled once, however often it is matched.
+    assert len(provider.compiled) == len(set(provider.compiled))
+    assert provider.is_satisfied_by(Requirement("q", 2, 3), Candidate("q", 3))
+    assert not provider.is_satisfied_by(Requirement("q", 2, 3), Candidate("q", 1))
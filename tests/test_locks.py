@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from index_provider import IndexProvider
+
+from resolvelib import BaseReporter, InvalidPins, Resolver
+from resolvelib.locks import LockWriter, dump_lock, load_lock
+
+
+def encode(value):
+    return list(value)
+
+
+def decode(value):
+    name, versions = value
+    return (name, tuple(versions) if isinstance(versions, list) else versions)
+
+
+@pytest.fixture
+def result():
+    resolver = Resolver(IndexProvider(), BaseReporter())
+    return resolver.resolve([("c", (1,)), ("b", (1,))])
+
+
+def test_lock_round_trip(result):
+    output = io.BytesIO()
+    dump_lock(result, output, encode)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert lines[0] == {"version": 1}
+    assert lines[1:] == [
+        {
+            "key": key,
+            "candidate": list(c),
+            "parents": list(result.graph.iter_parents(key)),
+        }
+        for key, c in result.mapping.items()
+    ]
+
+    lock = load_lock(io.BytesIO(output.getvalue()), decode, decode)
+    assert lock.mapping == result.mapping
+    assert set(lock.graph.iter_edges()) == set(result.graph.iter_edges())
+    assert lock.requirements is None
+
+
+def test_lock_requirements(result, tmp_path):
+    path = tmp_path / "lock.ndjson.gz"
+    dump_lock(result, path, encode, encode)
+    lock = load_lock(path, decode, decode)
+    assert lock.mapping == result.mapping
+    assert lock.requirements == {
+        key: list(criterion.iter_requirement())
+        for key, criterion in result.criteria.items()
+    }
+
+
+def test_lock_verify(result):
+    output = io.BytesIO()
+    dump_lock(result, output, encode)
+    lock = load_lock(io.BytesIO(output.getvalue()), decode)
+    resolver = Resolver(IndexProvider(), BaseReporter())
+    verified = resolver.verify([("c", (1,)), ("b", (1,))], lock.mapping)
+    assert verified.mapping == result.mapping
+    with pytest.raises(InvalidPins) as ctx:
+        resolver.verify([("c", (1,)), ("b", (1,)), ("q", (2,))], lock.mapping)
+    assert ctx.value.identifiers == ["q"]
+
+
+def test_lock_writer_streams_pins():
+    output = io.BytesIO()
+    with LockWriter(output, encode, buffer_size=1) as writer:
+        writer.write_pin("a", ("a", 1), [None])
+        assert output.getvalue().count(b"\n") == 2
+    lock = load_lock(io.BytesIO(output.getvalue()), decode)
+    assert lock.mapping == {"a": ("a", 1)}
+    assert list(lock.graph.iter_children(None)) == ["a"]
+
+
+def test_lock_version_mismatch():
+    with pytest.raises(ValueError, match="unsupported lock version"):
+        load_lock(io.BytesIO(b'{"version":0}\n'), decode)
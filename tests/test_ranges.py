@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from resolvelib.index import VersionIndex
+from resolvelib.ranges import Interval, VersionRange
+
+
+def test_version_range_operations():
+    allowed = VersionRange.at_least(2) & VersionRange.less_than(8)
+    allowed -= VersionRange.exactly(5)
+    assert allowed == VersionRange.between(2, 5) | VersionRange.between(
+        5, 8, include_low=False
+    )
+    assert str(allowed) == ">=2, <5 || >5, <8"
+    assert [v for v in range(10) if v in allowed] == [2, 3, 4, 6, 7]
+    assert str(~allowed) == "<2 || ==5 || >=8"
+
+    assert (allowed & VersionRange.greater_than(9)).is_empty()
+    assert (allowed | ~allowed).is_any()
+    assert VersionRange.between(3, 3).is_empty()
+    assert VersionRange.between(None, None, include_low=True).is_any()
+    assert VersionRange.at_most(3) | VersionRange.greater_than(3) == VersionRange.any()
+    assert VersionRange.at_most(3) | VersionRange.greater_than(4) == VersionRange(
+        [Interval(None, 3, False, True), Interval(4, None, False, False)]
+    )
+
+
+def _random_range(rng):
+    intervals = []
+    for _ in range(rng.randint(0, 3)):
+        low = rng.choice([None, *range(10)])
+        high = rng.choice([None, *range(10)])
+        intervals.append(Interval(low, high, rng.random() < 0.5, rng.random() < 0.5))
+    return VersionRange(intervals)
+
+
+def _brute_force(version_range, version):
+    return any(
+        (i.low is None or i.low < version or (i.include_low and i.low == version))
+        and (
+            i.high is None or version < i.high or (i.include_high and i.high == version)
+        )
+        for i in version_range.intervals
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_version_range_algebra(seed):
+    rng = random.Random(seed)
+    left, right = _random_range(rng), _random_range(rng)
+    # Check between and at integer versions, to cover exclusive bounds.
+    versions = [v / 2 for v in range(-2, 22)]
+    index = VersionIndex(versions)
+
+    for version in versions:
+        in_left = _brute_force(left, version)
+        in_right = _brute_force(right, version)
+        assert (version in left) == in_left
+        assert (version in (left & right)) == (in_left and in_right)
+        assert (version in (left | right)) == (in_left or in_right)
+        assert (version in (left - right)) == (in_left and not in_right)
+        assert (version in ~left) == (not in_left)
+
+    assert ~~left == left
+    assert (left & ~left).is_empty()
+    assert index.mask_range(left) == index.mask_where(lambda v: v in left)
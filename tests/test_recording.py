@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+from index_provider import Candidate, IndexProvider, Requirement
+
+from resolvelib import BaseReporter, Resolver
+from resolvelib.recording import RecordingProvider, ReplayMismatch, ReplayProvider
+
+
+class LazyProvider(IndexProvider):
+    """Provider returning matches and dependencies lazily, to be recorded."""
+
+    def find_matches(self, identifier, requirements, incompatibilities):
+        matches = super().find_matches(identifier, requirements, incompatibilities)
+        return lambda: iter(matches)
+
+    def get_dependencies(self, candidate):
+        return iter(super().get_dependencies(candidate))
+
+
+REQUIREMENTS = [Requirement("a", (1, 2)), Requirement("b", (1,))]
+
+
+@pytest.fixture()
+def log(tmp_path):
+    path = tmp_path / "resolution.pickle.gz"
+    with RecordingProvider(LazyProvider(), path, REQUIREMENTS) as provider:
+        result = Resolver(provider, BaseReporter()).resolve(REQUIREMENTS)
+    assert result.mapping["a"] == Candidate("a", 1)
+    return path
+
+
+def test_replay(log):
+    provider = ReplayProvider(log)
+    assert provider.requirements == REQUIREMENTS
+
+    result = Resolver(provider, BaseReporter()).resolve(provider.requirements)
+    provider.check_finished()
+    assert result.mapping == {
+        "a": Candidate("a", 1),
+        "b": Candidate("b", 1),
+        "q": Candidate("q", 1),
+    }
+
+
+def test_replay_detects_changed_calls(log):
+    provider = ReplayProvider(log)
+    requirements = [Requirement("b", (1,)), Requirement("a", (1, 2))]
+    with pytest.raises(ReplayMismatch) as ctx:
+        Resolver(provider, BaseReporter()).resolve(requirements)
+    assert ctx.value.index == 0
+    assert ctx.value.expected == ("identify", (REQUIREMENTS[0],))
+    assert ctx.value.actual == ("identify", (requirements[0],))
+
+
+def test_replay_detects_unreplayed_calls(log):
+    provider = ReplayProvider(log)
+    assert provider.identify(REQUIREMENTS[0]) == "a"
+    with pytest.raises(ReplayMismatch) as ctx:
+        provider.check_finished()
+    assert ctx.value.index == 1
+    assert ctx.value.actual is None
+
+
+def test_replay_candidate_domains(tmp_path):
+    class DomainProvider(LazyProvider):
+        def get_candidate_domain(self, identifier):
+            versions = sorted(self.index[identifier], reverse=True)
+            return (Candidate(identifier, v) for v in versions)
+
+    path = tmp_path / "resolution.pickle.gz"
+    with RecordingProvider(DomainProvider(), path, REQUIREMENTS) as provider:
+        expected = Resolver(provider, BaseReporter()).resolve(REQUIREMENTS)
+
+    provider = ReplayProvider(path)
+    result = Resolver(provider, BaseReporter()).resolve(provider.requirements)
+    provider.check_finished()
+    assert result.mapping == expected.mapping
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import collections
 from collections import namedtuple
 from typing import TYPE_CHECKING, Any, Iterator, Sequence, Tuple
 
 import pytest
+from index_provider import INDEX, Candidate, DomainProvider, IndexProvider, requirement
 from packaging.requirements import Requirement
 from packaging.version import Version
 
@@ -11,22 +13,31 @@ from resolvelib import (
     AbstractProvider,
     BaseReporter,
     InconsistentCandidate,
+    InvalidPins,
+    ProviderWrapper,
     ResolutionImpossible,
 )
 from resolvelib.resolvers import (
+    AdaptiveBackjumpingPolicy,
+    BackjumpingPolicy,
+    Criterion,
+    RequirementInformation,
     RequirementsConflicted,
     Resolution,
     Resolver,
+    Result,
+    resolution,
+)
+from resolvelib.structs import (
+    CandidateMask,
+    IncompatibilitySet,
+    State,
+    build_iter_view,
 )
 
 if TYPE_CHECKING:
     from typing import Iterable, Mapping
 
-    from resolvelib.resolvers import (
-        Criterion,
-        RequirementInformation,
-    )
-
 
 def test_candidate_inconsistent_error():
     requirement = "foo"
@@ -268,3 +279,657 @@ def test_pin_conflict_with_self(monkeypatch, reporter):
     assert result.mapping["parent"][1] == Version("1")
     assert result.mapping["child"][1] == Version("1")
     assert result.mapping["grandchild"][1] == Version("1")
+
+
+def test_incompatibilities_are_deduplicated():
+    seen_incompatibilities = []
+
+    class Provider(IndexProvider):
+        def find_matches(self, identifier, requirements, incompatibilities):
+            seen_incompatibilities.append(list(incompatibilities[identifier]))
+            return super().find_matches(identifier, requirements, incompatibilities)
+
+    resolver = Resolver(Provider(INDEX), BaseReporter())
+    result = resolver.resolve(
+        [requirement("a", 1, 2), requirement("b", 1), requirement("c", 1)]
+    )
+
+    assert result.mapping["a"].version == 1
+    assert any(seen_incompatibilities), "expected the resolver to backtrack"
+    for incompatibilities in seen_incompatibilities:
+        assert len(incompatibilities) == len(set(incompatibilities))
+
+
+def test_patch_criteria_only_rematches_changed_identifiers():
+    queried = []
+
+    class Provider(AbstractProvider):
+        def find_matches(self, identifier, requirements, incompatibilities):
+            queried.append(identifier)
+            return [
+                c for c in ("1", "2", "3") if c not in incompatibilities[identifier]
+            ]
+
+    def make_criterion(name, incompatibilities):
+        return Criterion(
+            candidates=build_iter_view(
+                [c for c in ("1", "2", "3") if c not in incompatibilities]
+            ),
+            information=[RequirementInformation(name, None)],
+            incompatibilities=IncompatibilitySet(incompatibilities),
+        )
+
+    resolution = Resolution(Provider(), BaseReporter())
+    resolution._states = [
+        State(
+            mapping={},
+            criteria={"x": make_criterion("x", ["3"]), "y": make_criterion("y", [])},
+            backtrack_causes=[],
+        )
+    ]
+
+    assert resolution._patch_criteria([("x", ["3"]), ("y", ["1"])])
+    assert queried == ["y"]
+    assert list(resolution.state.criteria["x"].candidates) == ["1", "2"]
+    assert list(resolution.state.criteria["y"].candidates) == ["2", "3"]
+
+
+def test_optimistic_backjumping_saves_states_without_copying(monkeypatch):
+    snapshots = []
+    save_state_orig = Resolution._save_state
+
+    def save_state_patch(self, states):
+        save_state_orig(self, states)
+        assert all(a is b for a, b in zip(self._save_states, self._states))
+        snapshots.extend((s, dict(s.mapping)) for s in self._save_states)
+
+    monkeypatch.setattr(Resolution, "_save_state", save_state_patch)
+
+    provider = IndexProvider(INDEX, order="axbq")
+    resolver = Resolver(provider, BaseReporter())
+    result = resolver.resolve(
+        [requirement("a", 1, 2), requirement("b", 1), requirement("x", 1)]
+    )
+
+    assert result.mapping["a"].version == 1
+    assert snapshots, "expected an optimistic backjump"
+    for state, mapping in snapshots:
+        assert state.mapping == mapping, "saved states must not be mutated"
+
+
+def test_adaptive_backjumping_policy():
+    policy = AdaptiveBackjumpingPolicy(0.2, min_ratio=0.05, max_ratio=0.4)
+
+    # Nothing saved yet, so a rollback disables optimism for the resolution.
+    assert policy.record_rollback(rounds=3) == 0.0
+    assert policy.ratio == 0.1
+    assert policy.rounds_spent == 3
+
+    policy.record_jump(10)
+    policy.record_success(rounds=2)
+    assert policy.rounds_saved == 10
+    assert policy.ratio == 0.2
+
+    # Optimism has paid off so far; keep going with a smaller budget.
+    assert policy.record_rollback(rounds=1) == 0.1
+    assert policy.record_rollback(rounds=1) == 0.05
+    assert policy.record_rollback(rounds=10) == 0.0
+    assert policy.ratio == 0.05
+
+
+def test_resolver_uses_backjumping_policy():
+    events = []
+
+    class Reporter(BaseReporter):
+        def starting_optimistic_backjumping(self, index, budget):
+            events.append(("start", budget))
+
+        def rolling_back_optimistic_backjumping(self, index, ratio):
+            events.append(("rollback", ratio))
+
+    policy = AdaptiveBackjumpingPolicy(0.1)
+    provider = IndexProvider(INDEX, order="axbq")
+    resolver = Resolver(provider, Reporter(), backjumping_policy=policy)
+    requirements = [requirement("a", 1, 2), requirement("b", 1), requirement("x", 1)]
+
+    result = resolver.resolve(requirements)
+    assert result.mapping["a"].version == 1
+    assert events == [("start", 9)]
+    assert policy.rounds_saved == 1
+    assert policy.ratio == 0.2
+
+
+@pytest.mark.parametrize(
+    "ratio, events",
+    [
+        (0.01, [("rollback", 0.0)]),
+        (0.05, [("start", 2), ("rollback", 0.0)]),
+    ],
+)
+def test_optimistic_backjumping_rollback(ratio, events):
+    reported = []
+
+    class Reporter(BaseReporter):
+        def starting_optimistic_backjumping(self, index, budget):
+            reported.append(("start", budget))
+
+        def rolling_back_optimistic_backjumping(self, index, ratio):
+            reported.append(("rollback", ratio))
+
+    provider = IndexProvider(INDEX, order="axbq")
+    policy = BackjumpingPolicy(ratio)
+    resolver = Resolver(provider, Reporter(), backjumping_policy=policy)
+    result = resolver.resolve(
+        [requirement("a", 1, 2), requirement("b", 1), requirement("x", 1)],
+        max_rounds=50,
+    )
+
+    # Rolling back must not lose track of earlier pins to backjump to.
+    assert result.mapping["a"].version == 1
+    assert reported == events
+
+
+@pytest.mark.parametrize("max_rounds", [10, 50])
+def test_optimistic_backjumping_rollback_retries_failed_round(max_rounds):
+    # With the default ratio, few rounds leave no budget to backjump
+    # optimistically, so the resolver rolls back. Rolling back to a stack that
+    # had already lost the pins backjumped over gave up on this solvable input.
+    resolver = Resolver(IndexProvider(INDEX, order="axbq"), BaseReporter())
+    result = resolver.resolve(
+        [requirement("a", 1, 2), requirement("b", 1), requirement("x", 1)],
+        max_rounds=max_rounds,
+        collect_stats=True,
+    )
+    assert result.mapping["a"].version == 1
+    assert result.stats.optimistic_rollbacks == 1
+
+
+def test_resolve_collects_stats():
+    provider = IndexProvider(INDEX)
+    resolver = Resolver(provider, BaseReporter())
+    requirements = [requirement("a", 1, 2), requirement("b", 1), requirement("c", 1)]
+
+    assert resolver.resolve(requirements).stats is None
+
+    result = resolver.resolve(requirements, collect_stats=True)
+    stats = result.stats
+    assert stats.pins >= len(result.mapping)
+    assert stats.rounds > stats.pins
+    assert stats.backjumps >= 1
+    assert stats.max_depth >= len(result.mapping)
+    assert stats.provider_calls["find_matches"] > 0
+    assert stats.provider_calls["get_dependencies"] >= stats.pins
+    assert set(stats.as_dict()) >= {"rounds", "provider_calls", "provider_time"}
+
+
+def test_resolution_error_carries_stats():
+    provider = IndexProvider(INDEX)
+    resolver = Resolver(provider, BaseReporter())
+
+    with pytest.raises(ResolutionImpossible) as ctx:
+        resolver.resolve([requirement("a", 3)], collect_stats=True)
+    assert ctx.value.stats.pins == 0
+    assert ctx.value.stats.provider_calls["find_matches"] == 1
+
+
+def test_candidate_domain_resolution():
+    requirements = [requirement("a", 1, 2), requirement("b", 1), requirement("c", 1)]
+    expected = Resolver(IndexProvider(INDEX), BaseReporter())
+    resolver = Resolver(DomainProvider(INDEX), BaseReporter())
+
+    result = resolver.resolve(requirements, collect_stats=True)
+    assert result.mapping == expected.resolve(requirements).mapping
+    assert all(
+        isinstance(c.candidates, CandidateMask) for c in result.criteria.values()
+    )
+    assert result.stats.backjumps >= 1, "incompatibilities must be masked out"
+    assert result.stats.provider_calls["get_candidate_domain"] == len(result.criteria)
+
+
+def test_candidate_domains_of_wrapped_provider():
+    requirements = [requirement("a", 1, 2), requirement("b", 1), requirement("c", 1)]
+
+    class HidingDomains(ProviderWrapper):
+        def get_candidate_domain(self, identifier):
+            return None
+
+    # Wrappers are looked through: only the wrapped provider has domains.
+    provider = HidingDomains(IndexProvider(INDEX))
+    resolver = Resolver(provider, BaseReporter())
+    result = resolver.resolve(requirements, collect_stats=True)
+    assert result.stats.provider_calls["get_candidate_domain"] == 0
+
+    provider = ProviderWrapper(DomainProvider(INDEX))
+    resolver = Resolver(provider, BaseReporter())
+    result = resolver.resolve(requirements, collect_stats=True)
+    assert result.stats.provider_calls["get_candidate_domain"] == len(result.criteria)
+
+
+def test_candidate_domain_masks_of_unhashable_requirements():
+    checked = []
+
+    class Provider(DomainProvider):
+        def is_satisfied_by(self, requirement, candidate):
+            checked.append(candidate.version)
+            return candidate.version in requirement[1]
+
+    resolution = Resolution(Provider(INDEX), BaseReporter())
+    domain = resolution._get_domain("a")
+    requirement = ["a", {1}]
+    # Unhashable requirements are checked once per object, not per use.
+    assert resolution._get_requirement_mask("a", domain, requirement) == 0b10
+    assert resolution._get_requirement_mask("a", domain, requirement) == 0b10
+    assert checked == [2, 1]
+    assert resolution._get_requirement_mask("a", domain, ["a", {1}]) == 0b10
+    assert checked == [2, 1, 2, 1]
+
+
+def test_candidate_domain_conflict():
+    resolver = Resolver(DomainProvider(INDEX), BaseReporter())
+    with pytest.raises(ResolutionImpossible) as ctx:
+        resolver.resolve([requirement("a", 2), requirement("b", 1)])
+    assert {c.requirement for c in ctx.value.causes} == {
+        requirement("q", 1),
+        requirement("q", 2),
+    }
+
+
+def test_propagate_pins():
+    # A lockfile-like chain: each package pins the next to a single version.
+    index = {
+        name: {v: (requirement(chr(ord(name) + 1), 1),) for v in (1, 2)}
+        for name in "abcd"
+    }
+    index["e"] = {1: (), 2: ()}
+    implied = []
+
+    class Reporter(BaseReporter):
+        def pinning_implied(self, candidate):
+            implied.append(candidate.name)
+
+    requirements = [requirement("a", 1)]
+    regular = Resolver(IndexProvider(index), BaseReporter())
+    expected = regular.resolve(requirements, collect_stats=True)
+    resolver = Resolver(IndexProvider(index), Reporter())
+    result = resolver.resolve(requirements, collect_stats=True, propagate_pins=True)
+
+    assert result.mapping == expected.mapping
+    assert implied == ["b", "c", "d", "e"]
+    assert list(result.mapping) == ["b", "c", "d", "e", "a"], "decision pin is last"
+    assert result.stats.implied_pins == 4
+    assert result.stats.rounds == 2
+    assert expected.stats.rounds == 6
+
+
+def test_propagate_pins_backjumping():
+    requirements = [requirement("a", 1, 2), requirement("b", 1), requirement("c", 1)]
+    regular = Resolver(IndexProvider(INDEX), BaseReporter())
+    resolver = Resolver(IndexProvider(INDEX), BaseReporter())
+
+    result = resolver.resolve(requirements, collect_stats=True, propagate_pins=True)
+    assert result.mapping == regular.resolve(requirements).mapping
+    assert result.stats.backjumps >= 1
+
+
+def test_reorder_candidates():
+    # "r" 2 is pinned before "a", and "a" 2 needs "r" 1.
+    index = {
+        "a": {1: (requirement("r", 1, 2),), 2: (requirement("r", 1),)},
+        "b": {1: (requirement("r", 1, 2),)},
+        "r": {1: (), 2: ()},
+    }
+    requirements = [requirement("a", 1, 2), requirement("b", 1)]
+    order = ("b", "r", "a")
+    regular = Resolver(IndexProvider(index, order), BaseReporter())
+    expected = regular.resolve(requirements, collect_stats=True)
+    resolver = Resolver(IndexProvider(index, order), BaseReporter())
+    result = resolver.resolve(requirements, collect_stats=True, reorder_candidates=True)
+
+    # Without reordering, "r" is pinned again once "a" 2 is pinned.
+    assert {k: c.version for k, c in expected.mapping.items()} == {
+        "a": 2,
+        "b": 1,
+        "r": 1,
+    }
+    assert expected.stats.pins == 4
+    # With it, "a" 2 is put off right away, as the pin of "r" does not fit.
+    assert {k: c.version for k, c in result.mapping.items()} == {
+        "a": 1,
+        "b": 1,
+        "r": 2,
+    }
+    assert result.stats.deferred_candidates == 1
+    assert result.stats.rejections == 0
+    assert result.stats.pins == 3
+
+    # A candidate put off is still pinned if no other candidate fits.
+    del index["a"][1]
+    resolver = Resolver(IndexProvider(index, order), BaseReporter())
+    result = resolver.resolve(requirements, reorder_candidates=True)
+    assert {k: c.version for k, c in result.mapping.items()} == {
+        "a": 2,
+        "b": 1,
+        "r": 1,
+    }
+
+
+def test_reorder_candidates_conflicting_deep_in_the_tree():
+    # "r" 2 is pinned at the end of the chain b -> c -> d. Pinning "a" 2 makes
+    # "r" be pinned again to 1, whose dependency conflicts with "e".
+    index = {
+        "a": {1: (requirement("r", 1, 2),), 2: (requirement("r", 1),)},
+        "b": {1: (requirement("c", 1),)},
+        "c": {1: (requirement("d", 1),)},
+        "d": {1: (requirement("r", 1, 2),)},
+        "e": {1: (requirement("s", 2),)},
+        "r": {1: (requirement("s", 1),), 2: (requirement("s", 2),)},
+        "s": {1: (), 2: ()},
+    }
+    requirements = [requirement("a", 1, 2), requirement("b", 1), requirement("e", 1)]
+    order = "bcdrsea"
+    regular = Resolver(IndexProvider(index, order), BaseReporter())
+    expected = regular.resolve(requirements, collect_stats=True)
+    resolver = Resolver(IndexProvider(index, order), BaseReporter())
+    result = resolver.resolve(requirements, collect_stats=True, reorder_candidates=True)
+
+    assert result.mapping == expected.mapping
+    assert result.mapping["a"].version == 1
+    assert (expected.stats.rounds, expected.stats.backjumps) == (10, 1)
+    assert (result.stats.rounds, result.stats.backjumps) == (8, 0)
+    assert result.stats.deferred_candidates == 1
+
+
+@pytest.mark.parametrize("provider_class", [IndexProvider, DomainProvider])
+def test_minimize_causes(provider_class):
+    resolver = Resolver(provider_class(INDEX), BaseReporter())
+    requirements = [requirement("x", 1), requirement("a", 2), requirement("b", 1)]
+    with pytest.raises(ResolutionImpossible) as ctx:
+        resolver.resolve(requirements, minimize_causes=True)
+
+    minimal = ctx.value.minimal_causes
+    assert {c.requirement for c in minimal} == {
+        requirement("q", 1),
+        requirement("q", 2),
+    }
+    assert {c.parent.name for c in minimal} == {"a", "b"}
+    assert ctx.value.root_causes == requirements[1:]
+
+
+def test_causes_are_not_minimized_by_default():
+    resolver = Resolver(IndexProvider(INDEX), BaseReporter())
+    with pytest.raises(ResolutionImpossible) as ctx:
+        resolver.resolve([requirement("a", 3)])
+    assert ctx.value.minimal_causes is None
+    assert ctx.value.root_causes is None
+
+
+class CountingProvider(ProviderWrapper):
+    def __init__(self, provider):
+        super().__init__(provider)
+        self.calls = collections.Counter()
+
+    def _call(self, name, **kwargs):
+        self.calls[name] += 1
+        return super()._call(name, **kwargs)
+
+
+RESOLVE_MANY_SETS = [
+    [requirement("a", 1, 2)],
+    [requirement("b", 1), requirement("x", 1)],
+    [requirement("a", 2), requirement("b", 1)],
+    [requirement("a", 1, 2)],
+]
+
+
+def _summarize_outcomes(outcomes):
+    return [
+        (
+            index,
+            type(outcome).__name__
+            if isinstance(outcome, Exception)
+            else {k: c.version for k, c in outcome.mapping.items()},
+        )
+        for index, outcome in outcomes
+    ]
+
+
+def test_resolve_many():
+    provider = CountingProvider(IndexProvider(INDEX))
+    resolver = Resolver(provider, BaseReporter())
+    outcomes = resolver.resolve_many(RESOLVE_MANY_SETS)
+
+    first = [next(outcomes) for _ in range(3)]
+    assert _summarize_outcomes(first) == [
+        (0, {"a": 2, "q": 2}),
+        (1, {"b": 1, "q": 1, "x": 1}),
+        (2, "ResolutionImpossible"),
+    ]
+    assert isinstance(first[2][1], ResolutionImpossible)
+
+    # Resolving the first set again reuses the matches and dependencies found.
+    calls = provider.calls.copy()
+    assert _summarize_outcomes(outcomes) == [(3, {"a": 2, "q": 2})]
+    assert provider.calls["find_matches"] == calls["find_matches"]
+    assert provider.calls["get_dependencies"] == calls["get_dependencies"]
+
+
+def test_resolve_many_processes():
+    resolver = Resolver(IndexProvider(INDEX), BaseReporter())
+    expected = _summarize_outcomes(resolver.resolve_many(RESOLVE_MANY_SETS))
+    outcomes = resolver.resolve_many(RESOLVE_MANY_SETS, processes=2)
+    assert sorted(_summarize_outcomes(outcomes)) == expected
+
+
+class EnvironmentProvider(IndexProvider):
+    """Provider whose candidates may differ by environment.
+
+    ``conditions`` maps ``(name, version)`` to a dict of environment to the
+    candidate's dependencies there, or None if it is not usable there.
+    """
+
+    def __init__(self, index, conditions):
+        super().__init__(index)
+        self.conditions = conditions
+
+    def get_environment_dependencies(self, candidate, environment):
+        conditions = self.conditions.get(candidate, {})
+        return conditions.get(environment, self.get_dependencies(candidate))
+
+
+def test_resolve_environments():
+    index = {
+        "app": {1: (requirement("lib", 1, 2),)},
+        "lib": {1: (), 2: ()},
+        "colorama": {1: ()},
+    }
+    conditions = {
+        ("app", 1): {
+            "win": (requirement("lib", 1, 2), requirement("colorama", 1)),
+        },
+        ("lib", 2): {"win": None},
+    }
+    resolver = Resolver(EnvironmentProvider(index, conditions), BaseReporter())
+    results = resolver.resolve_environments(
+        [requirement("app", 1)], ["linux", "mac", "win"]
+    )
+
+    assert list(results) == ["linux", "mac", "win"]
+    assert results["linux"] is results["mac"]
+    assert {k: c.version for k, c in results["linux"].mapping.items()} == {
+        "app": 1,
+        "lib": 2,
+    }
+    assert {k: c.version for k, c in results["win"].mapping.items()} == {
+        "app": 1,
+        "colorama": 1,
+        "lib": 1,
+    }
+
+
+def test_resolve_environments_forks_diverging_round():
+    index = {
+        "app": {1: (requirement("b", 1), requirement("c", 1))},
+        "b": {1: ()},
+        "c": {1: (requirement("lib", 1, 2),)},
+        "lib": {1: (), 2: ()},
+    }
+    conditions = {("lib", 2): {"win": None}}
+
+    class Reporter(BaseReporter):
+        def __init__(self):
+            self.rounds = []
+
+        def starting(self):
+            self.rounds.append([])
+
+        def starting_round(self, index):
+            self.rounds[-1].append(index)
+
+    reporter = Reporter()
+    resolver = Resolver(EnvironmentProvider(index, conditions), reporter)
+    results = resolver.resolve_environments(
+        [requirement("app", 1)], ["linux", "mac", "win"], collect_stats=True
+    )
+
+    # The groups disagree on "lib" in round 2, and both carry on from there
+    # with "app" and "b" already pinned.
+    assert reporter.rounds == [[0, 1, 2], [2, 3, 4], [2, 3, 4]]
+    assert results["linux"] is results["mac"]
+    assert results["linux"].mapping["lib"].version == 2
+    assert results["win"].mapping["lib"].version == 1
+    assert results["win"].stats.rounds == results["linux"].stats.rounds == 5
+
+
+def test_resolve_environments_impossible():
+    index = {"app": {1: (requirement("lib", 2),)}, "lib": {2: ()}}
+    conditions = {("lib", 2): {"win": None}}
+    resolver = Resolver(EnvironmentProvider(index, conditions), BaseReporter())
+    with pytest.raises(ResolutionImpossible) as ctx:
+        resolver.resolve_environments([requirement("app", 1)], ["linux", "win"])
+    assert ctx.value.environments == ("win",)
+
+
+def test_reporter_hooks_not_overridden_are_skipped(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("no-op hook called")
+
+    for name in ("adding_requirement", "pinning", "starting_round", "ending_round"):
+        monkeypatch.setattr(BaseReporter, name, fail)
+
+    class PinReporter(BaseReporter):
+        def __init__(self):
+            self.pins = []
+
+        def pinning(self, candidate):
+            self.pins.append(candidate)
+
+    reporter = PinReporter()
+    rounds = []
+
+    def starting_round(index):
+        rounds.append(index)
+
+    reporter.starting_round = starting_round
+    resolver = Resolver(IndexProvider(INDEX), reporter)
+    result = resolver.resolve([requirement("a", 1, 2)], propagate_pins=True)
+    assert sorted(c.name for c in reporter.pins) == sorted(result.mapping)
+    assert rounds
+
+
+def test_reporter_not_derived_from_base_reporter():
+    # A reporter written against the original hooks only.
+    class Reporter:
+        def __init__(self):
+            self.events = []
+
+        def starting(self):
+            self.events.append("starting")
+
+        def starting_round(self, index):
+            pass
+
+        def ending_round(self, index, state):
+            pass
+
+        def ending(self, state):
+            self.events.append("ending")
+
+        def addingrequirement(self, requirement, parent):
+            pass
+
+        def resolving_conflicts(self, causes):
+            pass
+
+        def rejecting_candidate(self, criterion, candidate):
+            pass
+
+        def pinning(self, candidate):
+            self.events.append(candidate.name)
+
+    reporter = Reporter()
+    resolver = Resolver(IndexProvider(INDEX), reporter)
+    result = resolver.resolve(
+        [requirement("a", 1, 2), requirement("b", 1), requirement("c", 1)],
+        propagate_pins=True,
+    )
+    assert reporter.events[0] == "starting"
+    assert reporter.events[-1] == "ending"
+    assert set(reporter.events[1:-1]) == set(result.mapping)
+
+
+def test_resolve_mapping_does_not_build_graph(monkeypatch):
+    built = []
+    build_graph = resolution._build_graph
+
+    def counting_build_graph(*args):
+        built.append(args)
+        return build_graph(*args)
+
+    monkeypatch.setattr(resolution, "_build_graph", counting_build_graph)
+    resolver = Resolver(IndexProvider(INDEX), BaseReporter())
+    requirements = [requirement("c", 1), requirement("b", 1)]
+    mapping = resolver.resolve_mapping(requirements)
+
+    assert {k: c.version for k, c in mapping.items()} == {
+        "a": 1,
+        "b": 1,
+        "c": 1,
+        "q": 1,
+    }
+    assert not built
+
+    result = resolver.resolve(requirements)
+    assert len(built) == 1
+    assert type(result) is Result
+    assert result.mapping == mapping
+    assert set(result.graph.iter_children(None)) == {"b", "c"}
+    assert set(result.graph.iter_children("c")) == {"a"}
+
+
+def test_verify():
+    provider = CountingProvider(IndexProvider(INDEX))
+    resolver = Resolver(provider, BaseReporter())
+    requirements = [requirement("c", 1), requirement("b", 1)]
+    result = resolver.resolve(requirements)
+    pins = dict(result.mapping, x=Candidate("x", 1))
+
+    provider.calls.clear()
+    verified = resolver.verify(requirements, pins)
+    assert "find_matches" not in provider.calls
+    assert provider.calls["get_dependencies"] == 4
+    assert verified.mapping == result.mapping
+    assert set(verified.graph.iter_edges()) == set(result.graph.iter_edges())
+    assert {k: list(c.iter_requirement()) for k, c in verified.criteria.items()} == {
+        k: list(c.iter_requirement()) for k, c in result.criteria.items()
+    }
+
+
+def test_verify_invalid_pins():
+    resolver = Resolver(IndexProvider(INDEX), BaseReporter())
+    a2, q1 = Candidate("a", 2), Candidate("q", 1)
+    with pytest.raises(InvalidPins) as ctx:
+        resolver.verify([requirement("a", 2), requirement("b", 1)], {"a": a2, "q": q1})
+    assert sorted(ctx.value.identifiers) == ["b", "q"]
+    assert sorted(
+        (i.requirement.name, i.parent and i.parent.name) for i in ctx.value.causes
+    ) == [("b", None), ("q", "a")]
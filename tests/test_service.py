@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import io
+import json
+import socket
+import threading
+
+import pytest
+from index_provider import IndexProvider
+
+from resolvelib.service import ResolutionService, send_request
+
+
+@pytest.fixture
+def created():
+    return []
+
+
+@pytest.fixture
+def service(created):
+    def provider_factory(key):
+        created.append(key)
+        return IndexProvider()
+
+    return ResolutionService(
+        provider_factory,
+        decode_requirement=lambda r: (r[0], tuple(r[1])),
+        encode_candidate=list,
+        max_providers=2,
+    )
+
+
+def test_service_handle(service, created):
+    response = service.handle({"id": 1, "requirements": [["a", [1, 2]]]})
+    assert response == {
+        "id": 1,
+        "pins": [
+            {"key": "a", "candidate": ["a", 2], "parents": [None]},
+            {"key": "q", "candidate": ["q", 2], "parents": ["a"]},
+        ],
+    }
+
+    response = service.handle({"requirements": [["a", [2]], ["b", [1]]]})
+    assert response["error"] == "ResolutionImpossible"
+    response = service.handle({"requirements": [["a", [1]]], "max_rounds": 0})
+    assert response["error"] == "ResolutionTooDeep"
+    response = service.handle({"id": 2})
+    assert response == {"id": 2, "error": "KeyError", "message": "'requirements'"}
+    assert created == [None]
+
+
+def test_service_evicts_least_recently_used_providers(service, created):
+    request = {"requirements": [["b", [1]]]}
+    for key in ["x", "y", "x", "z", "x", "y"]:
+        assert "pins" in service.handle(dict(request, provider=key))
+    assert created == ["x", "y", "z", "y"]
+
+
+def test_service_serve_stream(service):
+    rfile = io.BytesIO(b'{"id":1,"requirements":[["b",[1]]]}\n\n[]\n')
+    wfile = io.BytesIO()
+    service.serve_stream(rfile, wfile)
+    first, second = (json.loads(line) for line in wfile.getvalue().splitlines())
+    assert [p["key"] for p in first["pins"]] == ["b", "q"]
+    assert second["error"] == "ValueError"
+
+
+def test_service_provider_caches_are_bounded():
+    service = ResolutionService(
+        lambda key: IndexProvider(),
+        decode_requirement=lambda r: (r[0], tuple(r[1])),
+        encode_candidate=list,
+        max_cache_size=2,
+        cache_policy="lfu",
+    )
+    for requirements in [[["a", [1]]], [["a", [2]]], [["b", [1]]], [["a", [1]]]]:
+        assert "pins" in service.handle({"requirements": requirements})
+    info = service.cache_info()[None]
+    assert info["find_matches"]["entries"] == 2
+    assert info["get_dependencies"]["entries"] == 2
+    assert info["find_matches"]["misses"] > 2
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs UNIX sockets")
+def test_service_serve_unix(service, created, tmp_path):
+    path = tmp_path / "resolver.sock"
+    server = service.serve_unix(path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        responses = []
+        clients = [
+            threading.Thread(
+                target=lambda key=key: responses.append(
+                    send_request(path, {"provider": key, "requirements": [["a", [1]]]})
+                )
+            )
+            for key in ["x", "y", "x", "y"]
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    assert [[p["candidate"] for p in r["pins"]] for r in responses] == [
+        [["a", 1], ["q", 1]]
+    ] * 4
+    assert sorted(created) == ["x", "y"]
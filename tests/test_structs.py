@@ -1,6 +1,12 @@
 import pytest
 
-from resolvelib.structs import DirectedGraph, build_iter_view
+from resolvelib.structs import (
+    CandidateDomain,
+    CandidateMask,
+    DirectedGraph,
+    IncompatibilitySet,
+    build_iter_view,
+)
 
 
 @pytest.fixture()
@@ -50,3 +56,53 @@ def test_iter_view_multiple_iterable(source):
     next(iterator_a)
     assert next(iterator_b) == 0
     assert next(iterator_a) == 1
+
+
+def test_incompatibility_set_deduplicates_in_order():
+    incompatibilities = IncompatibilitySet([3, 1, 3, 2, 1])
+    assert list(incompatibilities) == [3, 1, 2]
+    assert len(incompatibilities) == 3
+
+    other = incompatibilities.union([4, 2])
+    assert list(other) == [3, 1, 2, 4]
+    assert list(incompatibilities) == [3, 1, 2], "union() must not mutate"
+
+
+def test_incompatibility_set_unhashable():
+    a, b = ["a"], ["b"]
+    incompatibilities = IncompatibilitySet([a, b, a])
+    assert list(incompatibilities) == [a, b]
+    assert ["a"] in incompatibilities
+    assert ["c"] not in incompatibilities
+
+
+def test_incompatibility_iterator_membership():
+    iterator = iter(IncompatibilitySet([0, 1]))
+    assert next(iterator) == 0
+    assert 0 in iterator, "membership covers consumed items"
+    assert 2 not in iterator
+    assert list(iterator) == [1]
+
+
+def test_candidate_domain_masks():
+    domain = CandidateDomain([3, 1, 2, 1])
+    assert list(domain) == [3, 1, 2]
+    assert domain.full_mask == 0b111
+    assert domain.mask_of([2, 3, 4]) == 0b101
+    assert domain.mask_where(lambda c: c < 3) == 0b110
+    assert list(domain.iter_candidates(0b101)) == [3, 2]
+
+
+def test_candidate_mask_operations():
+    a, b, c = ["a"], ["b"], ["c"]
+    domain = CandidateDomain([a, b, c])
+    candidates = CandidateMask(domain, domain.full_mask)
+    incompatibilities = CandidateMask(domain).union([b])
+    assert b in incompatibilities
+    assert ["b"] not in incompatibilities, "unhashable candidates match by identity"
+
+    remaining = candidates.difference(incompatibilities).intersection(0b011)
+    assert list(remaining) == [a]
+    assert len(remaining) == 1
+    assert incompatibilities.union(remaining).mask == 0b011
+    assert not remaining.intersection(0b100)
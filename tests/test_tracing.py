@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from index_provider import IndexProvider
+
+from resolvelib import BaseReporter, ResolutionImpossible, Resolver
+from resolvelib.resolvers import resolution
+from resolvelib.tracing import TracingProvider, TracingReporter
+
+
+def _resolve(requirements, reporter=None):
+    tracer = TracingReporter(reporter)
+    resolver = Resolver(TracingProvider(IndexProvider(), tracer), tracer)
+    try:
+        resolver.resolve(requirements)
+    finally:
+        trace = json.loads(json.dumps(tracer.as_dict()))
+    return trace["traceEvents"]
+
+
+def _within(inner, outer):
+    return outer["ts"] <= inner["ts"] <= outer["ts"] + outer["dur"]
+
+
+def test_trace_events():
+    pinned = []
+
+    class Reporter(BaseReporter):
+        def pinning(self, candidate):
+            pinned.append(candidate)
+
+    events = _resolve([("a", {1, 2}), ("b", {1})], Reporter())
+
+    (resolution,) = (e for e in events if e["name"] == "resolve")
+    assert resolution["ph"] == "X"
+    assert resolution["args"] == {"finished": True, "pinned": 3}
+
+    rounds = [e for e in events if e["cat"] == "round"]
+    assert [r["name"] for r in rounds] == [f"round {i}" for i in range(len(rounds))]
+    assert all(_within(r, resolution) for r in rounds)
+
+    calls = [e for e in events if e["cat"] == "provider"]
+    assert {"find_matches", "get_dependencies", "identify"} <= {
+        e["name"] for e in calls
+    }
+    # Root requirements are matched before the first round starts.
+    assert all(_within(c, resolution) for c in calls)
+    assert any(_within(c, r) for c in calls for r in rounds)
+
+    pins = [e for e in events if e["name"] == "pin"]
+    assert len(pins) == len(pinned) > 3
+    assert any(e["name"] == "backjump" for e in events)
+
+
+def test_trace_closes_spans_on_failure():
+    out = io.StringIO()
+    tracer = TracingReporter()
+    resolver = Resolver(TracingProvider(IndexProvider(), tracer), tracer)
+    with pytest.raises(ResolutionImpossible):
+        resolver.resolve([("a", {3})])
+    tracer.write(out)
+
+    events = json.loads(out.getvalue())["traceEvents"]
+    (resolution,) = (e for e in events if e["name"] == "resolve")
+    assert resolution["args"] == {"finished": False}
+
+
+def test_tracer_only_enables_hooks_of_wrapped_reporter():
+    deltas = []
+
+    class Reporter(BaseReporter):
+        def ending_round_delta(self, delta):
+            deltas.append(delta)
+
+    hooks = resolution._get_overridden_hooks(TracingReporter(BaseReporter()))
+    assert "ending_round_delta" not in hooks
+    assert "adding_requirement" not in hooks
+    assert "pinning" in hooks
+
+    tracer = TracingReporter(Reporter())
+    assert "ending_round_delta" in resolution._get_overridden_hooks(tracer)
+    Resolver(TracingProvider(IndexProvider(), tracer), tracer).resolve([("a", {1, 2})])
+    assert deltas